@@ -0,0 +1,6 @@
+"""HTTP API routers mounted by ``app.main``."""
+
+from .docs import router as docs_router
+from .themes import router as themes_router
+
+__all__ = ["docs_router", "themes_router"]
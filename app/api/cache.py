@@ -0,0 +1,138 @@
+"""In-process LRU/TTL cache for read endpoints, invalidated by the corpus version.
+
+The crawler bumps ``corpus_version`` in the transaction that writes changed docs.
+The cache re-reads that counter at most every ``version_check_seconds`` and drops all
+entries when it moves, so a finished crawl is visible to readers within that window
+(or ``ttl_seconds``, whichever comes first).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.db.repository import get_corpus_version
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ResultCacheConfig:
+    max_entries: int = 1024
+    ttl_seconds: float = 300.0
+    version_check_seconds: float = 2.0
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 0:
+            raise ValueError("max_entries must be >= 0.")
+        if self.ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0.")
+        if self.version_check_seconds < 0:
+            raise ValueError("version_check_seconds must be >= 0.")
+
+
+def normalize_query(query: str | None) -> str | None:
+    """Cache-key form of a search query: whitespace collapsed and case-folded."""
+    if query is None:
+        return None
+    return " ".join(query.split()).casefold()
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    version: int
+    expires_at: float
+
+
+class ResultCache:
+    """Thread-safe result cache shared by the request handlers of one app instance.
+
+    Cached values must be immutable, since every hit returns the same object.
+    """
+
+    def __init__(
+        self,
+        config: ResultCacheConfig | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or ResultCacheConfig()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._version: int | None = None
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.max_entries > 0
+
+    def corpus_version(self, session: Session) -> int:
+        """Current corpus version, re-read from the database at most once per interval."""
+        now = self._clock()
+        with self._lock:
+            if (
+                self._version is not None
+                and now - self._version_checked_at < self.config.version_check_seconds
+            ):
+                return self._version
+        version = get_corpus_version(session)
+        with self._lock:
+            if self._version is not None and version != self._version:
+                self._entries.clear()
+                self.invalidations += 1
+            self._version = version
+            self._version_checked_at = now
+        return version
+
+    def get_or_load(self, session: Session, key: Hashable, load: Callable[[], T]) -> T:
+        """Cached value for ``key``, or ``load()`` stored under the current corpus version."""
+        if not self.enabled:
+            return load()
+        version = self.corpus_version(session)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+
+        # Loaded outside the lock: concurrent misses for one key may both query,
+        # which is cheaper than serializing every request behind a slow search.
+        value = load()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = _Entry(value, version, now + self.config.ttl_seconds)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.config.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int | None]:
+        with self._lock:
+            return {
+                "corpus_version": self._version,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "hits": self.hits,
+                "invalidations": self.invalidations,
+                "max_entries": self.config.max_entries,
+                "misses": self.misses,
+            }
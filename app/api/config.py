@@ -0,0 +1,21 @@
+"""API settings sourced from environment variables."""
+
+from __future__ import annotations
+
+import os
+
+from app.api.cache import ResultCacheConfig
+
+
+def get_result_cache_config() -> ResultCacheConfig:
+    """Search/doc-get result cache; ``SEARCH_CACHE_MAX_ENTRIES=0`` disables it."""
+    return ResultCacheConfig(
+        max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+        ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300")),
+        version_check_seconds=float(os.getenv("SEARCH_CACHE_VERSION_CHECK_SECONDS", "2")),
+    )
+
+
+def get_gzip_min_bytes() -> int:
+    """Smallest response body worth gzip-compressing; ``API_GZIP_MIN_BYTES=0`` disables gzip."""
+    return int(os.getenv("API_GZIP_MIN_BYTES", "1024"))
@@ -0,0 +1,41 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor is the sort key of the last row of a page, wrapped with the endpoint kind
+and a fingerprint of the request filters, so it cannot be replayed against a
+different query. Clients must treat it as an opaque string.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed or was issued for a different endpoint or filter set."""
+
+
+def filters_fingerprint(*parts: Any) -> str:
+    raw = json.dumps(parts, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(kind: str, fingerprint: str, values: Sequence[Any]) -> str:
+    payload = json.dumps([kind, fingerprint, list(values)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, fingerprint: str) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor_kind, cursor_fingerprint, values = decoded
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed cursor.") from exc
+    if cursor_kind != kind or cursor_fingerprint != fingerprint or not isinstance(values, list):
+        raise InvalidCursor("Cursor does not belong to this query.")
+    return values
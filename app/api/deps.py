@@ -0,0 +1,33 @@
+"""FastAPI dependencies shared by API routers."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.cache import ResultCache
+from app.db.session import get_async_read_session, get_async_session, get_session
+
+
+def get_db_session() -> Iterator[Session]:
+    with get_session() as session:
+        yield session
+
+
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    """Request-scoped async session; handlers run sync repository code via ``run_sync``."""
+    async with get_async_session() as session:
+        yield session
+
+
+async def get_async_read_db_session() -> AsyncIterator[AsyncSession]:
+    """Like ``get_async_db_session``, but may be served by the read replica."""
+    async with get_async_read_session() as session:
+        yield session
+
+
+def get_result_cache(request: Request) -> ResultCache:
+    return request.app.state.result_cache
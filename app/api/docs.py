@@ -0,0 +1,319 @@
+"""``/v1/docs`` endpoints used by GPT Actions."""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from datetime import date, datetime
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Annotated, Any, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.cache import ResultCache, normalize_query
+from app.api.cursors import InvalidCursor, decode_cursor, encode_cursor, filters_fingerprint
+from app.api.deps import get_async_read_db_session, get_result_cache
+from app.api.responses import FastJSONResponse
+from app.db.repository import (
+    DocDetail,
+    DocValidator,
+    get_doc_detail,
+    get_doc_details,
+    get_doc_validator,
+)
+from app.search.embeddings import Embedder, get_embedder
+from app.search.engine import search_docs_page
+from app.search.fts import SearchFilters, SearchHit, SearchPosition
+from app.search.hybrid import hybrid_search
+from app.search.results import MAX_SNIPPET_FRAGMENTS, with_snippets, with_themes
+
+DocSource = Literal["jetformbuilder", "crocoblock"]
+DocType = Literal["tutorial", "blog", "kb", "docs", "unknown"]
+SearchMode = Literal["lexical", "hybrid"]
+DocField = Literal[
+    "title",
+    "source",
+    "type",
+    "published_at",
+    "short_description",
+    "content_text",
+    "headings",
+    "tags",
+    "themes",
+]
+
+BATCH_GET_MAX_URLS = 20
+
+router = APIRouter(prefix="/v1/docs", tags=["docs"])
+
+
+class SearchResult(BaseModel):
+    url: str
+    title: str
+    source: str
+    type: str
+    published_at: datetime | None
+    short_description: str | None
+    tags: list[str]
+    themes: list[str]
+    snippet: str | None
+    score: float | None
+
+
+class SearchResponse(BaseModel):
+    query: str | None
+    mode: SearchMode
+    count: int
+    results: list[SearchResult]
+    next_cursor: str | None
+
+
+class DocResponse(BaseModel):
+    url: str
+    title: str
+    source: str
+    type: str
+    published_at: datetime | None
+    short_description: str | None
+    content_text: str | None
+    headings: list[str]
+    tags: list[str]
+    themes: list[str]
+
+
+class BatchGetRequest(BaseModel):
+    urls: list[str] = Field(min_length=1, max_length=BATCH_GET_MAX_URLS)
+    fields: list[DocField] | None = None
+    max_content_chars: int | None = Field(default=None, ge=1)
+
+
+class BatchDoc(BaseModel):
+    """Only the requested fields are set; unset fields are left out of the response."""
+
+    url: str
+    title: str | None = None
+    source: str | None = None
+    type: str | None = None
+    published_at: datetime | None = None
+    short_description: str | None = None
+    content_text: str | None = None
+    content_truncated: bool | None = None
+    headings: list[str] | None = None
+    tags: list[str] | None = None
+    themes: list[str] | None = None
+
+
+class BatchGetResponse(BaseModel):
+    count: int
+    results: list[BatchDoc]
+    missing: list[str]
+
+
+def _search_position(cursor: str, fingerprint: str) -> SearchPosition:
+    values = decode_cursor(cursor, "search", fingerprint)
+    try:
+        score, published_at, doc_id = values
+        return SearchPosition(
+            score=None if score is None else float(score),
+            published_at=None if published_at is None else datetime.fromisoformat(published_at),
+            id=uuid.UUID(doc_id),
+        )
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Malformed cursor.") from exc
+
+
+def _search_cursor(position: SearchPosition, fingerprint: str) -> str:
+    published_at = None if position.published_at is None else position.published_at.isoformat()
+    return encode_cursor("search", fingerprint, [position.score, published_at, str(position.id)])
+
+
+@lru_cache(maxsize=1024)
+def _query_embedding(embedder: Embedder, query: str) -> tuple[float, ...]:
+    (embedding,) = embedder.embed([query])
+    return tuple(embedding)
+
+
+def _embed_query(query: str) -> tuple[Embedder, tuple[float, ...]]:
+    embedder = get_embedder()
+    return embedder, _query_embedding(embedder, query)
+
+
+def search_result_payload(hit: SearchHit) -> dict[str, Any]:
+    """``SearchResult`` as a plain dict, for ``FastJSONResponse``."""
+    return {
+        "url": hit.url,
+        "title": hit.title,
+        "source": hit.source,
+        "type": hit.doc_type,
+        "published_at": hit.published_at,
+        "short_description": hit.short_description,
+        "tags": hit.tags,
+        "themes": hit.themes,
+        "snippet": hit.snippet,
+        "score": hit.score,
+    }
+
+
+def doc_payload(detail: DocDetail) -> dict[str, Any]:
+    """``DocResponse`` as a plain dict, for ``FastJSONResponse``."""
+    return {
+        "url": detail.url,
+        "title": detail.title,
+        "source": detail.source,
+        "type": detail.doc_type,
+        "published_at": detail.published_at,
+        "short_description": detail.short_description,
+        "content_text": detail.content_text,
+        "headings": detail.headings,
+        "tags": detail.tags,
+        "themes": detail.themes,
+    }
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    session: Annotated[AsyncSession, Depends(get_async_read_db_session)],
+    cache: Annotated[ResultCache, Depends(get_result_cache)],
+    q: str | None = None,
+    source: DocSource | None = None,
+    type: DocType | None = None,
+    after: date | None = None,
+    before: date | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    mode: SearchMode = "lexical",
+    snippets: Annotated[int, Query(ge=0, le=MAX_SNIPPET_FRAGMENTS)] = 0,
+    cursor: str | None = None,
+) -> FastJSONResponse:
+    filters = SearchFilters(source=source, doc_type=type, after=after, before=before)
+    fingerprint = filters_fingerprint(mode, normalize_query(q), filters)
+    if cursor and mode == "hybrid":
+        raise InvalidCursor("Cursors are only supported in lexical mode.")
+    position = _search_position(cursor, fingerprint) if cursor else None
+    embedder: Embedder | None = None
+    query_embedding = None
+    if mode == "hybrid" and q and q.strip():
+        # Model loading and inference must not block the event loop; run_sync below does.
+        # Blank hybrid queries are lexical only and never touch the embedder.
+        query = q.strip()
+        embedder, query_embedding = await run_in_threadpool(_embed_query, query)
+
+    def load(sync_session: Session) -> tuple[tuple[SearchHit, ...], SearchPosition | None]:
+        next_position = None
+        if mode == "hybrid":
+            hits = hybrid_search(
+                sync_session,
+                q,
+                embedder,
+                filters,
+                limit=limit,
+                query_embedding=query_embedding,
+            )
+        else:
+            hits, next_position = search_docs_page(sync_session, q, filters, limit, position)
+        hits = with_snippets(sync_session, with_themes(sync_session, hits), q, snippets)
+        return tuple(hits), next_position
+
+    key = ("search", mode, normalize_query(q), filters, limit, snippets, position)
+    hits, next_position = await session.run_sync(
+        lambda sync_session: cache.get_or_load(sync_session, key, lambda: load(sync_session))
+    )
+    return FastJSONResponse(
+        {
+            "query": q,
+            "mode": mode,
+            "count": len(hits),
+            "results": [search_result_payload(hit) for hit in hits],
+            "next_cursor": (
+                None if next_position is None else _search_cursor(next_position, fingerprint)
+            ),
+        }
+    )
+
+
+def doc_etag(validator: DocDetail | DocValidator) -> str | None:
+    """Weak ETag over the body hash and the doc's themes; ``None`` for uncrawled docs.
+
+    Weak because the same tag goes out on the gzip and identity encodings of the body.
+    """
+    if validator.content_hash is None:
+        return None
+    digest = hashlib.sha256(
+        "\x1f".join([validator.content_hash, *validator.themes]).encode("utf-8")
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """``If-None-Match`` uses weak comparison: only the opaque tags must be equal."""
+    opaque_tag = etag.removeprefix("W/")
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque_tag for candidate in candidates
+    )
+
+
+@router.get(
+    "/get",
+    response_model=DocResponse,
+    responses={HTTPStatus.NOT_MODIFIED.value: {"description": "Cached copy is current"}},
+)
+async def get_doc(
+    session: Annotated[AsyncSession, Depends(get_async_read_db_session)],
+    cache: Annotated[ResultCache, Depends(get_result_cache)],
+    url: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    url = url.strip()
+    if if_none_match:
+        # Revalidation only needs the hash and themes, never the full content_text.
+        validator: DocValidator | None = await session.run_sync(
+            lambda sync_session: cache.get_or_load(
+                sync_session,
+                ("validator", url),
+                lambda: get_doc_validator(sync_session, url),
+            )
+        )
+        etag = doc_etag(validator) if validator is not None else None
+        if etag is not None and etag_matches(if_none_match, etag):
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+
+    detail: DocDetail | None = await session.run_sync(
+        lambda sync_session: cache.get_or_load(
+            sync_session,
+            ("get", url),
+            lambda: get_doc_detail(sync_session, url),
+        )
+    )
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    etag = doc_etag(detail)
+    headers = {"ETag": etag} if etag is not None else None
+    return FastJSONResponse(doc_payload(detail), headers=headers)
+
+
+@router.post("/batch_get", response_model=BatchGetResponse, response_model_exclude_unset=True)
+async def batch_get(
+    session: Annotated[AsyncSession, Depends(get_async_read_db_session)],
+    body: BatchGetRequest,
+) -> FastJSONResponse:
+    urls = list(dict.fromkeys(url.strip() for url in body.urls))
+    details = await session.run_sync(
+        get_doc_details,
+        urls,
+        fields=body.fields,
+        max_content_chars=body.max_content_chars,
+    )
+    found = {detail["url"] for detail in details}
+    # Rows hold only the requested fields, which is what response_model_exclude_unset documents.
+    return FastJSONResponse(
+        {
+            "count": len(details),
+            "results": details,
+            "missing": [url for url in urls if url not in found],
+        }
+    )
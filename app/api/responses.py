@@ -0,0 +1,37 @@
+"""JSON response class for the API: plain payloads straight to bytes, no output validation.
+
+``create_app`` makes it the default response class. The ``/v1`` handlers return it
+directly, with dict payloads built from repository rows, so FastAPI skips its
+``response_model`` validation and serialization pass; the models stay on the routes for
+the OpenAPI schema, and the unit tests check every payload builder against its model.
+
+Bodies are encoded by orjson when the ``fastjson`` extra is installed, otherwise by
+pydantic-core. Both write what FastAPI's own encoder does: UTC datetimes end in ``Z``,
+tuples become arrays and non-ASCII text is raw UTF-8.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+def _json_encoder() -> Callable[[Any], bytes]:
+    if importlib.util.find_spec("orjson") is None:
+        return to_json
+    import orjson
+
+    return partial(orjson.dumps, option=orjson.OPT_UTC_Z)
+
+
+_dumps = _json_encoder()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
@@ -0,0 +1,153 @@
+"""``/v1/themes`` endpoints used by GPT Actions."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Annotated, Any, Literal
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.cursors import InvalidCursor, decode_cursor, encode_cursor, filters_fingerprint
+from app.api.deps import get_async_read_db_session
+from app.api.responses import FastJSONResponse
+from app.themes.queries import (
+    GAP_TYPES,
+    ThemeFilters,
+    ThemeGap,
+    ThemeGapPosition,
+    ThemeListPosition,
+    ThemeSummary,
+    find_theme_gaps,
+    list_themes,
+)
+
+GapType = Literal[
+    "blog_theme_missing_tutorial",
+    "new_feature_low_coverage",
+    "tutorial_theme_missing_reference_article",
+]
+
+router = APIRouter(prefix="/v1/themes", tags=["themes"])
+
+
+class ThemeResult(BaseModel):
+    theme: str
+    doc_count: int
+    last_seen: datetime | None
+
+
+class ThemeListResponse(BaseModel):
+    count: int
+    results: list[ThemeResult]
+    next_cursor: str | None
+
+
+class GapResult(BaseModel):
+    theme: str
+    gap_type: GapType
+    reason: str
+    tutorial_count: int
+    blog_count: int
+    recent_count_90d: int
+    last_seen: datetime | None
+    evidence_urls: list[str]
+
+
+class GapResponse(BaseModel):
+    count: int
+    results: list[GapResult]
+    next_cursor: str | None
+
+
+def theme_payload(item: ThemeSummary) -> dict[str, Any]:
+    """``ThemeResult`` as a plain dict, for ``FastJSONResponse``."""
+    return {"theme": item.theme, "doc_count": item.doc_count, "last_seen": item.last_seen}
+
+
+def gap_payload(gap: ThemeGap) -> dict[str, Any]:
+    """``GapResult`` as a plain dict, for ``FastJSONResponse``."""
+    return {
+        "theme": gap.theme,
+        "gap_type": gap.gap_type,
+        "reason": gap.reason,
+        "tutorial_count": gap.tutorial_count,
+        "blog_count": gap.blog_count,
+        "recent_count_90d": gap.recent_count_90d,
+        "last_seen": gap.last_seen,
+        "evidence_urls": gap.evidence_urls,
+    }
+
+
+@router.get("/list", response_model=ThemeListResponse)
+async def themes_list(
+    session: Annotated[AsyncSession, Depends(get_async_read_db_session)],
+    after: date | None = None,
+    before: date | None = None,
+    min_docs: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
+    cursor: str | None = None,
+) -> FastJSONResponse:
+    filters = ThemeFilters(after=after, before=before)
+    fingerprint = filters_fingerprint(filters, min_docs)
+    position = None
+    if cursor:
+        values = decode_cursor(cursor, "themes", fingerprint)
+        try:
+            doc_count, theme = values
+            position = ThemeListPosition(doc_count=int(doc_count), theme=str(theme))
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursor("Malformed cursor.") from exc
+
+    themes, next_position = await session.run_sync(list_themes, filters, min_docs, limit, position)
+    next_cursor = None
+    if next_position is not None:
+        next_cursor = encode_cursor(
+            "themes", fingerprint, [next_position.doc_count, next_position.theme]
+        )
+    return FastJSONResponse(
+        {
+            "count": len(themes),
+            "results": [theme_payload(item) for item in themes],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@router.get("/gaps", response_model=GapResponse)
+async def themes_gaps(
+    session: Annotated[AsyncSession, Depends(get_async_read_db_session)],
+    after: date | None = None,
+    before: date | None = None,
+    gap_type: GapType | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> FastJSONResponse:
+    filters = ThemeFilters(after=after, before=before)
+    gap_types = GAP_TYPES if gap_type is None else (gap_type,)
+    fingerprint = filters_fingerprint(filters, gap_types)
+    position = None
+    if cursor:
+        values = decode_cursor(cursor, "gaps", fingerprint)
+        try:
+            theme, cursor_gap_type = values
+            position = ThemeGapPosition(theme=str(theme), gap_type=str(cursor_gap_type))
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursor("Malformed cursor.") from exc
+
+    gaps, next_position = await session.run_sync(
+        find_theme_gaps, filters, gap_types, limit, position
+    )
+    next_cursor = None
+    if next_position is not None:
+        next_cursor = encode_cursor(
+            "gaps", fingerprint, [next_position.theme, next_position.gap_type]
+        )
+    return FastJSONResponse(
+        {
+            "count": len(gaps),
+            "results": [gap_payload(gap) for gap in gaps],
+            "next_cursor": next_cursor,
+        }
+    )
@@ -0,0 +1,20 @@
+"""Crawler package: fetch queued URLs, extract content, persist docs."""
+
+from .extract import ExtractedDoc, extract_document
+from .fetch import FetchedPage, FetchError, RetryPolicy, default_fetch_page, fetch_with_retries
+from .pool import CrawlConfig, CrawlItem, CrawlOutcome, crawl_urls, extract_page
+
+__all__ = [
+    "CrawlConfig",
+    "CrawlItem",
+    "CrawlOutcome",
+    "ExtractedDoc",
+    "FetchError",
+    "FetchedPage",
+    "RetryPolicy",
+    "crawl_urls",
+    "default_fetch_page",
+    "extract_document",
+    "extract_page",
+    "fetch_with_retries",
+]
@@ -0,0 +1,275 @@
+"""HTML content extraction for crawled docs (Issue 4)."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+
+SKIPPED_TAGS = {
+    "aside",
+    "footer",
+    "header",
+    "nav",
+    "noscript",
+    "script",
+    "style",
+    "svg",
+    "template",
+}
+BLOCK_TAGS = {
+    "article",
+    "blockquote",
+    "dd",
+    "div",
+    "dt",
+    "figcaption",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "li",
+    "main",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "tr",
+    "ul",
+}
+# Site chrome only: inside <main>/<article> these hold the entry title and meta.
+PAGE_CHROME_TAGS = {"footer", "header"}
+HEADING_TAGS = {"h1", "h2", "h3"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source"}
+SHORT_DESCRIPTION_MAX_CHARS = 300
+
+_WHITESPACE = re.compile(r"\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_BODY_WHITESPACE = re.compile(rb"\s+")
+# Per-request noise that extraction ignores anyway: WordPress nonces (inline script
+# settings, hidden form fields, data-*nonce attributes), ?ver= cache busters, and cache or
+# timing comments. Stripped before hashing so it cannot make an unchanged page look new.
+_VOLATILE_BLOCKS = re.compile(
+    rb"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->", re.DOTALL | re.IGNORECASE
+)
+_VOLATILE_TAGS = re.compile(rb"<input\b[^>]*>", re.IGNORECASE)
+_NONCE_ATTRIBUTES = re.compile(
+    rb"""\s[\w:-]*nonce[\w:-]*\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+)""", re.IGNORECASE
+)
+_CACHE_BUSTERS = re.compile(rb"""[?&](?:amp;)?(?:ver|_?wpnonce|nonce)=[^&"'\s>]*""", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class ExtractedDoc:
+    title: str | None
+    published_at: datetime | None
+    short_description: str | None
+    content_text: str
+    headings: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    categories: list[str] = field(default_factory=list)
+    language: str = "en"
+
+
+def body_content_hash(body: bytes) -> str:
+    """Hash a raw response body minus per-request noise, with whitespace runs collapsed.
+
+    Computed before extraction so an unchanged page can be recognised without parsing it;
+    re-indented markup, fresh nonces and script or style changes hash the same.
+    """
+    for pattern in (_VOLATILE_BLOCKS, _VOLATILE_TAGS, _NONCE_ATTRIBUTES, _CACHE_BUSTERS):
+        body = pattern.sub(b"", body)
+    return hashlib.sha256(_BODY_WHITESPACE.sub(b" ", body).strip()).hexdigest()
+
+
+def _clean(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _parse_datetime(raw: str | None) -> datetime | None:
+    if not raw:
+        return None
+    try:
+        parsed = datetime.fromisoformat(raw.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class _DocumentParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.meta: dict[str, list[str]] = {}
+        self.language: str | None = None
+        self.title_parts: list[str] = []
+        self.first_time_datetime: str | None = None
+        self.has_main_region = False
+
+        self._in_title = False
+        self._skip_tag: str | None = None
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._heading: list[str] | None = None
+        self._heading_in_main = False
+        self._body_blocks: list[list[str]] = [[]]
+        self._main_blocks: list[list[str]] = [[]]
+        self.body_headings: list[str] = []
+        self.main_headings: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "html" and attributes.get("lang"):
+            self.language = attributes["lang"].split("-")[0].lower()
+        elif tag == "meta":
+            key = attributes.get("property") or attributes.get("name") or attributes.get("itemprop")
+            if key and "content" in attributes:
+                self.meta.setdefault(key.lower(), []).append(attributes["content"])
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "time" and self.first_time_datetime is None and attributes.get("datetime"):
+            self.first_time_datetime = attributes["datetime"]
+
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._break_block()
+            return
+        # Only the tag that opened a skipped region is counted, so unclosed
+        # <li>/<p> tags inside it cannot keep the rest of the page hidden.
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in SKIPPED_TAGS and not (tag in PAGE_CHROME_TAGS and self._main_depth):
+            self._skip_tag = tag
+            self._skip_depth = 1
+            return
+        if tag in {"main", "article"}:
+            self.has_main_region = True
+            self._main_depth += 1
+        if tag in BLOCK_TAGS:
+            self._break_block()
+        if tag in HEADING_TAGS:
+            self._heading = []
+            self._heading_in_main = self._main_depth > 0
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        if tag in VOID_TAGS:
+            return
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag in HEADING_TAGS and self._heading is not None:
+            heading = _clean("".join(self._heading))
+            if heading:
+                self.body_headings.append(heading)
+                if self._heading_in_main:
+                    self.main_headings.append(heading)
+            self._heading = None
+        if tag in BLOCK_TAGS:
+            self._break_block()
+        if tag in {"main", "article"} and self._main_depth:
+            self._main_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        if self._skip_tag is not None:
+            return
+        if self._heading is not None:
+            self._heading.append(data)
+        self._body_blocks[-1].append(data)
+        if self._main_depth:
+            self._main_blocks[-1].append(data)
+
+    def _break_block(self) -> None:
+        if self._body_blocks[-1]:
+            self._body_blocks.append([])
+        if self._main_blocks[-1]:
+            self._main_blocks.append([])
+
+    def content_blocks(self) -> list[str]:
+        blocks = self._main_blocks if self.has_main_region else self._body_blocks
+        return [cleaned for block in blocks if (cleaned := _clean("".join(block)))]
+
+    def headings(self) -> list[str]:
+        return self.main_headings if self.has_main_region else self.body_headings
+
+    def first_meta(self, *keys: str) -> str | None:
+        for key in keys:
+            for value in self.meta.get(key, []):
+                if value.strip():
+                    return _clean(value)
+        return None
+
+    def all_meta(self, key: str) -> list[str]:
+        values: list[str] = []
+        for value in self.meta.get(key, []):
+            cleaned = _clean(value)
+            if cleaned and cleaned not in values:
+                values.append(cleaned)
+        return values
+
+
+def _summarize(blocks: list[str]) -> str | None:
+    text = " ".join(blocks)
+    if not text:
+        return None
+    summary = ""
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{summary} {sentence}".strip()
+        if summary and len(candidate) > SHORT_DESCRIPTION_MAX_CHARS:
+            break
+        summary = candidate
+        if len(summary) >= SHORT_DESCRIPTION_MAX_CHARS // 2:
+            break
+    if len(summary) > SHORT_DESCRIPTION_MAX_CHARS:
+        summary = summary[: SHORT_DESCRIPTION_MAX_CHARS - 1].rstrip() + "…"
+    return summary
+
+
+def extract_document(html: str) -> ExtractedDoc:
+    """Extract title, date, headings, main text and short description from a page.
+
+    Main text comes from ``<main>``/``<article>`` when present, otherwise from the whole
+    body; navigation, header, footer, aside and script-like elements are always dropped.
+    """
+    parser = _DocumentParser()
+    parser.feed(html)
+    parser.close()
+
+    blocks = parser.content_blocks()
+    headings = parser.headings()
+    title = (
+        (headings[0] if headings and parser.has_main_region else None)
+        or parser.first_meta("og:title")
+        or _clean("".join(parser.title_parts))
+        or None
+    )
+    published_at = _parse_datetime(
+        parser.first_meta("article:published_time", "datepublished") or parser.first_time_datetime
+    )
+    short_description = parser.first_meta("description", "og:description") or _summarize(blocks)
+
+    return ExtractedDoc(
+        title=title,
+        published_at=published_at,
+        short_description=short_description,
+        content_text="\n".join(blocks),
+        headings=headings,
+        tags=parser.all_meta("article:tag"),
+        categories=parser.all_meta("article:section"),
+        language=parser.language or "en",
+    )
@@ -0,0 +1,112 @@
+"""Page fetching with retry, exponential backoff and jitter for the crawler."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from app.fetch.scheduler import HostScheduler
+
+USER_AGENT = "JFBDocsBot/0.1 (+crawler)"
+RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+@dataclass(frozen=True)
+class FetchedPage:
+    url: str
+    status: int
+    body: bytes
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def charset(self) -> str:
+        content_type = self.headers.get("Content-Type", "")
+        for part in content_type.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name.lower() == "charset" and value:
+                return value.strip("\"'")
+        return "utf-8"
+
+
+FetchPage = Callable[[str], FetchedPage]
+
+
+def default_fetch_page(url: str) -> FetchedPage:
+    request = Request(url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urlopen(request, timeout=20) as response:  # noqa: S310
+            return FetchedPage(url, response.status, response.read(), dict(response.headers))
+    except HTTPError as exc:
+        with exc:
+            return FetchedPage(url, exc.code, exc.read(), dict(exc.headers))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    backoff_base_seconds: float = 0.5
+    backoff_max_seconds: float = 30.0
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1.")
+
+    def backoff_seconds(self, attempt: int, rng: random.Random | None = None) -> float:
+        """Full-jitter delay before retry number ``attempt`` (1-based)."""
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1))
+        return (rng or random).uniform(0, ceiling)
+
+
+class FetchError(Exception):
+    def __init__(self, url: str, message: str, *, retryable: bool = True) -> None:
+        super().__init__(message)
+        self.url = url
+        self.retryable = retryable
+
+
+async def fetch_with_retries(
+    url: str,
+    fetch_page: FetchPage,
+    policy: RetryPolicy,
+    executor: Executor | None = None,
+    sleep: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    scheduler: HostScheduler | None = None,
+) -> FetchedPage:
+    """Fetch ``url`` on ``executor`` threads, retrying transient failures with backoff.
+
+    Network errors and 429/5xx responses are retried; the final response is returned
+    as-is (including non-retryable 4xx) so callers decide how to record it. With a
+    ``scheduler``, every attempt waits for the host's next slot and reports its status,
+    so a 429/503 ``Retry-After`` pauses all fetches to that host, not just this URL.
+    """
+    loop = asyncio.get_running_loop()
+    attempt = 1
+    while True:
+        if scheduler is not None:
+            await scheduler.acquire_async(url)
+        try:
+            page = await loop.run_in_executor(executor, fetch_page, url)
+        except (URLError, TimeoutError, ConnectionError) as exc:
+            if attempt >= policy.max_attempts:
+                raise FetchError(url, f"{type(exc).__name__}: {exc}") from exc
+        else:
+            if scheduler is not None:
+                scheduler.record_response(url, page.status, page.headers)
+            if page.status not in RETRYABLE_STATUSES or attempt >= policy.max_attempts:
+                return page
+        await sleep(policy.backoff_seconds(attempt))
+        attempt += 1
@@ -0,0 +1,174 @@
+"""Asyncio crawl pool: bounded concurrent fetches feeding a separate parse pool."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from urllib.parse import urlparse
+
+from app.crawler.extract import ExtractedDoc, body_content_hash, extract_document
+from app.crawler.fetch import FetchError, FetchPage, RetryPolicy, fetch_with_retries
+from app.fetch.scheduler import HostScheduler
+
+
+@dataclass(frozen=True)
+class CrawlConfig:
+    max_concurrency: int = 16
+    max_per_host: int = 4
+    retry: RetryPolicy = RetryPolicy()
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1.")
+        if self.max_per_host < 1:
+            raise ValueError("max_per_host must be >= 1.")
+
+
+@dataclass(frozen=True)
+class CrawlItem:
+    id: uuid.UUID
+    url: str
+    source: str
+    doc_type: str
+    known_content_hash: str | None = None
+
+
+@dataclass(frozen=True)
+class CrawlOutcome:
+    item: CrawlItem
+    http_status: int | None = None
+    document: ExtractedDoc | None = None
+    content_hash: str | None = None
+    error: str | None = None
+    retryable: bool = True
+
+    @property
+    def unchanged(self) -> bool:
+        return (
+            self.error is None
+            and self.content_hash is not None
+            and self.content_hash == self.item.known_content_hash
+        )
+
+
+def extract_page(body: bytes, charset: str) -> ExtractedDoc:
+    """Decode and extract a page body; top-level so it can run in a process pool."""
+    try:
+        html = body.decode(charset, errors="replace")
+    except LookupError:
+        html = body.decode("utf-8", errors="replace")
+    return extract_document(html)
+
+
+class _HostLimiter:
+    def __init__(self, max_per_host: int) -> None:
+        self._max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def for_url(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+        return self._semaphores[host]
+
+
+async def _crawl_one(
+    item: CrawlItem,
+    fetch_page: FetchPage,
+    config: CrawlConfig,
+    fetch_slots: asyncio.Semaphore,
+    host_limiter: _HostLimiter,
+    fetch_executor: Executor,
+    parse_executor: Executor,
+    scheduler: HostScheduler | None,
+) -> CrawlOutcome:
+    loop = asyncio.get_running_loop()
+    # The first check for a host fetches its robots.txt, so it runs off the event loop.
+    if scheduler is not None and not await loop.run_in_executor(
+        fetch_executor, scheduler.allowed, item.url
+    ):
+        return CrawlOutcome(item, error="disallowed by robots.txt", retryable=False)
+
+    try:
+        async with fetch_slots, host_limiter.for_url(item.url):
+            page = await fetch_with_retries(
+                item.url,
+                fetch_page,
+                config.retry,
+                fetch_executor,
+                scheduler=scheduler,
+            )
+    except FetchError as exc:
+        return CrawlOutcome(item, error=str(exc), retryable=exc.retryable)
+
+    if page.status != HTTPStatus.OK:
+        return CrawlOutcome(
+            item,
+            http_status=page.status,
+            error=f"HTTP {page.status}",
+            retryable=page.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or page.status == HTTPStatus.TOO_MANY_REQUESTS,
+        )
+
+    content_hash = await loop.run_in_executor(fetch_executor, body_content_hash, page.body)
+    if content_hash == item.known_content_hash:
+        return CrawlOutcome(item, http_status=page.status, content_hash=content_hash)
+
+    # Fetch slots are released before parsing, so CPU-bound extraction on the parse
+    # pool overlaps with network I/O for the remaining URLs.
+    try:
+        document = await loop.run_in_executor(parse_executor, extract_page, page.body, page.charset)
+    except Exception as exc:  # noqa: BLE001 - any parser failure is recorded per URL
+        return CrawlOutcome(
+            item,
+            http_status=page.status,
+            error=f"extract failed: {type(exc).__name__}: {exc}",
+            retryable=False,
+        )
+    return CrawlOutcome(
+        item,
+        http_status=page.status,
+        document=document,
+        content_hash=content_hash,
+    )
+
+
+async def crawl_urls(
+    items: Sequence[CrawlItem],
+    fetch_page: FetchPage,
+    config: CrawlConfig,
+    parse_executor: Executor,
+    scheduler: HostScheduler | None = None,
+) -> list[CrawlOutcome]:
+    """Crawl ``items`` concurrently and return one outcome per item, in input order.
+
+    Pages whose body hash matches ``CrawlItem.known_content_hash`` are not extracted;
+    their outcome has no document and ``unchanged`` set.
+    """
+    fetch_slots = asyncio.Semaphore(config.max_concurrency)
+    host_limiter = _HostLimiter(config.max_per_host)
+    with ThreadPoolExecutor(
+        max_workers=config.max_concurrency,
+        thread_name_prefix="crawl-fetch",
+    ) as fetch_executor:
+        return list(
+            await asyncio.gather(
+                *(
+                    _crawl_one(
+                        item,
+                        fetch_page,
+                        config,
+                        fetch_slots,
+                        host_limiter,
+                        fetch_executor,
+                        parse_executor,
+                        scheduler,
+                    )
+                    for item in items
+                )
+            )
+        )
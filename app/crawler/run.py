@@ -0,0 +1,237 @@
+"""Run the crawler over the discovered_urls queue and persist extracted docs."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from sqlalchemy.orm import Session
+
+from app.crawler.fetch import RetryPolicy
+from app.crawler.pool import CrawlConfig, CrawlItem, CrawlOutcome, crawl_urls
+from app.db.repository import (
+    DEFAULT_MAX_CRAWL_ATTEMPTS,
+    bump_corpus_version,
+    claim_discovered_urls,
+    complete_discovered_urls,
+    fail_discovered_url,
+    get_doc_content_hashes,
+    get_themes_for_docs,
+    mark_docs_recrawled,
+    reclaim_expired_discovered_url_leases,
+    refresh_theme_stats,
+    upsert_crawled_doc,
+)
+from app.db.session import get_session
+from app.fetch.client import FetchClient
+from app.fetch.config import get_http_client_config, get_politeness_config
+from app.fetch.scheduler import HostScheduler
+from app.search.embeddings import DEFAULT_EMBEDDING_BATCH_SIZE, Embedder, get_embedder
+from app.search.indexing import IndexableDoc, index_doc_chunks
+from app.search.vector import vector_search_available
+
+
+def _crawl_config_from_env() -> CrawlConfig:
+    return CrawlConfig(
+        max_concurrency=int(os.getenv("CRAWL_MAX_CONCURRENCY", "16")),
+        max_per_host=int(os.getenv("CRAWL_MAX_CONCURRENCY_PER_HOST", "4")),
+        retry=RetryPolicy(
+            max_attempts=int(os.getenv("CRAWL_FETCH_ATTEMPTS", "3")),
+            backoff_base_seconds=float(os.getenv("CRAWL_BACKOFF_BASE_SECONDS", "0.5")),
+        ),
+    )
+
+
+def _claim_crawl_items(session: Session, batch_size: int, lease_seconds: int) -> list[CrawlItem]:
+    rows = claim_discovered_urls(
+        session,
+        batch_size,
+        lease_seconds=lease_seconds,
+        prefer_recently_modified=True,
+    )
+    known_hashes = get_doc_content_hashes(session, [row.url for row in rows])
+    return [
+        CrawlItem(
+            id=row.id,
+            url=row.url,
+            source=row.source,
+            doc_type=row.type,
+            known_content_hash=known_hashes.get(row.url),
+        )
+        for row in rows
+    ]
+
+
+def persist_crawl_outcomes(
+    session: Session,
+    outcomes: Iterable[CrawlOutcome],
+    crawled_at: datetime,
+    embedder: Embedder | None = None,
+    embedding_batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+) -> Counter[str]:
+    """Store one batch of crawl results; with ``embedder``, changed docs are re-chunked.
+
+    Unchanged pages keep their existing chunks, so the embedding stage only pays for
+    pages whose content actually moved. Any changed doc bumps the corpus version, which
+    invalidates the API result caches once the batch commits, and re-aggregates the
+    ``theme_stats`` rows of the themes it already belongs to (its type or date may move).
+    """
+    counts: Counter[str] = Counter()
+    completed_ids = []
+    unchanged_urls = []
+    changed_docs: list[IndexableDoc] = []
+    for outcome in outcomes:
+        item = outcome.item
+        if outcome.unchanged:
+            unchanged_urls.append(item.url)
+            completed_ids.append(item.id)
+            counts["unchanged"] += 1
+            continue
+        if (
+            outcome.document is not None
+            and outcome.content_hash is not None
+            and outcome.http_status is not None
+        ):
+            doc_id = upsert_crawled_doc(
+                session,
+                url=item.url,
+                source=item.source,
+                doc_type=item.doc_type,
+                document=outcome.document,
+                content_hash=outcome.content_hash,
+                http_status=outcome.http_status,
+                crawled_at=crawled_at,
+            )
+            changed_docs.append(
+                IndexableDoc(
+                    id=doc_id,
+                    title=outcome.document.title or item.url,
+                    content_text=outcome.document.content_text,
+                    headings=outcome.document.headings,
+                )
+            )
+            completed_ids.append(item.id)
+            counts["crawled"] += 1
+            continue
+
+        fail_discovered_url(
+            session,
+            item.id,
+            outcome.error or "unknown error",
+            max_attempts=DEFAULT_MAX_CRAWL_ATTEMPTS if outcome.retryable else 1,
+        )
+        counts["failed"] += 1
+
+    mark_docs_recrawled(
+        session,
+        unchanged_urls,
+        http_status=HTTPStatus.OK,
+        crawled_at=crawled_at,
+    )
+    complete_discovered_urls(session, completed_ids)
+    if embedder is not None and changed_docs:
+        counts["embedded_chunks"] += index_doc_chunks(
+            session,
+            changed_docs,
+            embedder,
+            embedding_batch_size,
+        )
+    if changed_docs:
+        refresh_theme_stats(session, get_themes_for_docs(session, [doc.id for doc in changed_docs]))
+        bump_corpus_version(session)
+    return counts
+
+
+def _crawl_embedder(session: Session) -> Embedder | None:
+    if os.getenv("CRAWL_EMBEDDINGS", "0") == "0":
+        return None
+    if not vector_search_available(session):
+        raise RuntimeError("CRAWL_EMBEDDINGS=1 needs the pgvector doc_chunks table.")
+    return get_embedder()
+
+
+def main() -> int:
+    try:
+        config = _crawl_config_from_env()
+        embedding_batch_size = int(
+            os.getenv("EMBEDDING_BATCH_SIZE", str(DEFAULT_EMBEDDING_BATCH_SIZE))
+        )
+        with get_session() as session:
+            embedder = _crawl_embedder(session)
+        batch_size = int(os.getenv("CRAWL_BATCH_SIZE", "50"))
+        max_batches = int(os.getenv("CRAWL_MAX_BATCHES", "0"))
+        lease_seconds = int(os.getenv("CRAWL_LEASE_SECONDS", "300"))
+        parse_workers = int(os.getenv("CRAWL_PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+        totals: Counter[str] = Counter()
+        batch_count = 0
+        with (
+            FetchClient(get_http_client_config(config.max_concurrency)) as client,
+            ProcessPoolExecutor(max_workers=parse_workers) as parse_executor,
+        ):
+            scheduler = HostScheduler(get_politeness_config(), fetch_robots=client.fetch_robots)
+            while not max_batches or batch_count < max_batches:
+                with get_session() as session:
+                    totals["reclaimed"] += reclaim_expired_discovered_url_leases(session)
+                    items = _claim_crawl_items(session, batch_size, lease_seconds)
+                    session.commit()
+                if not items:
+                    break
+
+                outcomes = asyncio.run(
+                    crawl_urls(items, client.fetch_page, config, parse_executor, scheduler)
+                )
+                with get_session() as session:
+                    totals += persist_crawl_outcomes(
+                        session,
+                        outcomes,
+                        crawled_at=datetime.now(timezone.utc),
+                        embedder=embedder,
+                        embedding_batch_size=embedding_batch_size,
+                    )
+                    session.commit()
+                totals["claimed"] += len(items)
+                batch_count += 1
+
+        print(
+            json.dumps(
+                {
+                    "event": "crawl_summary",
+                    "batch_count": batch_count,
+                    "claimed_count": totals["claimed"],
+                    "crawled_count": totals["crawled"],
+                    "embedded_chunk_count": totals["embedded_chunks"],
+                    "failed_count": totals["failed"],
+                    "reclaimed_count": totals["reclaimed"],
+                    "robots_blocked_count": scheduler.blocked,
+                    "throttled_count": scheduler.throttled,
+                    "unchanged_count": totals["unchanged"],
+                },
+                sort_keys=True,
+            )
+        )
+        return 0
+    except Exception as exc:
+        print(
+            json.dumps(
+                {
+                    "event": "crawl_failed",
+                    "error_type": type(exc).__name__,
+                    "error": str(exc),
+                },
+                sort_keys=True,
+            ),
+            file=sys.stderr,
+        )
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,78 @@
 """Database package for connection config and access primitives."""
 
-from .config import get_database_url, get_test_database_url
+from .config import PoolConfig, get_database_url, get_pool_config, get_test_database_url
 from .repository import (
+    DiscoveryEnqueueResult,
+    DocDetail,
+    DocValidator,
+    PendingDiscoveredUrl,
+    ThemeableDoc,
+    bump_corpus_version,
+    claim_discovered_urls,
+    claim_docs_needing_themes,
+    complete_discovered_urls,
     create_doc,
     create_theme,
     enqueue_discovered_url_candidates,
+    fail_discovered_url,
+    get_corpus_version,
     get_discovery_counts_by_source_type,
     get_doc_by_url,
+    get_doc_content_hashes,
+    get_doc_detail,
+    get_doc_details,
+    get_doc_validator,
+    get_last_discovery_run_at,
+    get_themes_for_docs,
     link_doc_theme,
     list_pending_discovered_urls,
+    load_sitemap_fetch_cache,
+    mark_docs_recrawled,
+    mark_docs_themed,
+    reclaim_expired_discovered_url_leases,
+    refresh_theme_stats,
+    replace_doc_chunks,
+    save_sitemap_fetch_cache,
+    sync_doc_themes,
+    upsert_crawled_doc,
 )
 
 __all__ = [
+    "DiscoveryEnqueueResult",
+    "DocDetail",
+    "DocValidator",
+    "PendingDiscoveredUrl",
+    "PoolConfig",
+    "ThemeableDoc",
+    "bump_corpus_version",
+    "claim_discovered_urls",
+    "claim_docs_needing_themes",
+    "complete_discovered_urls",
     "create_doc",
     "create_theme",
     "enqueue_discovered_url_candidates",
+    "fail_discovered_url",
+    "get_corpus_version",
     "get_database_url",
     "get_discovery_counts_by_source_type",
     "get_doc_by_url",
+    "get_doc_content_hashes",
+    "get_doc_detail",
+    "get_doc_details",
+    "get_doc_validator",
+    "get_last_discovery_run_at",
+    "get_pool_config",
+    "get_themes_for_docs",
     "get_test_database_url",
     "link_doc_theme",
     "list_pending_discovered_urls",
+    "load_sitemap_fetch_cache",
+    "mark_docs_recrawled",
+    "mark_docs_themed",
+    "reclaim_expired_discovered_url_leases",
+    "refresh_theme_stats",
+    "replace_doc_chunks",
+    "save_sitemap_fetch_cache",
+    "sync_doc_themes",
+    "upsert_crawled_doc",
 ]
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass
+from typing import Any
 from urllib.parse import quote_plus
 
 
@@ -34,6 +36,11 @@ def get_database_url() -> str:
     return os.getenv("DATABASE_URL", build_database_url())
 
 
+def get_read_database_url() -> str | None:
+    """Optional read-replica URL for API reads; unset routes every read to the primary."""
+    return os.getenv("DATABASE_READ_URL") or None
+
+
 def get_test_database_url() -> str:
     """Database URL used by DB integration tests."""
     test_url = os.getenv("TEST_DATABASE_URL")
@@ -43,3 +50,80 @@ def get_test_database_url() -> str:
             "Refusing to fall back to DATABASE_URL."
         )
     return test_url
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool and per-statement limits shared by the sync and async engines."""
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout_seconds: float = 30.0
+    pool_recycle_seconds: int = 1800
+    statement_timeout_ms: int = 0
+    # psycopg prepares a statement server-side once it has run this many times on a
+    # connection; ``None`` disables it (needed behind PgBouncer's transaction pooling).
+    prepare_threshold: int | None = 2
+
+    def __post_init__(self) -> None:
+        if self.pool_size < 1:
+            raise ValueError("pool_size must be >= 1.")
+        if self.max_overflow < 0:
+            raise ValueError("max_overflow must be >= 0.")
+        if self.pool_timeout_seconds <= 0:
+            raise ValueError("pool_timeout_seconds must be > 0.")
+        if self.statement_timeout_ms < 0:
+            raise ValueError("statement_timeout_ms must be >= 0.")
+        if self.prepare_threshold is not None and self.prepare_threshold < 0:
+            raise ValueError("prepare_threshold must be >= 0.")
+
+    def engine_options(self) -> dict[str, Any]:
+        """Keyword arguments for ``create_engine``/``create_async_engine``."""
+        connect_args: dict[str, Any] = {"prepare_threshold": self.prepare_threshold}
+        if self.statement_timeout_ms:
+            # Sent as a startup parameter, so it holds for every session on the connection.
+            connect_args["options"] = f"-c statement_timeout={self.statement_timeout_ms}"
+        return {
+            "pool_pre_ping": True,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout_seconds,
+            "pool_recycle": self.pool_recycle_seconds,
+            "connect_args": connect_args,
+        }
+
+
+def get_pool_config() -> PoolConfig:
+    """Pool settings; ``DB_POOL_RECYCLE_SECONDS=-1`` keeps connections indefinitely,
+    ``DB_STATEMENT_TIMEOUT_MS=0`` leaves statements unbounded and
+    ``DB_PREPARE_THRESHOLD=none`` turns off server-side prepared statements."""
+    prepare_threshold = _env("DB_PREPARE_THRESHOLD", "2").strip().lower()
+    return PoolConfig(
+        pool_size=int(_env("DB_POOL_SIZE", "5")),
+        max_overflow=int(_env("DB_MAX_OVERFLOW", "10")),
+        pool_timeout_seconds=float(_env("DB_POOL_TIMEOUT_SECONDS", "30")),
+        pool_recycle_seconds=int(_env("DB_POOL_RECYCLE_SECONDS", "1800")),
+        statement_timeout_ms=int(_env("DB_STATEMENT_TIMEOUT_MS", "0")),
+        prepare_threshold=None if prepare_threshold == "none" else int(prepare_threshold),
+    )
+
+
+@dataclass(frozen=True)
+class ReplicaConfig:
+    """When API reads may use the replica: lag is re-measured every ``lag_check_seconds``."""
+
+    max_lag_seconds: float = 30.0
+    lag_check_seconds: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.max_lag_seconds < 0:
+            raise ValueError("max_lag_seconds must be >= 0.")
+        if self.lag_check_seconds < 0:
+            raise ValueError("lag_check_seconds must be >= 0.")
+
+
+def get_replica_config() -> ReplicaConfig:
+    return ReplicaConfig(
+        max_lag_seconds=float(_env("DATABASE_READ_MAX_LAG_SECONDS", "30")),
+        lag_check_seconds=float(_env("DATABASE_READ_LAG_CHECK_SECONDS", "5")),
+    )
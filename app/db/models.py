@@ -3,29 +3,46 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from sqlalchemy import (
+    BigInteger,
     CheckConstraint,
+    Computed,
+    Date,
     DateTime,
     ForeignKey,
     Index,
     Integer,
     PrimaryKeyConstraint,
+    SmallInteger,
     Text,
     UniqueConstraint,
     func,
     text,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from app.db.types import Vector
+
+EMBEDDING_DIMENSIONS = 384
+
 
 class Base(DeclarativeBase):
     pass
 
 
+# Weighted A-D so title matches outrank headings, then summary, then body text.
+DOC_SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, docs_headings_text(headings)), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(short_description, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(content_text, '')), 'D')"
+)
+
+
 class Doc(Base):
     __tablename__ = "docs"
     __table_args__ = (
@@ -33,6 +50,12 @@ class Doc(Base):
         Index("idx_docs_source", "source"),
         Index("idx_docs_type", "type"),
         Index("idx_docs_published_at", text("published_at DESC")),
+        Index(
+            "idx_docs_published_keyset",
+            text("coalesce(published_at, '-infinity'::timestamptz) DESC"),
+            text("id DESC"),
+        ),
+        Index("idx_docs_search_vector", "search_vector", postgresql_using="gin"),
         CheckConstraint(
             "source IN ('jetformbuilder', 'crocoblock')",
             name="ck_docs_source_values",
@@ -71,12 +94,20 @@ class Doc(Base):
         server_default=text("'{}'::text[]"),
     )
     content_hash: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # "<extractor version>:<content_hash>" the doc's doc_themes were computed from.
+    themes_hash: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     last_crawled_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
     )
     http_status: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     language: Mapped[str] = mapped_column(Text, nullable=False, server_default=text("'en'"))
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(DOC_SEARCH_VECTOR_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
 
     doc_themes: Mapped[list["DocTheme"]] = relationship(
         back_populates="doc",
@@ -128,6 +159,12 @@ class DiscoveredUrl(Base):
     __table_args__ = (
         UniqueConstraint("url", name="uq_discovered_urls_url"),
         Index("idx_discovered_urls_status_discovered_at", "status", "discovered_at"),
+        Index("idx_discovered_urls_status_lastmod", "status", text("lastmod DESC NULLS LAST")),
+        Index(
+            "idx_discovered_urls_processing_lease",
+            "lease_expires_at",
+            postgresql_where=text("status = 'processing'"),
+        ),
         CheckConstraint(
             "source IN ('jetformbuilder', 'crocoblock')",
             name="ck_discovered_urls_source_values",
@@ -163,3 +200,124 @@ class DiscoveredUrl(Base):
     )
     crawl_attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
     last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    lastmod: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+
+class SitemapFetchCacheEntry(Base):
+    __tablename__ = "sitemap_fetch_cache"
+    __table_args__ = (
+        CheckConstraint(
+            "kind IN ('sitemapindex', 'urlset', 'unknown')",
+            name="ck_sitemap_fetch_cache_kind_values",
+        ),
+    )
+
+    sitemap_url: Mapped[str] = mapped_column(Text, primary_key=True)
+    etag: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    locs: Mapped[list[str]] = mapped_column(
+        ARRAY(Text),
+        nullable=False,
+        server_default=text("'{}'::text[]"),
+    )
+    lastmods: Mapped[list[Optional[datetime]]] = mapped_column(
+        ARRAY(DateTime(timezone=True)),
+        nullable=False,
+        server_default=text("'{}'::timestamptz[]"),
+    )
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+# Sentinel bucket for undated docs. Unlike '-infinity' it round-trips through ``date``.
+UNDATED_THEME_BUCKET = date.min
+
+
+class ThemeStat(Base):
+    """Pre-aggregated ``doc_themes`` x ``docs`` counts per theme, UTC publish day and type.
+
+    Rebuilt per theme by ``refresh_theme_stats``; docs without ``published_at`` are
+    counted in the ``UNDATED_THEME_BUCKET`` bucket.
+    """
+
+    __tablename__ = "theme_stats"
+    __table_args__ = (
+        PrimaryKeyConstraint("theme", "bucket", "doc_type", name="pk_theme_stats"),
+        Index("idx_theme_stats_bucket", "bucket"),
+    )
+
+    theme: Mapped[str] = mapped_column(
+        Text,
+        ForeignKey("themes.theme", ondelete="CASCADE"),
+        nullable=False,
+    )
+    bucket: Mapped[date] = mapped_column(Date, nullable=False)
+    doc_type: Mapped[str] = mapped_column(Text, nullable=False)
+    doc_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_seen: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class CorpusVersion(Base):
+    """Single-row counter bumped in the same transaction as every docs content change.
+
+    Readers compare it against the version their cached results were computed at.
+    """
+
+    __tablename__ = "corpus_version"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_corpus_version_single_row"),)
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class DocChunk(Base):
+    """Heading-delimited slice of a doc with its embedding.
+
+    Only present where the pgvector extension is installed (see migration 20261018_0008).
+    """
+
+    __tablename__ = "doc_chunks"
+    __table_args__ = (
+        UniqueConstraint("doc_id", "chunk_index", name="uq_doc_chunks_doc_chunk"),
+        Index(
+            "idx_doc_chunks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    doc_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("docs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    heading: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    embedding_model: Mapped[str] = mapped_column(Text, nullable=False)
+    embedding: Mapped[list[float]] = mapped_column(Vector(EMBEDDING_DIMENSIONS), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
@@ -3,14 +3,50 @@
 from __future__ import annotations
 
 import uuid
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import func, select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    MetaData,
+    Table,
+    Text,
+    and_,
+    any_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert
 from sqlalchemy.orm import Session
 
-from app.db.models import DiscoveredUrl, Doc, DocTheme, Theme
-from app.discovery.sitemap import DiscoveredUrlCandidate
+from app.crawler.extract import ExtractedDoc
+from app.db.models import (
+    UNDATED_THEME_BUCKET,
+    CorpusVersion,
+    DiscoveredUrl,
+    Doc,
+    DocChunk,
+    DocTheme,
+    SitemapFetchCacheEntry,
+    Theme,
+    ThemeStat,
+)
+from app.discovery.cache import CachedSitemap
+from app.discovery.sitemap import DiscoveredUrlCandidate, SitemapEntry
+from app.search.chunking import TextChunk
 
 
 def create_doc(
@@ -32,9 +68,329 @@ def create_doc(
     return doc
 
 
+def upsert_crawled_doc(
+    session: Session,
+    *,
+    url: str,
+    source: str,
+    doc_type: str,
+    document: ExtractedDoc,
+    content_hash: str,
+    http_status: int,
+    crawled_at: datetime,
+) -> uuid.UUID:
+    values = {
+        "url": url,
+        "source": source,
+        "type": doc_type,
+        "title": document.title or url,
+        "published_at": document.published_at,
+        "tags": document.tags,
+        "categories": document.categories,
+        "short_description": document.short_description,
+        "content_text": document.content_text,
+        "headings": document.headings,
+        "content_hash": content_hash,
+        "last_crawled_at": crawled_at,
+        "http_status": http_status,
+        "language": document.language,
+    }
+    stmt = insert(Doc).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Doc.url],
+        set_={name: stmt.excluded[name] for name in values if name != "url"},
+    ).returning(Doc.id)
+    doc_id = session.execute(stmt).scalar_one()
+    session.flush()
+    return doc_id
+
+
+def get_doc_content_hashes(session: Session, urls: Iterable[str]) -> dict[str, str]:
+    url_list = list(urls)
+    if not url_list:
+        return {}
+    stmt = select(Doc.url, Doc.content_hash).where(
+        Doc.url.in_(url_list),
+        Doc.content_hash.is_not(None),
+    )
+    return {url: content_hash for url, content_hash in session.execute(stmt)}
+
+
+def mark_docs_recrawled(
+    session: Session,
+    urls: Iterable[str],
+    *,
+    http_status: int,
+    crawled_at: datetime,
+) -> int:
+    """Record a crawl of unchanged pages with one UPDATE, leaving content untouched."""
+    url_list = list(urls)
+    if not url_list:
+        return 0
+    stmt = (
+        update(Doc)
+        .where(Doc.url.in_(url_list))
+        .values(last_crawled_at=crawled_at, http_status=http_status)
+        .execution_options(synchronize_session=False)
+    )
+    result = session.execute(stmt)
+    session.flush()
+    return result.rowcount
+
+
+def replace_doc_chunks(
+    session: Session,
+    doc_id: uuid.UUID,
+    chunks: Sequence[TextChunk],
+    embeddings: Sequence[Sequence[float]],
+    embedding_model: str,
+) -> int:
+    if len(chunks) != len(embeddings):
+        raise ValueError("Each chunk needs exactly one embedding.")
+    session.execute(delete(DocChunk).where(DocChunk.doc_id == doc_id))
+    if chunks:
+        session.execute(
+            insert(DocChunk),
+            [
+                {
+                    "doc_id": doc_id,
+                    "chunk_index": chunk.index,
+                    "heading": chunk.heading,
+                    "content": chunk.text,
+                    "embedding_model": embedding_model,
+                    "embedding": list(embedding),
+                }
+                for chunk, embedding in zip(chunks, embeddings)
+            ],
+        )
+    session.flush()
+    return len(chunks)
+
+
+# Hot-path statements are built once with bind parameters. A prebuilt statement memoizes
+# its cache key, so each call skips both query construction and the compiled-cache key
+# walk; psycopg then prepares the identical SQL server-side (``DB_PREPARE_THRESHOLD``).
+_DOC_BY_URL = select(Doc).where(Doc.url == bindparam("url"))
+
+# A doc's themes as one sorted text[] from a correlated subquery, so read paths get them
+# in the same round trip as the doc row instead of a follow-up ``doc_themes`` query.
+DOC_THEMES_ARRAY = (
+    select(
+        func.coalesce(
+            func.array_agg(aggregate_order_by(DocTheme.theme, DocTheme.theme)),
+            literal_column("'{}'::text[]"),
+        )
+    )
+    .where(DocTheme.doc_id == Doc.id)
+    .scalar_subquery()
+)
+_DOC_VALIDATOR_BY_URL = select(Doc.content_hash, DOC_THEMES_ARRAY.label("themes")).where(
+    Doc.url == bindparam("url")
+)
+DOC_DETAIL_BY_URL = select(
+    Doc.id,
+    Doc.url,
+    Doc.title,
+    Doc.source,
+    Doc.type,
+    Doc.published_at,
+    Doc.short_description,
+    Doc.content_text,
+    Doc.content_hash,
+    Doc.headings,
+    Doc.tags,
+    DOC_THEMES_ARRAY.label("themes"),
+).where(Doc.url == bindparam("url"))
+_CORPUS_VERSION = select(CorpusVersion.version).where(CorpusVersion.id == 1)
+
+
 def get_doc_by_url(session: Session, url: str) -> Doc | None:
-    stmt = select(Doc).where(Doc.url == url)
-    return session.scalar(stmt)
+    """The tracked ORM ``Doc``, for code that modifies it; read paths use ``get_doc_detail``."""
+    return session.scalar(_DOC_BY_URL, {"url": url})
+
+
+@dataclass(frozen=True, slots=True)
+class DocDetail:
+    """Full doc payload detached from the session, safe to cache across requests."""
+
+    id: uuid.UUID
+    url: str
+    title: str
+    source: str
+    doc_type: str
+    published_at: datetime | None
+    short_description: str | None
+    content_text: str | None
+    content_hash: str | None
+    headings: tuple[str, ...]
+    tags: tuple[str, ...]
+    themes: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class DocValidator:
+    """What a doc's ETag is derived from, loaded without ``content_text``."""
+
+    content_hash: str | None
+    themes: tuple[str, ...]
+
+
+def get_doc_validator(session: Session, url: str) -> DocValidator | None:
+    row = session.execute(_DOC_VALIDATOR_BY_URL, {"url": url}).one_or_none()
+    if row is None:
+        return None
+    return DocValidator(content_hash=row.content_hash, themes=tuple(row.themes))
+
+
+def get_doc_detail(session: Session, url: str) -> DocDetail | None:
+    row = session.execute(DOC_DETAIL_BY_URL, {"url": url}).one_or_none()
+    if row is None:
+        return None
+    return DocDetail(
+        id=row.id,
+        url=row.url,
+        title=row.title,
+        source=row.source,
+        doc_type=row.type,
+        published_at=row.published_at,
+        short_description=row.short_description,
+        content_text=row.content_text,
+        content_hash=row.content_hash,
+        headings=tuple(row.headings),
+        tags=tuple(row.tags),
+        themes=tuple(row.themes),
+    )
+
+
+DOC_DETAIL_FIELDS = (
+    "title",
+    "source",
+    "type",
+    "published_at",
+    "short_description",
+    "content_text",
+    "headings",
+    "tags",
+    "themes",
+)
+
+
+def get_doc_details(
+    session: Session,
+    urls: Sequence[str],
+    *,
+    fields: Collection[str] | None = None,
+    max_content_chars: int | None = None,
+) -> list[dict[str, Any]]:
+    """Docs for ``urls`` in request order (unknown URLs skipped), keyed by API field name.
+
+    One ``url = ANY(:urls)`` query loads only the requested ``fields`` (default: all);
+    ``content_text`` is cut to ``max_content_chars`` in SQL, with ``content_truncated``
+    reporting whether anything was dropped. Themes come from the same query.
+    """
+    if not urls:
+        return []
+    wanted = DOC_DETAIL_FIELDS if fields is None else [f for f in DOC_DETAIL_FIELDS if f in fields]
+    columns: dict[str, Any] = {
+        "title": Doc.title,
+        "source": Doc.source,
+        "type": Doc.type,
+        "published_at": Doc.published_at,
+        "short_description": Doc.short_description,
+        "content_text": Doc.content_text,
+        "headings": Doc.headings,
+        "tags": Doc.tags,
+        "themes": DOC_THEMES_ARRAY,
+    }
+    selected = [Doc.url]
+    for name in wanted:
+        if name == "content_text" and max_content_chars is not None:
+            selected.append(func.left(Doc.content_text, max_content_chars).label("content_text"))
+            selected.append(
+                (func.coalesce(func.length(Doc.content_text), 0) > max_content_chars).label(
+                    "content_truncated"
+                )
+            )
+        elif name in columns:
+            selected.append(columns[name].label(name))
+
+    url_array = literal(list(urls), ARRAY(Text))
+    rows = session.execute(select(*selected).where(Doc.url == any_(url_array))).mappings().all()
+    by_url = {row["url"]: row for row in rows}
+    return [dict(by_url[url]) for url in dict.fromkeys(urls) if url in by_url]
+
+
+def get_corpus_version(session: Session) -> int:
+    return session.scalar(_CORPUS_VERSION) or 0
+
+
+def bump_corpus_version(session: Session) -> int:
+    """Advance the corpus version; call in the transaction that changes docs content."""
+    stmt = (
+        update(CorpusVersion)
+        .where(CorpusVersion.id == 1)
+        .values(version=CorpusVersion.version + 1, updated_at=func.now())
+        .returning(CorpusVersion.version)
+    )
+    version = session.execute(stmt).scalar_one()
+    session.flush()
+    return version
+
+
+# UTC publish day; undated docs land in UNDATED_THEME_BUCKET.
+THEME_STATS_BUCKET = func.coalesce(
+    cast(func.timezone("UTC", Doc.published_at), Date),
+    literal(UNDATED_THEME_BUCKET, Date),
+)
+
+
+def get_themes_for_docs(session: Session, doc_ids: Iterable[uuid.UUID]) -> list[str]:
+    id_list = list(doc_ids)
+    if not id_list:
+        return []
+    stmt = select(DocTheme.theme).where(DocTheme.doc_id.in_(id_list)).distinct()
+    return sorted(session.scalars(stmt))
+
+
+def refresh_theme_stats(session: Session, themes: Iterable[str] | None = None) -> int:
+    """Recompute the ``theme_stats`` rows of ``themes`` (every theme when ``None``).
+
+    Call in the transaction that changed those themes' docs or memberships. Refreshes
+    are serialized with an advisory lock so concurrent batches never interleave the
+    delete and insert of one theme.
+    """
+    theme_list: list[str] | None = None
+    if themes is not None:
+        theme_list = sorted(set(themes))
+        if not theme_list:
+            return 0
+    session.execute(select(func.pg_advisory_xact_lock(func.hashtext("theme_stats"))))
+
+    delete_stmt = delete(ThemeStat).execution_options(synchronize_session=False)
+    aggregate = (
+        select(
+            DocTheme.theme,
+            THEME_STATS_BUCKET,
+            Doc.type,
+            func.count(),
+            func.max(Doc.published_at),
+        )
+        .join(Doc, Doc.id == DocTheme.doc_id)
+        .group_by(DocTheme.theme, THEME_STATS_BUCKET, Doc.type)
+    )
+    if theme_list is not None:
+        delete_stmt = delete_stmt.where(ThemeStat.theme.in_(theme_list))
+        aggregate = aggregate.where(DocTheme.theme.in_(theme_list))
+    session.execute(delete_stmt)
+    result = session.execute(
+        insert(ThemeStat).from_select(
+            ["theme", "bucket", "doc_type", "doc_count", "last_seen"],
+            aggregate,
+        ),
+        execution_options={"preserve_rowcount": True},
+    )
+    session.flush()
+    return result.rowcount
 
 
 def create_theme(session: Session, theme: str, description: str | None = None) -> Theme:
@@ -51,45 +407,447 @@ def link_doc_theme(session: Session, doc_id: uuid.UUID, theme: str) -> DocTheme:
     return link
 
 
-def enqueue_discovered_url_candidates(
+@dataclass(frozen=True)
+class ThemeableDoc:
+    """The fields theme extraction reads; ``lead_text`` is the start of ``content_text``."""
+
+    id: uuid.UUID
+    themes_hash: str
+    title: str
+    tags: tuple[str, ...]
+    categories: tuple[str, ...]
+    headings: tuple[str, ...]
+    lead_text: str | None
+
+
+def claim_docs_needing_themes(
     session: Session,
-    candidates: Iterable[DiscoveredUrlCandidate],
-) -> int:
-    rows = [
-        {
-            "url": candidate.url,
-            "source": candidate.source,
-            "type": candidate.doc_type,
-            "discovered_at": candidate.discovered_at,
-            "last_seen_at": candidate.discovered_at,
-        }
-        for candidate in candidates
+    hash_prefix: str,
+    limit: int,
+    *,
+    lead_chars: int,
+) -> list[ThemeableDoc]:
+    """Lock up to ``limit`` crawled docs whose ``themes_hash`` is not ``hash_prefix`` +
+    ``content_hash``, i.e. docs changed (or extracted by older rules) since their last
+    theme run. Locked rows are skipped, so concurrent runs split the work.
+    """
+    expected_hash = literal(hash_prefix, Text) + Doc.content_hash
+    stmt = (
+        select(
+            Doc.id,
+            expected_hash.label("themes_hash"),
+            Doc.title,
+            Doc.tags,
+            Doc.categories,
+            Doc.headings,
+            func.left(Doc.content_text, lead_chars).label("lead_text"),
+        )
+        .where(Doc.content_hash.is_not(None), Doc.themes_hash.is_distinct_from(expected_hash))
+        .order_by(Doc.id)
+        .limit(limit)
+        .with_for_update(of=Doc, skip_locked=True)
+    )
+    return [
+        ThemeableDoc(
+            id=row.id,
+            themes_hash=row.themes_hash,
+            title=row.title,
+            tags=tuple(row.tags),
+            categories=tuple(row.categories),
+            headings=tuple(row.headings),
+            lead_text=row.lead_text,
+        )
+        for row in session.execute(stmt)
     ]
-    if not rows:
+
+
+def sync_doc_themes(session: Session, doc_themes: Mapping[uuid.UUID, Collection[str]]) -> set[str]:
+    """Make each doc's ``doc_themes`` rows exactly the given themes, writing only the diff.
+
+    Missing ``themes`` rows are created. Returns the themes whose membership changed;
+    only those get ``themes.updated_at`` bumped.
+    """
+    if not doc_themes:
+        return set()
+    wanted = {(doc_id, theme) for doc_id, themes in doc_themes.items() for theme in themes}
+    current_stmt = select(DocTheme.doc_id, DocTheme.theme).where(
+        DocTheme.doc_id.in_(list(doc_themes))
+    )
+    current = {(row.doc_id, row.theme) for row in session.execute(current_stmt)}
+    removed = current - wanted
+    added = wanted - current
+    if removed:
+        session.execute(
+            delete(DocTheme)
+            .where(tuple_(DocTheme.doc_id, DocTheme.theme).in_(sorted(removed)))
+            .execution_options(synchronize_session=False)
+        )
+    if added:
+        session.execute(
+            insert(Theme)
+            .values([{"theme": theme} for theme in sorted({theme for _, theme in added})])
+            .on_conflict_do_nothing(index_elements=[Theme.theme])
+        )
+        session.execute(
+            insert(DocTheme)
+            .values([{"doc_id": doc_id, "theme": theme} for doc_id, theme in sorted(added)])
+            .on_conflict_do_nothing()
+        )
+    changed = {theme for _, theme in removed | added}
+    if changed:
+        session.execute(
+            update(Theme)
+            .where(Theme.theme.in_(sorted(changed)))
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    session.flush()
+    return changed
+
+
+def mark_docs_themed(session: Session, themes_hashes: Mapping[uuid.UUID, str]) -> int:
+    """Record the ``themes_hash`` each doc was just themed at, with one executemany UPDATE."""
+    if not themes_hashes:
         return 0
+    stmt = (
+        update(Doc.__table__)
+        .where(Doc.__table__.c.id == bindparam("doc_id"))
+        .values(themes_hash=bindparam("themes_hash"))
+    )
+    session.execute(
+        stmt,
+        [
+            {"doc_id": doc_id, "themes_hash": themes_hash}
+            for doc_id, themes_hash in themes_hashes.items()
+        ],
+    )
+    session.flush()
+    return len(themes_hashes)
 
-    stmt = insert(DiscoveredUrl).values(rows)
-    stmt = stmt.on_conflict_do_update(
+
+@dataclass(frozen=True)
+class DiscoveryEnqueueResult:
+    inserted: int
+    updated: int
+    unchanged: int
+
+    @property
+    def processed(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+_discovery_staging = Table(
+    "discovered_urls_staging",
+    MetaData(),
+    Column("url", Text, nullable=False),
+    Column("source", Text, nullable=False),
+    Column("type", Text, nullable=False),
+    Column("discovered_at", DateTime(timezone=True), nullable=False),
+    Column("lastmod", DateTime(timezone=True), nullable=True),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def _copy_candidates_to_staging(
+    session: Session,
+    candidates: Iterable[DiscoveredUrlCandidate],
+) -> None:
+    connection = session.connection()
+    _discovery_staging.drop(connection, checkfirst=True)
+    _discovery_staging.create(connection)
+
+    # COPY streams rows to the server with no bind-parameter limit, so arbitrarily
+    # large iterators are ingested without materializing them client-side.
+    columns = ", ".join(column.name for column in _discovery_staging.columns)
+    cursor = connection.connection.driver_connection.cursor()
+    with cursor, cursor.copy(f"COPY {_discovery_staging.name} ({columns}) FROM STDIN") as copy:
+        for candidate in candidates:
+            copy.write_row(
+                (
+                    candidate.url,
+                    candidate.source,
+                    candidate.doc_type,
+                    candidate.discovered_at,
+                    candidate.lastmod,
+                )
+            )
+
+
+def enqueue_discovered_url_candidates(
+    session: Session,
+    candidates: Iterable[DiscoveredUrlCandidate],
+) -> DiscoveryEnqueueResult:
+    _copy_candidates_to_staging(session, candidates)
+    staging = _discovery_staging.c
+
+    # The last-seen copy of a repeated URL wins, so ON CONFLICT never touches a row twice.
+    ranked = select(
+        *_discovery_staging.columns,
+        func.row_number()
+        .over(partition_by=staging.url, order_by=staging.discovered_at.desc())
+        .label("copy_rank"),
+    ).subquery("ranked")
+    incoming = (
+        select(*(ranked.c[column.name] for column in _discovery_staging.columns))
+        .where(ranked.c.copy_rank == 1)
+        .cte("incoming")
+    )
+    # Every CTE shares one snapshot, so `existing` holds the pre-upsert row values.
+    existing = (
+        select(
+            DiscoveredUrl.url,
+            DiscoveredUrl.source,
+            DiscoveredUrl.type,
+            DiscoveredUrl.lastmod,
+            DiscoveredUrl.status,
+        )
+        .join(incoming, incoming.c.url == DiscoveredUrl.url)
+        .cte("existing")
+    )
+
+    upsert = insert(DiscoveredUrl).from_select(
+        ["url", "source", "type", "discovered_at", "last_seen_at", "lastmod"],
+        select(
+            incoming.c.url,
+            incoming.c.source,
+            incoming.c.type,
+            incoming.c.discovered_at,
+            incoming.c.discovered_at,
+            incoming.c.lastmod,
+        ),
+    )
+    # SQLAlchemy does not correlate subqueries in ON CONFLICT SET (it would add
+    # discovered_urls to the subquery's FROM), so the conflicting row is named directly.
+    last_crawled_at = (
+        select(Doc.last_crawled_at)
+        .where(Doc.url == literal_column(f"{DiscoveredUrl.__tablename__}.url"))
+        .scalar_subquery()
+    )
+    # A crawled page whose sitemap lastmod moved forward goes back into the queue. Rows
+    # from before lastmod was stored have none, so the last crawl of the doc at that URL
+    # stands in for it: a lastmod after that crawl also requeues the page.
+    upsert = upsert.on_conflict_do_update(
         index_elements=[DiscoveredUrl.url],
         set_={
-            "source": stmt.excluded.source,
-            "type": stmt.excluded.type,
-            "last_seen_at": stmt.excluded.last_seen_at,
+            "source": upsert.excluded.source,
+            "type": upsert.excluded.type,
+            "last_seen_at": upsert.excluded.last_seen_at,
+            "lastmod": func.coalesce(upsert.excluded.lastmod, DiscoveredUrl.lastmod),
+            "status": case(
+                (
+                    and_(
+                        DiscoveredUrl.status == "crawled",
+                        upsert.excluded.lastmod
+                        > func.coalesce(DiscoveredUrl.lastmod, last_crawled_at),
+                    ),
+                    "pending",
+                ),
+                else_=DiscoveredUrl.status,
+            ),
         },
     )
-    session.execute(stmt)
+    upserted = upsert.returning(
+        DiscoveredUrl.url,
+        DiscoveredUrl.source,
+        DiscoveredUrl.type,
+        DiscoveredUrl.lastmod,
+        DiscoveredUrl.status,
+    ).cte("upserted")
+
+    is_new = existing.c.url.is_(None)
+    changed = or_(
+        *(
+            upserted.c[name].is_distinct_from(existing.c[name])
+            for name in ("source", "type", "lastmod", "status")
+        )
+    )
+    summary = select(
+        func.count().filter(is_new),
+        func.count().filter(and_(~is_new, changed)),
+        func.count().filter(and_(~is_new, ~changed)),
+    ).select_from(upserted.outerjoin(existing, existing.c.url == upserted.c.url))
+
+    inserted, updated, unchanged = session.execute(summary).one()
+    _discovery_staging.drop(session.connection())
     session.flush()
-    return len(rows)
+    return DiscoveryEnqueueResult(inserted=inserted, updated=updated, unchanged=unchanged)
 
 
-def list_pending_discovered_urls(session: Session, limit: int = 100) -> list[DiscoveredUrl]:
-    stmt = (
-        select(DiscoveredUrl)
+def _pending_queue_order(prefer_recently_modified: bool) -> list:
+    order_by = [DiscoveredUrl.discovered_at.asc()]
+    if prefer_recently_modified:
+        order_by.insert(0, DiscoveredUrl.lastmod.desc().nulls_last())
+    return order_by
+
+
+@dataclass(frozen=True, slots=True)
+class PendingDiscoveredUrl:
+    """Read-only queue row; attribute names match ``DiscoveredUrl``."""
+
+    id: uuid.UUID
+    url: str
+    source: str
+    type: str
+    status: str
+    discovered_at: datetime
+    lastmod: datetime | None
+    crawl_attempts: int
+
+
+_PENDING_DISCOVERED_URLS = {
+    prefer_recently_modified: select(
+        DiscoveredUrl.id,
+        DiscoveredUrl.url,
+        DiscoveredUrl.source,
+        DiscoveredUrl.type,
+        DiscoveredUrl.status,
+        DiscoveredUrl.discovered_at,
+        DiscoveredUrl.lastmod,
+        DiscoveredUrl.crawl_attempts,
+    )
+    .where(DiscoveredUrl.status == "pending")
+    .order_by(*_pending_queue_order(prefer_recently_modified))
+    .limit(bindparam("limit"))
+    for prefer_recently_modified in (False, True)
+}
+
+
+def list_pending_discovered_urls(
+    session: Session,
+    limit: int = 100,
+    *,
+    prefer_recently_modified: bool = False,
+) -> list[PendingDiscoveredUrl]:
+    """Queue rows in crawl order as plain rows, without ORM identity tracking."""
+    stmt = _PENDING_DISCOVERED_URLS[prefer_recently_modified]
+    return [PendingDiscoveredUrl(*row) for row in session.execute(stmt, {"limit": limit})]
+
+
+DEFAULT_MAX_CRAWL_ATTEMPTS = 3
+
+
+def claim_discovered_urls(
+    session: Session,
+    limit: int = 10,
+    *,
+    lease_seconds: int = 300,
+    prefer_recently_modified: bool = False,
+    now: datetime | None = None,
+) -> list[DiscoveredUrl]:
+    """Atomically move up to ``limit`` pending rows to ``processing`` under a lease.
+
+    Rows locked by another worker's open claim are skipped rather than waited on,
+    so concurrent workers never receive the same URL. Commit to publish the claim.
+    """
+    claimed_at = now or datetime.now(timezone.utc)
+    claim_stmt = (
+        select(DiscoveredUrl.id)
         .where(DiscoveredUrl.status == "pending")
-        .order_by(DiscoveredUrl.discovered_at.asc())
+        .order_by(*_pending_queue_order(prefer_recently_modified))
         .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed_ids = list(session.scalars(claim_stmt).all())
+    if not claimed_ids:
+        return []
+
+    stmt = (
+        update(DiscoveredUrl)
+        .where(DiscoveredUrl.id.in_(claimed_ids))
+        .values(
+            status="processing",
+            lease_expires_at=claimed_at + timedelta(seconds=lease_seconds),
+        )
+        .returning(DiscoveredUrl)
+        .execution_options(populate_existing=True)
     )
-    return list(session.scalars(stmt).all())
+    rows_by_id = {row.id: row for row in session.scalars(stmt).all()}
+    session.flush()
+    return [rows_by_id[row_id] for row_id in claimed_ids]
+
+
+def complete_discovered_urls(session: Session, url_ids: Iterable[uuid.UUID]) -> int:
+    """Mark claimed rows ``crawled``; ``crawl_attempts`` only counts consecutive failures."""
+    ids = list(url_ids)
+    if not ids:
+        return 0
+    stmt = (
+        update(DiscoveredUrl)
+        .where(DiscoveredUrl.id.in_(ids), DiscoveredUrl.status == "processing")
+        .values(
+            status="crawled",
+            crawl_attempts=0,
+            last_error=None,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = session.execute(stmt)
+    session.flush()
+    return result.rowcount
+
+
+def _retry_or_fail_status(max_attempts: int):
+    return case(
+        (DiscoveredUrl.crawl_attempts + 1 >= max_attempts, "failed"),
+        else_="pending",
+    )
+
+
+def fail_discovered_url(
+    session: Session,
+    url_id: uuid.UUID,
+    error: str,
+    *,
+    max_attempts: int = DEFAULT_MAX_CRAWL_ATTEMPTS,
+) -> bool:
+    """Record a failed attempt; the row is retried until ``max_attempts`` is reached."""
+    stmt = (
+        update(DiscoveredUrl)
+        .where(DiscoveredUrl.id == url_id, DiscoveredUrl.status == "processing")
+        .values(
+            status=_retry_or_fail_status(max_attempts),
+            crawl_attempts=DiscoveredUrl.crawl_attempts + 1,
+            last_error=error,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = session.execute(stmt)
+    session.flush()
+    return result.rowcount == 1
+
+
+def reclaim_expired_discovered_url_leases(
+    session: Session,
+    *,
+    max_attempts: int = DEFAULT_MAX_CRAWL_ATTEMPTS,
+    now: datetime | None = None,
+) -> int:
+    """Return rows whose worker lease ran out to the queue, counting it as an attempt."""
+    stmt = (
+        update(DiscoveredUrl)
+        .where(
+            DiscoveredUrl.status == "processing",
+            DiscoveredUrl.lease_expires_at < (now or datetime.now(timezone.utc)),
+        )
+        .values(
+            status=_retry_or_fail_status(max_attempts),
+            crawl_attempts=DiscoveredUrl.crawl_attempts + 1,
+            last_error="lease expired",
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = session.execute(stmt)
+    session.flush()
+    return result.rowcount
+
+
+def get_last_discovery_run_at(session: Session) -> datetime | None:
+    """Start time of the latest committed discovery run (every run stamps ``last_seen_at``)."""
+    return session.scalar(select(func.max(DiscoveredUrl.last_seen_at)))
 
 
 def get_discovery_counts_by_source_type(session: Session) -> list[tuple[str, str, int]]:
@@ -103,3 +861,59 @@ def get_discovery_counts_by_source_type(session: Session) -> list[tuple[str, str
         .order_by(DiscoveredUrl.source.asc(), DiscoveredUrl.type.asc())
     )
     return [(source, doc_type, count) for source, doc_type, count in session.execute(stmt).all()]
+
+
+def load_sitemap_fetch_cache(session: Session) -> dict[str, CachedSitemap]:
+    stmt = select(SitemapFetchCacheEntry)
+    return {
+        row.sitemap_url: CachedSitemap(
+            etag=row.etag,
+            last_modified=row.last_modified,
+            content_hash=row.content_hash,
+            kind=row.kind,
+            entries=tuple(
+                SitemapEntry(loc, lastmod)
+                for loc, lastmod in zip(row.locs, row.lastmods or [None] * len(row.locs))
+            ),
+        )
+        for row in session.scalars(stmt)
+    }
+
+
+def save_sitemap_fetch_cache(
+    session: Session,
+    entries: Mapping[str, CachedSitemap],
+    fetched_at: datetime,
+) -> int:
+    rows = [
+        {
+            "sitemap_url": sitemap_url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "content_hash": entry.content_hash,
+            "kind": entry.kind,
+            "locs": [item.loc for item in entry.entries],
+            "lastmods": [item.lastmod for item in entry.entries],
+            "fetched_at": fetched_at,
+        }
+        for sitemap_url, entry in entries.items()
+    ]
+    if not rows:
+        return 0
+
+    stmt = insert(SitemapFetchCacheEntry).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SitemapFetchCacheEntry.sitemap_url],
+        set_={
+            "etag": stmt.excluded.etag,
+            "last_modified": stmt.excluded.last_modified,
+            "content_hash": stmt.excluded.content_hash,
+            "kind": stmt.excluded.kind,
+            "locs": stmt.excluded.locs,
+            "lastmods": stmt.excluded.lastmods,
+            "fetched_at": stmt.excluded.fetched_at,
+        },
+    )
+    session.execute(stmt)
+    session.flush()
+    return len(rows)
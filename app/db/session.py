@@ -1,21 +1,47 @@
-"""Synchronous SQLAlchemy engine/session helpers."""
+"""SQLAlchemy engine/session helpers: sync for jobs, asyncio for the API.
+
+API reads go through ``get_async_read_session``, which uses the ``DATABASE_READ_URL``
+replica when one is configured and not lagging, and the primary otherwise.
+"""
 
 from __future__ import annotations
 
-from collections.abc import Iterator
-from contextlib import contextmanager
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
 from functools import lru_cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.db.config import get_database_url
+from app.db.config import (
+    ReplicaConfig,
+    get_database_url,
+    get_pool_config,
+    get_read_database_url,
+    get_replica_config,
+)
+
+# Seconds since the last replayed transaction, or 0 when every received WAL record has
+# been replayed (an idle primary makes the replay timestamp old without any real lag).
+# On a server that is not a standby every function is NULL, which also reads as 0.
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
 
 
 @lru_cache(maxsize=1)
 def create_db_engine() -> Engine:
-    return create_engine(get_database_url(), pool_pre_ping=True)
+    return create_engine(get_database_url(), **get_pool_config().engine_options())
 
 
 @lru_cache(maxsize=1)
@@ -35,3 +61,112 @@ def get_session() -> Iterator[Session]:
         yield session
     finally:
         session.close()
+
+
+def _async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+
+@lru_cache(maxsize=1)
+def create_async_db_engine() -> AsyncEngine:
+    """Same URL and pool settings as the sync engine; psycopg picks its async driver."""
+    return create_async_engine(get_database_url(), **get_pool_config().engine_options())
+
+
+@lru_cache(maxsize=1)
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return _async_session_factory(create_async_db_engine())
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async with get_async_session_factory()() as session:
+        yield session
+
+
+async def measure_replica_lag(engine: AsyncEngine) -> float:
+    async with engine.connect() as connection:
+        return float(await connection.scalar(REPLICA_LAG_SQL))
+
+
+class ReadRouter:
+    """Chooses the session factory for read-only work.
+
+    The replica is used while its measured lag is at most ``max_lag_seconds``; a lagging
+    or unreachable replica sends reads to the primary until the next successful check.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession] | None = None,
+        config: ReplicaConfig | None = None,
+        measure_lag: Callable[[], Awaitable[float]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if replica is not None and measure_lag is None:
+            raise ValueError("A replica needs a measure_lag probe.")
+        self.config = config or ReplicaConfig()
+        self._primary = primary
+        self._replica = replica
+        self._measure_lag = measure_lag
+        self._clock = clock
+        self._checked_at: float | None = None
+        self._replica_current = False
+        self.lag_seconds: float | None = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    async def _check_replica(self) -> None:
+        now = self._clock()
+        if self._checked_at is not None and now - self._checked_at < self.config.lag_check_seconds:
+            return
+        # Stamped before awaiting so concurrent requests do not all probe at once.
+        self._checked_at = now
+        try:
+            self.lag_seconds = await self._measure_lag()
+        except (OSError, SQLAlchemyError):
+            self.lag_seconds = None
+        self._replica_current = (
+            self.lag_seconds is not None and self.lag_seconds <= self.config.max_lag_seconds
+        )
+
+    async def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        if self._replica is not None:
+            await self._check_replica()
+            if self._replica_current:
+                self.replica_reads += 1
+                return self._replica
+        self.primary_reads += 1
+        return self._primary
+
+    def stats(self) -> dict[str, float | int | bool | None]:
+        return {
+            "replica_configured": self._replica is not None,
+            "replica_current": self._replica_current,
+            "replica_lag_seconds": self.lag_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_read_router() -> ReadRouter:
+    read_url = get_read_database_url()
+    if read_url is None:
+        return ReadRouter(get_async_session_factory())
+    replica_engine = create_async_engine(read_url, **get_pool_config().engine_options())
+    return ReadRouter(
+        get_async_session_factory(),
+        _async_session_factory(replica_engine),
+        get_replica_config(),
+        measure_lag=lambda: measure_replica_lag(replica_engine),
+    )
+
+
+@asynccontextmanager
+async def get_async_read_session() -> AsyncIterator[AsyncSession]:
+    """Session for read-only work: the replica when it is current, else the primary."""
+    factory = await get_read_router().session_factory()
+    async with factory() as session:
+        yield session
@@ -0,0 +1,37 @@
+"""Custom column types for Postgres extensions without a bundled SQLAlchemy type."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy.types import UserDefinedType
+
+
+def vector_literal(values: Sequence[float]) -> str:
+    return "[" + ",".join(repr(float(value)) for value in values) + "]"
+
+
+class Vector(UserDefinedType):
+    """pgvector ``vector(n)`` column, bound and loaded as a list of floats."""
+
+    cache_ok = True
+
+    def __init__(self, dimensions: int) -> None:
+        self.dimensions = dimensions
+
+    def get_col_spec(self, **kw: object) -> str:
+        return f"VECTOR({self.dimensions})"
+
+    def bind_processor(self, dialect):
+        def process(value: Sequence[float] | None) -> str | None:
+            return None if value is None else vector_literal(value)
+
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value: str | None) -> list[float] | None:
+            if value is None:
+                return None
+            return [float(part) for part in value.strip("[]").split(",") if part]
+
+        return process
@@ -1,21 +1,36 @@
 """Sitemap-first discovery package."""
 
+from .cache import CachedSitemap, SitemapFetchCache
 from .sitemap import (
     DEFAULT_SOURCE_SITEMAPS,
     DiscoveredUrlCandidate,
+    DiscoveryStats,
+    FetchConcurrency,
+    SitemapEntry,
+    SitemapResponse,
     SourceSitemapConfig,
     discover_url_candidates,
     infer_doc_type,
     infer_source,
+    iter_sitemap_entries,
     normalize_url,
+    parse_lastmod,
 )
 
 __all__ = [
+    "CachedSitemap",
     "DEFAULT_SOURCE_SITEMAPS",
     "DiscoveredUrlCandidate",
+    "DiscoveryStats",
+    "FetchConcurrency",
+    "SitemapEntry",
+    "SitemapFetchCache",
+    "SitemapResponse",
     "SourceSitemapConfig",
     "discover_url_candidates",
     "infer_doc_type",
     "infer_source",
+    "iter_sitemap_entries",
     "normalize_url",
+    "parse_lastmod",
 ]
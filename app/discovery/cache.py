@@ -0,0 +1,65 @@
+"""In-run view of the persistent sitemap fetch cache used for conditional GETs."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.discovery.sitemap import SitemapEntry
+
+
+@dataclass(frozen=True)
+class CachedSitemap:
+    etag: str | None
+    last_modified: str | None
+    content_hash: str
+    kind: str
+    entries: tuple[SitemapEntry, ...]
+
+
+class SitemapFetchCache:
+    """Validators and parsed locations of previously fetched sitemaps.
+
+    Keys are normalized sitemap URLs. Entries stored during a run are tracked
+    separately so callers only persist what actually changed.
+    """
+
+    def __init__(self, entries: Mapping[str, CachedSitemap] | None = None) -> None:
+        self._entries: dict[str, CachedSitemap] = dict(entries or {})
+        self._updated: dict[str, CachedSitemap] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.refetches = 0
+
+    def get(self, url: str) -> CachedSitemap | None:
+        with self._lock:
+            return self._entries.get(url)
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def store(self, url: str, entry: CachedSitemap) -> None:
+        with self._lock:
+            self.refetches += 1
+            self._entries[url] = entry
+            self._updated[url] = entry
+
+    @property
+    def updated_entries(self) -> dict[str, CachedSitemap]:
+        with self._lock:
+            return dict(self._updated)
+
+
+def conditional_request_headers(entry: CachedSitemap | None) -> dict[str, str]:
+    if entry is None:
+        return {}
+    headers: dict[str, str] = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
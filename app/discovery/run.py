@@ -5,13 +5,26 @@ from __future__ import annotations
 import json
 import os
 import sys
+from datetime import datetime, timezone
 
 from app.db.repository import (
     enqueue_discovered_url_candidates,
     get_discovery_counts_by_source_type,
+    get_last_discovery_run_at,
+    load_sitemap_fetch_cache,
+    save_sitemap_fetch_cache,
 )
 from app.db.session import get_session
-from app.discovery.sitemap import SourceSitemapConfig, discover_url_candidates
+from app.discovery.cache import SitemapFetchCache
+from app.discovery.sitemap import (
+    DiscoveryStats,
+    FetchConcurrency,
+    SourceSitemapConfig,
+    discover_url_candidates,
+)
+from app.fetch.client import FetchClient
+from app.fetch.config import get_http_client_config, get_politeness_config
+from app.fetch.scheduler import HostScheduler
 
 
 def _source_configs_from_env() -> list[SourceSitemapConfig]:
@@ -33,18 +46,71 @@ def _source_configs_from_env() -> list[SourceSitemapConfig]:
     ]
 
 
+def _fetch_concurrency_from_env() -> FetchConcurrency:
+    return FetchConcurrency(
+        max_concurrency=int(os.getenv("DISCOVERY_MAX_CONCURRENCY", "8")),
+        max_per_host=int(os.getenv("DISCOVERY_MAX_CONCURRENCY_PER_HOST", "4")),
+    )
+
+
+def _sitemap_cache_enabled() -> bool:
+    return os.getenv("DISCOVERY_SITEMAP_CACHE", "1") != "0"
+
+
+def _discovery_mode_from_env() -> str:
+    mode = os.getenv("DISCOVERY_MODE", "full")
+    if mode not in {"full", "incremental"}:
+        raise ValueError(f"Unsupported DISCOVERY_MODE '{mode}'.")
+    return mode
+
+
 def main() -> int:
     try:
-        candidates = discover_url_candidates(configs=_source_configs_from_env())
+        started_at = datetime.now(timezone.utc)
+        mode = _discovery_mode_from_env()
+        cache: SitemapFetchCache | None = None
+        modified_since: datetime | None = None
+        with get_session() as session:
+            if _sitemap_cache_enabled():
+                cache = SitemapFetchCache(load_sitemap_fetch_cache(session))
+            if mode == "incremental":
+                modified_since = get_last_discovery_run_at(session)
+
+        stats = DiscoveryStats()
+        concurrency = _fetch_concurrency_from_env()
+        with FetchClient(get_http_client_config(concurrency.max_concurrency)) as client:
+            scheduler = HostScheduler(get_politeness_config(), fetch_robots=client.fetch_robots)
+            candidates = discover_url_candidates(
+                configs=_source_configs_from_env(),
+                now=started_at,
+                concurrency=concurrency,
+                open_stream=client.open_stream,
+                cache=cache,
+                modified_since=modified_since,
+                stats=stats,
+                scheduler=scheduler,
+            )
         with get_session() as session:
-            processed_count = enqueue_discovered_url_candidates(session, candidates)
+            enqueue_result = enqueue_discovered_url_candidates(session, candidates)
+            if cache is not None:
+                save_sitemap_fetch_cache(session, cache.updated_entries, fetched_at=started_at)
             session.commit()
             counts = get_discovery_counts_by_source_type(session)
 
         summary = {
             "event": "url_discovery_summary",
+            "mode": mode,
+            "modified_since": modified_since.isoformat() if modified_since else None,
+            "skipped_sitemap_count": stats.skipped_sitemaps,
             "candidate_count": len(candidates),
-            "processed_count": processed_count,
+            "processed_count": enqueue_result.processed,
+            "inserted_count": enqueue_result.inserted,
+            "updated_count": enqueue_result.updated,
+            "unchanged_count": enqueue_result.unchanged,
+            "sitemap_cache_hits": cache.hits if cache is not None else 0,
+            "sitemap_refetch_count": cache.refetches if cache is not None else 0,
+            "robots_blocked_count": scheduler.blocked,
+            "throttled_count": scheduler.throttled,
             "counts_by_source_type": [
                 {
                     "source": source,
@@ -2,15 +2,25 @@
 
 from __future__ import annotations
 
-from collections import deque
-from collections.abc import Callable, Iterable
+import hashlib
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from gzip import decompress
+from datetime import date, datetime, timezone
+from gzip import GzipFile
+from http import HTTPStatus
+from io import BytesIO
+from typing import BinaryIO
+from urllib.error import HTTPError
 from urllib.parse import urlparse, urlunparse
 from urllib.request import Request, urlopen
 from xml.etree import ElementTree
 
+from app.discovery.cache import CachedSitemap, SitemapFetchCache, conditional_request_headers
+from app.fetch.scheduler import THROTTLE_STATUSES, HostScheduler
+
 
 @dataclass(frozen=True)
 class SourceSitemapConfig:
@@ -18,12 +28,45 @@ class SourceSitemapConfig:
     sitemap_url: str
 
 
+@dataclass(frozen=True)
+class FetchConcurrency:
+    """Upper bounds for in-flight sitemap fetches during one discovery run."""
+
+    max_concurrency: int = 1
+    max_per_host: int = 1
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1.")
+        if self.max_per_host < 1:
+            raise ValueError("max_per_host must be >= 1.")
+
+
+@dataclass(frozen=True)
+class SitemapResponse:
+    status: int
+    body: BinaryIO
+    headers: Mapping[str, str]
+
+
+@dataclass(frozen=True)
+class SitemapEntry:
+    loc: str
+    lastmod: datetime | None = None
+
+
 @dataclass(frozen=True)
 class DiscoveredUrlCandidate:
     url: str
     source: str
     doc_type: str
     discovered_at: datetime
+    lastmod: datetime | None = None
+
+
+@dataclass
+class DiscoveryStats:
+    skipped_sitemaps: int = 0
 
 
 DEFAULT_SOURCE_SITEMAPS: tuple[SourceSitemapConfig, ...] = (
@@ -35,12 +78,55 @@ ALLOWED_SOURCES = {"jetformbuilder", "crocoblock"}
 ALLOWED_DOC_TYPES = {"tutorial", "blog", "kb", "docs", "unknown"}
 
 FetchContent = Callable[[str], bytes]
+OpenStream = Callable[[str, Mapping[str, str]], AbstractContextManager[SitemapResponse]]
+
+SEQUENTIAL_FETCH = FetchConcurrency()
+
+
+@contextmanager
+def _default_open_stream(
+    url: str,
+    request_headers: Mapping[str, str],
+) -> Iterator[SitemapResponse]:
+    request = Request(
+        url,
+        headers={"User-Agent": "JFBDocsBot/0.1 (+sitemap-discovery)", **request_headers},
+    )
+    try:
+        response = urlopen(request, timeout=20)  # noqa: S310
+    except HTTPError as exc:
+        if exc.code != HTTPStatus.NOT_MODIFIED:
+            raise
+        response = exc
+    with response:
+        yield SitemapResponse(status=response.status, body=response, headers=response.headers)
+
+
+def _open_stream_from_fetch(fetch_content: FetchContent) -> OpenStream:
+    """Adapt a whole-body ``FetchContent`` callable to the streaming contract."""
+
+    @contextmanager
+    def open_stream(url: str, request_headers: Mapping[str, str]) -> Iterator[SitemapResponse]:
+        with BytesIO(fetch_content(url)) as stream:
+            yield SitemapResponse(status=HTTPStatus.OK, body=stream, headers={})
 
+    return open_stream
 
-def _default_fetch_content(url: str) -> bytes:
-    request = Request(url, headers={"User-Agent": "JFBDocsBot/0.1 (+sitemap-discovery)"})
-    with urlopen(request, timeout=20) as response:  # noqa: S310
-        return response.read()
+
+class _HashingReader:
+    """Read-through wrapper hashing the raw (still compressed) response body."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self._digest.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
 
 
 def _xml_local_name(tag: str) -> str:
@@ -49,20 +135,58 @@ def _xml_local_name(tag: str) -> str:
     return tag
 
 
-def _parse_sitemap_document(xml_bytes: bytes) -> tuple[str, list[str]]:
-    root = ElementTree.fromstring(xml_bytes)
+def parse_lastmod(raw: str | None) -> datetime | None:
+    """Parse a W3C datetime ``<lastmod>`` value; date-only and naive values are taken as UTC."""
+    if not raw or not raw.strip():
+        return None
+    value = raw.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = datetime.combine(date.fromisoformat(value[:10]), datetime.min.time())
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def iter_sitemap_entries(stream: BinaryIO) -> tuple[str, Iterator[SitemapEntry]]:
+    """Pull-parse a sitemap document and lazily yield its normalized entries.
+
+    Returns the root kind (``sitemapindex``, ``urlset`` or ``unknown``) as soon as the
+    root element is read; the iterator consumes the rest of ``stream`` and drops each
+    ``<url>``/``<sitemap>`` entry once handled, so memory stays flat for large documents.
+    """
+    events = ElementTree.iterparse(stream, events=("start", "end"))
+    _, root = next(events)
     root_name = _xml_local_name(root.tag)
-    locations: list[str] = []
+    kind = root_name if root_name in {"sitemapindex", "urlset"} else "unknown"
 
-    for elem in root.iter():
-        if _xml_local_name(elem.tag) != "loc":
-            continue
-        if elem.text:
-            locations.append(elem.text.strip())
-
-    if root_name in {"sitemapindex", "urlset"}:
-        return root_name, locations
-    return "unknown", locations
+    def entries() -> Iterator[SitemapEntry]:
+        loc: str | None = None
+        lastmod: datetime | None = None
+        for event, elem in events:
+            if event != "end":
+                continue
+            name = _xml_local_name(elem.tag)
+            if name == "loc":
+                if loc:
+                    yield SitemapEntry(loc, lastmod)
+                    lastmod = None
+                loc = normalize_url(elem.text) if elem.text else None
+            elif name == "lastmod":
+                lastmod = parse_lastmod(elem.text)
+            elif name in {"url", "sitemap"}:
+                if loc:
+                    yield SitemapEntry(loc, lastmod)
+                loc, lastmod = None, None
+                root.clear()
+        if loc:
+            yield SitemapEntry(loc, lastmod)
+
+    return kind, entries()
 
 
 def normalize_url(raw_url: str) -> str | None:
@@ -105,63 +229,243 @@ def infer_doc_type(url: str) -> str:
     return "unknown"
 
 
-def _maybe_decompress(url: str, content: bytes) -> bytes:
-    if url.lower().endswith(".gz"):
-        return decompress(content)
-    return content
+@contextmanager
+def _maybe_decompress(url: str, stream: BinaryIO) -> Iterator[BinaryIO]:
+    if not url.lower().endswith(".gz"):
+        yield stream
+        return
+    with GzipFile(fileobj=stream, mode="rb") as decompressed:
+        yield decompressed
+
+
+def _load_sitemap(
+    url: str,
+    open_stream: OpenStream,
+    cache: SitemapFetchCache | None = None,
+) -> tuple[str, tuple[SitemapEntry, ...]]:
+    """Kind and entries of one sitemap, replayed from ``cache`` on ``304 Not Modified``.
+
+    The XML is streamed, so the parse tree never holds more than one entry. The entries
+    themselves are kept, once, in a tuple shared with the cache: the walk returns every
+    page URL and a later 304 must replay them, so memory grows with the entry count
+    (a few hundred bytes each), not with the document size.
+    """
+    cached = cache.get(url) if cache is not None else None
+    with open_stream(url, conditional_request_headers(cached)) as response:
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            if cache is None or cached is None:
+                raise RuntimeError(f"Unexpected 304 for uncached sitemap '{url}'.")
+            cache.record_hit()
+            return cached.kind, cached.entries
+
+        raw = _HashingReader(response.body)
+        with _maybe_decompress(url, raw) as stream:
+            kind, parsed_entries = iter_sitemap_entries(stream)
+            entries = tuple(parsed_entries)
+
+    if cache is not None:
+        cache.store(
+            url,
+            CachedSitemap(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                content_hash=raw.hexdigest(),
+                kind=kind,
+                entries=entries,
+            ),
+        )
+    return kind, entries
+
+
+class _SitemapLoader:
+    """Fetch and parse sitemaps, bounded globally by the executor and per host by semaphores."""
+
+    def __init__(
+        self,
+        open_stream: OpenStream,
+        concurrency: FetchConcurrency,
+        executor: Executor | None = None,
+        cache: SitemapFetchCache | None = None,
+        scheduler: HostScheduler | None = None,
+    ) -> None:
+        self._open_stream = open_stream
+        self._cache = cache
+        self._scheduler = scheduler
+        self._concurrency = concurrency
+        self._executor = executor
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    @property
+    def is_parallel(self) -> bool:
+        return self._executor is not None
+
+    @contextmanager
+    def _host_slot(self, url: str) -> Iterator[None]:
+        host = (urlparse(url).hostname or "").lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self._concurrency.max_per_host)
+                self._host_slots[host] = slot
+        with slot:
+            yield
+
+    def load(self, url: str) -> tuple[str, tuple[SitemapEntry, ...]]:
+        # The slot is held while the body streams in, not just until headers arrive.
+        with self._host_slot(url):
+            if self._scheduler is None:
+                return _load_sitemap(url, self._open_stream, self._cache)
+            return self._load_scheduled(url, self._scheduler)
+
+    def _load_scheduled(
+        self,
+        url: str,
+        scheduler: HostScheduler,
+    ) -> tuple[str, tuple[SitemapEntry, ...]]:
+        if not scheduler.allowed(url):
+            return "unknown", ()
+        retries = 0
+        while True:
+            scheduler.acquire(url)
+            try:
+                result = _load_sitemap(url, self._open_stream, self._cache)
+            except HTTPError as exc:
+                scheduler.record_response(url, exc.code, exc.headers or {})
+                if exc.code not in THROTTLE_STATUSES:
+                    raise
+                if retries >= scheduler.config.max_throttle_retries:
+                    raise
+                retries += 1
+                continue
+            scheduler.record_response(url, HTTPStatus.OK, {})
+            return result
+
+    def load_many(self, urls: list[str]) -> list[tuple[str, tuple[SitemapEntry, ...]]]:
+        """Load sitemaps in parallel, returning results in the same order as ``urls``."""
+        if self._executor is None or len(urls) <= 1:
+            return [self.load(url) for url in urls]
+        return list(self._executor.map(self.load, urls))
+
+
+def _is_stale(entry: SitemapEntry, modified_since: datetime | None) -> bool:
+    return (
+        modified_since is not None and entry.lastmod is not None and entry.lastmod < modified_since
+    )
 
 
 def _discover_urls_from_sitemap_tree(
     root_sitemap_url: str,
-    fetch_content: FetchContent,
-) -> list[str]:
-    queue: deque[str] = deque([root_sitemap_url])
+    loader: _SitemapLoader,
+    modified_since: datetime | None = None,
+) -> tuple[list[SitemapEntry], int]:
+    # Breadth-first by level: every child sitemap of one level is fetched as a single
+    # parallel wave, and results are consumed in document order so the output matches
+    # a sequential FIFO walk exactly.
+    pending: list[str] = [root_sitemap_url]
     visited_sitemaps: set[str] = set()
-    discovered_urls: list[str] = []
+    discovered: list[SitemapEntry] = []
     seen_urls: set[str] = set()
+    skipped_sitemaps = 0
 
-    while queue:
-        sitemap_url = normalize_url(queue.popleft())
-        if not sitemap_url or sitemap_url in visited_sitemaps:
-            continue
-        visited_sitemaps.add(sitemap_url)
-
-        raw = fetch_content(sitemap_url)
-        xml_bytes = _maybe_decompress(sitemap_url, raw)
-        doc_type, locs = _parse_sitemap_document(xml_bytes)
-
-        if doc_type == "sitemapindex":
-            for loc in locs:
-                normalized = normalize_url(loc)
-                if normalized:
-                    queue.append(normalized)
-            continue
-
-        for loc in locs:
-            normalized = normalize_url(loc)
-            if not normalized or normalized in seen_urls:
+    while pending:
+        wave: list[str] = []
+        for raw_url in pending:
+            sitemap_url = normalize_url(raw_url)
+            if not sitemap_url or sitemap_url in visited_sitemaps:
+                continue
+            visited_sitemaps.add(sitemap_url)
+            wave.append(sitemap_url)
+
+        pending = []
+        for doc_type, entries in loader.load_many(wave):
+            if doc_type == "sitemapindex":
+                for entry in entries:
+                    if _is_stale(entry, modified_since):
+                        skipped_sitemaps += 1
+                        continue
+                    pending.append(entry.loc)
                 continue
-            seen_urls.add(normalized)
-            discovered_urls.append(normalized)
 
-    return discovered_urls
+            for entry in entries:
+                if entry.loc in seen_urls:
+                    continue
+                seen_urls.add(entry.loc)
+                discovered.append(entry)
+
+    return discovered, skipped_sitemaps
+
+
+def _discover_urls_per_config(
+    configs: list[SourceSitemapConfig],
+    loader: _SitemapLoader,
+    modified_since: datetime | None,
+) -> list[tuple[list[SitemapEntry], int]]:
+    def walk(config: SourceSitemapConfig) -> tuple[list[SitemapEntry], int]:
+        return _discover_urls_from_sitemap_tree(config.sitemap_url, loader, modified_since)
+
+    if len(configs) <= 1 or not loader.is_parallel:
+        return [walk(config) for config in configs]
+
+    # Source trees are walked on their own threads; their fetches share the loader's pool.
+    with ThreadPoolExecutor(
+        max_workers=len(configs),
+        thread_name_prefix="sitemap-source",
+    ) as source_executor:
+        return list(source_executor.map(walk, configs))
 
 
 def discover_url_candidates(
     configs: Iterable[SourceSitemapConfig] = DEFAULT_SOURCE_SITEMAPS,
-    fetch_content: FetchContent = _default_fetch_content,
+    fetch_content: FetchContent | None = None,
     now: datetime | None = None,
+    concurrency: FetchConcurrency = SEQUENTIAL_FETCH,
+    open_stream: OpenStream = _default_open_stream,
+    cache: SitemapFetchCache | None = None,
+    modified_since: datetime | None = None,
+    stats: DiscoveryStats | None = None,
+    scheduler: HostScheduler | None = None,
 ) -> list[DiscoveredUrlCandidate]:
+    """Walk each source's sitemap tree and classify the discovered page URLs.
+
+    With ``modified_since`` set, child sitemaps whose index ``<lastmod>`` is older are
+    not fetched at all, so only recently changed sitemaps contribute candidates. With a
+    ``scheduler``, sitemaps disallowed by robots.txt are skipped, fetches are paced per
+    host, and 429/503 responses are retried after the host's backoff.
+    """
     discovered_at = now or datetime.now(timezone.utc)
     candidates: list[DiscoveredUrlCandidate] = []
     seen_urls: set[str] = set()
 
+    configs = list(configs)
     for config in configs:
         if config.source not in ALLOWED_SOURCES:
             raise ValueError(f"Unsupported source '{config.source}'.")
-
-        urls = _discover_urls_from_sitemap_tree(config.sitemap_url, fetch_content)
-        for url in urls:
+    if fetch_content is not None:
+        open_stream = _open_stream_from_fetch(fetch_content)
+
+    if concurrency.max_concurrency > 1:
+        with ThreadPoolExecutor(
+            max_workers=concurrency.max_concurrency,
+            thread_name_prefix="sitemap-fetch",
+        ) as executor:
+            results = _discover_urls_per_config(
+                configs,
+                _SitemapLoader(open_stream, concurrency, executor, cache, scheduler),
+                modified_since,
+            )
+    else:
+        results = _discover_urls_per_config(
+            configs,
+            _SitemapLoader(open_stream, concurrency, cache=cache, scheduler=scheduler),
+            modified_since,
+        )
+
+    for config, (entries, skipped_sitemaps) in zip(configs, results):
+        if stats is not None:
+            stats.skipped_sitemaps += skipped_sitemaps
+        for entry in entries:
+            url = entry.loc
             if url in seen_urls:
                 continue
             source = infer_source(url) or config.source
@@ -177,6 +481,7 @@ def discover_url_candidates(
                     source=source,
                     doc_type=doc_type,
                     discovered_at=discovered_at,
+                    lastmod=entry.lastmod,
                 )
             )
 
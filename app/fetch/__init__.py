@@ -0,0 +1,25 @@
+"""Shared outbound fetch primitives used by discovery and crawling.
+
+``FetchClient`` lives in ``app.fetch.client`` and is not re-exported here: it builds
+discovery and crawler response types, which themselves import this package.
+"""
+
+from .config import HttpClientConfig, get_http_client_config, get_politeness_config
+from .scheduler import (
+    THROTTLE_STATUSES,
+    HostScheduler,
+    PolitenessConfig,
+    default_fetch_robots,
+    parse_retry_after,
+)
+
+__all__ = [
+    "THROTTLE_STATUSES",
+    "HostScheduler",
+    "HttpClientConfig",
+    "PolitenessConfig",
+    "default_fetch_robots",
+    "get_http_client_config",
+    "get_politeness_config",
+    "parse_retry_after",
+]
@@ -0,0 +1,164 @@
+"""Pooled HTTP client for every outbound fetch of a discovery or crawl run.
+
+Wraps one ``httpx.Client`` so all sitemap, robots.txt and page requests reuse
+keep-alive connections (and HTTP/2 when ``h2`` is installed) instead of opening a
+new TCP/TLS connection per URL. Its methods satisfy the existing callable contracts
+(``FetchContent``, ``OpenStream``, ``FetchPage`` and ``FetchRobots``) and raise
+``urllib`` errors for HTTP and transport failures, like the ``urlopen`` defaults.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from http import HTTPStatus
+from io import BytesIO
+from urllib.error import HTTPError, URLError
+
+import httpx
+
+from app.crawler.fetch import FetchedPage, FetchError
+from app.discovery.sitemap import SitemapResponse
+from app.fetch.config import HttpClientConfig
+
+
+class ResponseTooLarge(FetchError):
+    """Body exceeded ``max_response_bytes``; never retried, the page will not shrink."""
+
+    def __init__(self, url: str, limit: int) -> None:
+        super().__init__(url, f"response body exceeds {limit} bytes", retryable=False)
+        self.limit = limit
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class _CappedBody:
+    """File-like view of a streaming response that refuses to read past the size cap."""
+
+    def __init__(self, response: httpx.Response, limit: int) -> None:
+        self._chunks = response.iter_bytes()
+        self._buffer = bytearray()
+        self._url = str(response.request.url)
+        self._limit = limit
+        self._received = 0
+
+    def _fill(self, size: int) -> None:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return
+            self._received += len(chunk)
+            if self._received > self._limit:
+                raise ResponseTooLarge(self._url, self._limit)
+            self._buffer += chunk
+
+    def read(self, size: int = -1) -> bytes:
+        self._fill(size)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class FetchClient:
+    """Shared pooled client; use as a context manager so connections are closed."""
+
+    def __init__(
+        self,
+        config: HttpClientConfig | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self.config = config or HttpClientConfig()
+        # brotli/zstd decoding is enabled by httpx itself when those packages are present.
+        self._client = httpx.Client(
+            http2=self.config.http2 and http2_available(),
+            timeout=httpx.Timeout(
+                self.config.timeout_seconds,
+                connect=self.config.connect_timeout_seconds,
+            ),
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry_seconds,
+            ),
+            headers={"User-Agent": self.config.user_agent},
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    def __enter__(self) -> FetchClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._client.close()
+
+    @contextmanager
+    def _stream(
+        self,
+        url: str,
+        request_headers: Mapping[str, str] | None = None,
+    ) -> Iterator[httpx.Response]:
+        try:
+            with self._client.stream("GET", url, headers=dict(request_headers or {})) as response:
+                declared = response.headers.get("Content-Length", "")
+                if declared.isdigit() and int(declared) > self.config.max_response_bytes:
+                    raise ResponseTooLarge(url, self.config.max_response_bytes)
+                yield response
+        except httpx.TransportError as exc:
+            raise URLError(f"{type(exc).__name__}: {exc}") from exc
+
+    def _read(self, response: httpx.Response) -> bytes:
+        return _CappedBody(response, self.config.max_response_bytes).read()
+
+    @staticmethod
+    def _raise_for_status(url: str, response: httpx.Response) -> None:
+        raise HTTPError(
+            url,
+            response.status_code,
+            response.reason_phrase,
+            response.headers,  # type: ignore[arg-type]
+            BytesIO(),
+        )
+
+    def fetch_content(self, url: str) -> bytes:
+        """``FetchContent``: whole body of a 2xx response, ``HTTPError`` otherwise."""
+        with self._stream(url) as response:
+            if not response.is_success:
+                self._raise_for_status(url, response)
+            return self._read(response)
+
+    @contextmanager
+    def open_stream(
+        self,
+        url: str,
+        request_headers: Mapping[str, str],
+    ) -> Iterator[SitemapResponse]:
+        """``OpenStream``: streamed 2xx or 304 response, ``HTTPError`` otherwise."""
+        with self._stream(url, request_headers) as response:
+            if not response.is_success and response.status_code != HTTPStatus.NOT_MODIFIED:
+                self._raise_for_status(url, response)
+            yield SitemapResponse(
+                status=response.status_code,
+                body=_CappedBody(response, self.config.max_response_bytes),
+                headers=response.headers,
+            )
+
+    def fetch_page(self, url: str) -> FetchedPage:
+        """``FetchPage``: any final response, including 4xx/5xx, as a page."""
+        with self._stream(url) as response:
+            return FetchedPage(url, response.status_code, self._read(response), response.headers)
+
+    def fetch_robots(self, robots_url: str) -> str | None:
+        """``FetchRobots``: robots.txt text, or ``None`` when it is missing or unreachable."""
+        try:
+            body = self.fetch_content(robots_url)
+        except (URLError, FetchError):
+            return None
+        return body.decode("utf-8", errors="replace")
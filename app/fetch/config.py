@@ -0,0 +1,57 @@
+"""Outbound fetch settings sourced from environment variables.
+
+Two groups: politeness (per-host rate, burst, robots.txt and throttle retries) as a
+``PolitenessConfig``, and the pooled HTTP client (pool limits, timeouts, HTTP/2 and the
+response body cap) as an ``HttpClientConfig``.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+from app.fetch.scheduler import PolitenessConfig
+
+USER_AGENT = "JFBDocsBot/0.1 (+https://jetformbuilder.com)"
+
+
+@dataclass(frozen=True)
+class HttpClientConfig:
+    timeout_seconds: float = 20.0
+    connect_timeout_seconds: float = 10.0
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = True
+    max_response_bytes: int = 50 * 1024 * 1024
+    user_agent: str = USER_AGENT
+
+    def __post_init__(self) -> None:
+        if self.max_connections < 1:
+            raise ValueError("max_connections must be >= 1.")
+        if self.max_response_bytes < 1:
+            raise ValueError("max_response_bytes must be >= 1.")
+
+
+def get_politeness_config() -> PolitenessConfig:
+    """Per-host rate limits shared by discovery and crawling."""
+    return PolitenessConfig(
+        requests_per_second=float(os.getenv("HOST_REQUESTS_PER_SECOND", "2")),
+        burst=int(os.getenv("HOST_BURST", "4")),
+        min_requests_per_second=float(os.getenv("HOST_MIN_REQUESTS_PER_SECOND", "0.1")),
+        respect_robots=os.getenv("RESPECT_ROBOTS_TXT", "1") != "0",
+        max_throttle_retries=int(os.getenv("HOST_MAX_THROTTLE_RETRIES", "3")),
+    )
+
+
+def get_http_client_config(min_connections: int = 1) -> HttpClientConfig:
+    """Pooled client settings; the pool is never smaller than the caller's concurrency."""
+    max_connections = max(min_connections, int(os.getenv("HTTP_MAX_CONNECTIONS", "32")))
+    return HttpClientConfig(
+        timeout_seconds=float(os.getenv("HTTP_TIMEOUT_SECONDS", "20")),
+        connect_timeout_seconds=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10")),
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        http2=os.getenv("HTTP_HTTP2", "1") != "0",
+        max_response_bytes=int(os.getenv("HTTP_MAX_RESPONSE_BYTES", str(50 * 1024 * 1024))),
+    )
@@ -0,0 +1,216 @@
+"""Per-host politeness shared by sitemap discovery and page crawling.
+
+One ``HostScheduler`` instance is shared by every fetch of a run. It answers robots.txt
+``allowed`` checks, spaces requests to each host with a token bucket (tightened by any
+``Crawl-delay``/``Request-rate``), and reacts to 429/503 responses by pausing the host
+for ``Retry-After`` (or an exponential backoff) and halving its request rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse, urlunparse
+from urllib.request import Request, urlopen
+from urllib.robotparser import RobotFileParser
+
+ROBOTS_USER_AGENT = "JFBDocsBot"
+THROTTLE_STATUSES = frozenset({HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE})
+
+FetchRobots = Callable[[str], str | None]
+
+
+@dataclass(frozen=True)
+class PolitenessConfig:
+    requests_per_second: float = 2.0
+    burst: int = 4
+    min_requests_per_second: float = 0.1
+    respect_robots: bool = True
+    max_throttle_retries: int = 3
+    backoff_base_seconds: float = 1.0
+    backoff_max_seconds: float = 300.0
+    user_agent: str = ROBOTS_USER_AGENT
+
+    def __post_init__(self) -> None:
+        if self.requests_per_second <= 0:
+            raise ValueError("requests_per_second must be > 0.")
+        if self.burst < 1:
+            raise ValueError("burst must be >= 1.")
+        if not 0 < self.min_requests_per_second <= self.requests_per_second:
+            raise ValueError("min_requests_per_second must be > 0 and <= requests_per_second.")
+
+
+def default_fetch_robots(robots_url: str) -> str | None:
+    """Fetch robots.txt; any failure is treated as "no rules" for the rest of the run."""
+    request = Request(robots_url, headers={"User-Agent": f"{ROBOTS_USER_AGENT}/0.1 (+robots)"})
+    try:
+        with urlopen(request, timeout=10) as response:  # noqa: S310
+            return response.read().decode("utf-8", errors="replace")
+    except (HTTPError, URLError, TimeoutError, ConnectionError):
+        return None
+
+
+def parse_retry_after(value: str | None, now: datetime | None = None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class _HostState:
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+
+    def reserve(self, now: float) -> float:
+        # Tokens may go negative: each caller reserves its own future slot, so
+        # concurrent callers are spaced out instead of all waking at once.
+        start = max(now, self.blocked_until)
+        if start > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (start - self.updated) * self.rate)
+            self.updated = start
+        self.tokens -= 1
+        return start - now + max(0.0, -self.tokens / self.rate)
+
+
+class HostScheduler:
+    """Thread-safe per-host rate limiter, robots.txt gate and throttling backoff."""
+
+    def __init__(
+        self,
+        config: PolitenessConfig | None = None,
+        fetch_robots: FetchRobots = default_fetch_robots,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or PolitenessConfig()
+        self._fetch_robots = fetch_robots
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _HostState] = {}
+        self._robots: dict[str, RobotFileParser | None] = {}
+        self._robots_locks: dict[str, threading.Lock] = {}
+        self.blocked = 0
+        self.throttled = 0
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), "", "", "", ""))
+
+    def _robots_for(self, origin: str) -> RobotFileParser | None:
+        with self._lock:
+            if origin in self._robots:
+                return self._robots[origin]
+            origin_lock = self._robots_locks.setdefault(origin, threading.Lock())
+        # One robots.txt fetch per origin; other threads for that origin wait for it.
+        with origin_lock:
+            with self._lock:
+                if origin in self._robots:
+                    return self._robots[origin]
+            text = self._fetch_robots(f"{origin}/robots.txt")
+            parser: RobotFileParser | None = None
+            if text is not None:
+                parser = RobotFileParser()
+                parser.parse(text.splitlines())
+            with self._lock:
+                self._robots[origin] = parser
+            return parser
+
+    def allowed(self, url: str) -> bool:
+        """Whether robots.txt permits ``url``; fetches the origin's robots.txt on first use."""
+        if not self.config.respect_robots:
+            return True
+        robots = self._robots_for(self._origin(url))
+        if robots is None or robots.can_fetch(self.config.user_agent, url):
+            return True
+        with self._lock:
+            self.blocked += 1
+        return False
+
+    def _host_rate(self, origin: str) -> tuple[float, float]:
+        rate = self.config.requests_per_second
+        capacity = float(self.config.burst)
+        robots = self._robots.get(origin) if self.config.respect_robots else None
+        if robots is not None:
+            agent = self.config.user_agent
+            crawl_delay = robots.crawl_delay(agent)
+            request_rate = robots.request_rate(agent)
+            if crawl_delay:
+                rate = min(rate, 1 / float(crawl_delay))
+                capacity = 1.0
+            if request_rate and request_rate.requests and request_rate.seconds:
+                rate = min(rate, request_rate.requests / request_rate.seconds)
+                capacity = 1.0
+        return rate, capacity
+
+    def _state(self, origin: str, now: float) -> _HostState:
+        state = self._hosts.get(origin)
+        if state is None:
+            state = _HostState(*self._host_rate(origin), now=now)
+            self._hosts[origin] = state
+        return state
+
+    def reserve(self, url: str) -> float:
+        """Reserve the next request slot for ``url``'s host; returns seconds to wait first."""
+        origin = self._origin(url)
+        if self.config.respect_robots:
+            self._robots_for(origin)
+        with self._lock:
+            now = self._clock()
+            return self._state(origin, now).reserve(now)
+
+    def acquire(self, url: str, sleep: Callable[[float], object] = time.sleep) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            sleep(delay)
+
+    async def acquire_async(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_response(self, url: str, status: int, headers: Mapping[str, str]) -> None:
+        """Feed a response back: 429/503 pause and slow the host, anything else recovers."""
+        origin = self._origin(url)
+        with self._lock:
+            now = self._clock()
+            state = self._state(origin, now)
+            if status not in THROTTLE_STATUSES:
+                state.consecutive_throttles = 0
+                # Additive recovery towards the configured (or robots) rate.
+                state.rate = min(state.max_rate, state.rate + state.max_rate / 10)
+                return
+
+            self.throttled += 1
+            state.consecutive_throttles += 1
+            # Never above max_rate: a robots Crawl-delay may be slower than the floor.
+            state.rate = min(
+                state.max_rate, max(self.config.min_requests_per_second, state.rate / 2)
+            )
+            delay = parse_retry_after(headers.get("Retry-After"))
+            if delay is None:
+                delay = self.config.backoff_base_seconds * 2 ** (state.consecutive_throttles - 1)
+            delay = min(self.config.backoff_max_seconds, delay)
+            state.blocked_until = max(state.blocked_until, now + delay)
+            state.tokens = min(state.tokens, 0.0)
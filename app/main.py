@@ -1,13 +1,44 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+
+from app.api import docs_router, themes_router
+from app.api.cache import ResultCache
+from app.api.config import get_gzip_min_bytes, get_result_cache_config
+from app.api.cursors import InvalidCursor
+from app.api.responses import FastJSONResponse
+from app.db.session import get_read_router
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="JetFormBuilder Knowledge API", version="0.1.0")
+    app = FastAPI(
+        title="JetFormBuilder Knowledge API",
+        version="0.1.0",
+        default_response_class=FastJSONResponse,
+    )
+    app.state.result_cache = ResultCache(get_result_cache_config())
+    gzip_min_bytes = get_gzip_min_bytes()
+    if gzip_min_bytes > 0:
+        app.add_middleware(GZipMiddleware, minimum_size=gzip_min_bytes)
 
     @app.get("/health", tags=["system"])
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/metrics/cache", tags=["system"])
+    def cache_metrics() -> dict[str, int | None]:
+        return app.state.result_cache.stats()
+
+    @app.get("/metrics/db", tags=["system"])
+    def db_metrics() -> dict[str, float | int | bool | None]:
+        return get_read_router().stats()
+
+    @app.exception_handler(InvalidCursor)
+    def invalid_cursor(request: Request, exc: InvalidCursor) -> FastJSONResponse:
+        return FastJSONResponse(status_code=400, content={"detail": str(exc)})
+
+    app.include_router(docs_router)
+    app.include_router(themes_router)
+
     return app
 
 
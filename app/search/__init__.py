@@ -0,0 +1,34 @@
+"""Docs search: full-text ranking, fuzzy fallback and hybrid embedding retrieval.
+
+``app.search.indexing`` is not re-exported: it writes through ``app.db.repository``,
+which itself imports chunk types from this package.
+"""
+
+from .chunking import TextChunk, chunk_document
+from .embeddings import Embedder, HashingEmbedder, get_embedder
+from .engine import search_docs
+from .fts import SearchFilters, SearchHit, full_text_search
+from .hybrid import hybrid_search, reciprocal_rank_fusion
+from .results import with_snippets, with_themes
+from .trigram import trigram_search, trigram_search_available
+from .vector import vector_search, vector_search_available
+
+__all__ = [
+    "Embedder",
+    "HashingEmbedder",
+    "SearchFilters",
+    "SearchHit",
+    "TextChunk",
+    "chunk_document",
+    "full_text_search",
+    "get_embedder",
+    "hybrid_search",
+    "reciprocal_rank_fusion",
+    "search_docs",
+    "trigram_search",
+    "trigram_search_available",
+    "vector_search",
+    "vector_search_available",
+    "with_snippets",
+    "with_themes",
+]
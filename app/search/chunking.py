@@ -0,0 +1,74 @@
+"""Split extracted doc text into heading-delimited chunks for embedding."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+CHUNK_MAX_CHARS = 1200
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    index: int
+    heading: str | None
+    text: str
+
+    def embedding_input(self, title: str) -> str:
+        """Text sent to the embedder: the doc title and heading give the chunk context."""
+        return "\n".join(part for part in (title, self.heading, self.text) if part)
+
+
+def _split_long(text: str, max_chars: int) -> list[str]:
+    pieces: list[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        candidate = f"{current} {sentence}".strip()
+        if current and len(candidate) > max_chars:
+            pieces.append(current)
+            candidate = sentence
+        current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_document(
+    content_text: str | None,
+    headings: Sequence[str],
+    max_chars: int = CHUNK_MAX_CHARS,
+) -> list[TextChunk]:
+    """Group ``content_text`` lines under the most recent heading, capping chunk size.
+
+    ``content_text`` is the newline-joined block list produced by extraction, in which
+    headings appear as their own lines.
+    """
+    heading_lines = set(headings)
+    sections: list[tuple[str | None, list[str]]] = [(None, [])]
+    for line in (content_text or "").split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if line in heading_lines:
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+
+    chunks: list[TextChunk] = []
+    for heading, lines in sections:
+        if not lines:
+            continue
+        for text in _split_long(" ".join(lines), max_chars):
+            chunks.append(TextChunk(index=len(chunks), heading=heading, text=text))
+    return chunks
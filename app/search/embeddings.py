@@ -0,0 +1,110 @@
+"""Local CPU text embedders used for chunk indexing and hybrid search queries."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import math
+import os
+import re
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
+from typing import Protocol
+
+from app.db.models import EMBEDDING_DIMENSIONS
+
+DEFAULT_EMBEDDING_BATCH_SIZE = 64
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+class Embedder(Protocol):
+    name: str
+    dimensions: int
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]: ...
+
+
+class HashingEmbedder:
+    """Dependency-free signed feature hashing of words, word pairs and char trigrams.
+
+    Captures lexical overlap (including partial words) rather than meaning; it keeps the
+    chunk pipeline and hybrid mode usable where no model package is installed.
+    """
+
+    name = "hashing-v1"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS) -> None:
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> Iterator[tuple[str, float]]:
+        tokens = _TOKEN.findall(text.lower())
+        for token in tokens:
+            yield f"w:{token}", 1.0
+            padded = f"#{token}#"
+            for start in range(len(padded) - 2):
+                yield f"c:{padded[start : start + 3]}", 0.5
+        for first, second in zip(tokens, tokens[1:]):
+            yield f"b:{first} {second}", 0.5
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for feature, weight in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[bucket] += weight if digest[4] & 1 else -weight
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else vector
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+
+class SentenceTransformerEmbedder:
+    """Embedder backed by a local ``sentence-transformers`` model (CPU by default)."""
+
+    def __init__(self, model_name: str, device: str = "cpu") -> None:
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self._model = SentenceTransformer(model_name, device=device)
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        vectors = self._model.encode(
+            list(texts),
+            batch_size=DEFAULT_EMBEDDING_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return vectors.tolist()
+
+
+def iter_embedding_batches(
+    embedder: Embedder,
+    texts: Sequence[str],
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+) -> Iterator[list[float]]:
+    """Embed ``texts`` in fixed-size batches, yielding vectors in input order."""
+    for start in range(0, len(texts), batch_size):
+        yield from embedder.embed(texts[start : start + batch_size])
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> Embedder:
+    """Embedder named by ``EMBEDDING_MODEL``: ``hashing`` or a sentence-transformers model."""
+    model_name = os.getenv("EMBEDDING_MODEL", "hashing")
+    if model_name == "hashing":
+        return HashingEmbedder()
+    if importlib.util.find_spec("sentence_transformers") is None:
+        raise RuntimeError(
+            f"EMBEDDING_MODEL '{model_name}' needs sentence-transformers; "
+            "install the 'embeddings' extra or use EMBEDDING_MODEL=hashing."
+        )
+    embedder = SentenceTransformerEmbedder(model_name)
+    if embedder.dimensions != EMBEDDING_DIMENSIONS:
+        raise ValueError(
+            f"EMBEDDING_MODEL '{model_name}' produces {embedder.dimensions}-dimensional "
+            f"vectors; doc_chunks stores {EMBEDDING_DIMENSIONS}."
+        )
+    return embedder
@@ -0,0 +1,78 @@
+"""Search entry point combining full-text ranking with a fuzzy trigram fallback."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from sqlalchemy.orm import Session
+
+from app.search.fts import (
+    SearchFilters,
+    SearchHit,
+    SearchPosition,
+    full_text_search,
+    position_of,
+)
+from app.search.trigram import trigram_search, trigram_search_available
+
+# Fewer full-text hits than this (or than ``limit``) triggers the trigram fallback.
+FUZZY_FALLBACK_MIN_RESULTS = 3
+# Fuzzy hits are ranked after every full-text hit; their similarity is scaled by this and
+# by the lowest full-text score on the page, so ``score`` stays descending across the merge.
+TRIGRAM_SCORE_WEIGHT = 0.5
+
+
+def search_docs_page(
+    session: Session,
+    query: str | None,
+    filters: SearchFilters | None = None,
+    limit: int = 20,
+    after: SearchPosition | None = None,
+) -> tuple[list[SearchHit], SearchPosition | None]:
+    """One page of ``search_docs`` plus the position to resume from, if there is more.
+
+    The fuzzy fallback only tops up a first page that full-text search could not fill,
+    so a page that has a successor is always purely full-text ranked.
+    """
+    hits = full_text_search(session, query, filters, limit + 1, after)
+    if len(hits) > limit:
+        return hits[:limit], position_of(hits[limit - 1])
+    if (
+        after is not None
+        or not query
+        or not query.strip()
+        or len(hits) >= min(limit, FUZZY_FALLBACK_MIN_RESULTS)
+        or not trigram_search_available(session)
+    ):
+        return hits, None
+
+    fuzzy_hits = trigram_search(
+        session,
+        query.strip(),
+        filters,
+        limit=limit - len(hits),
+        exclude_ids={hit.id for hit in hits},
+    )
+    # A body-only lexical match normalizes to ~0.05 while a fuzzy hit needs a similarity
+    # of 0.6 to match at all, so raw scores cannot be compared: lexical hits always win.
+    ceiling = min((hit.score or 0.0 for hit in hits), default=1.0)
+    fuzzy_hits = [
+        replace(hit, score=(hit.score or 0.0) * TRIGRAM_SCORE_WEIGHT * ceiling)
+        for hit in fuzzy_hits
+    ]
+    return hits + fuzzy_hits, None
+
+
+def search_docs(
+    session: Session,
+    query: str | None,
+    filters: SearchFilters | None = None,
+    limit: int = 20,
+) -> list[SearchHit]:
+    """Full-text search, topped up with typo-tolerant title/heading matches when sparse.
+
+    Fuzzy matches follow the full-text ones under one descending ``score``, so the caller
+    gets a single ranked list instead of having to retry with a corrected query.
+    """
+    hits, _ = search_docs_page(session, query, filters, limit)
+    return hits
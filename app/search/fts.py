@@ -0,0 +1,177 @@
+"""Postgres full-text search over the generated ``docs.search_vector`` column."""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Float,
+    Row,
+    and_,
+    bindparam,
+    cast,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import REAL, REGCONFIG, UUID
+from sqlalchemy.orm import Session
+
+from app.db.models import Doc
+
+SEARCH_CONFIG = "english"
+# ts_rank_cd normalization 32 maps the rank into [0, 1) as rank / (rank + 1).
+RANK_NORMALIZATION = 32
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    source: str | None = None
+    doc_type: str | None = None
+    after: date | None = None
+    before: date | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    id: uuid.UUID
+    url: str
+    title: str
+    source: str
+    doc_type: str
+    published_at: datetime | None
+    short_description: str | None
+    score: float | None
+    tags: tuple[str, ...] = ()
+    # Filled in for the final page only, by ``app.search.results``.
+    themes: tuple[str, ...] = ()
+    snippet: str | None = None
+
+
+@dataclass(frozen=True)
+class SearchPosition:
+    """Sort key of the last hit of a page; the next page starts strictly after it."""
+
+    score: float | None
+    published_at: datetime | None
+    id: uuid.UUID
+
+
+def position_of(hit: SearchHit) -> SearchPosition:
+    return SearchPosition(score=hit.score, published_at=hit.published_at, id=hit.id)
+
+
+# Matches the idx_docs_published_keyset expression, so listings page by index range scan.
+_NO_DATE = literal_column("'-infinity'::timestamptz")
+PUBLISHED_SORT_KEY = func.coalesce(Doc.published_at, _NO_DATE)
+
+
+def _published_after(position: SearchPosition) -> ColumnElement:
+    published_at = bindparam("after_published_at", position.published_at, DateTime(True))
+    return func.coalesce(published_at, _NO_DATE)
+
+
+def _id_after(position: SearchPosition) -> ColumnElement:
+    return bindparam("after_id", position.id, UUID(as_uuid=True))
+
+
+def _start_of_day(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def search_filter_clause(filters: SearchFilters) -> ColumnElement[bool]:
+    """Filters as one predicate, so they run in the same indexed query as the match."""
+    clauses: list[ColumnElement[bool]] = []
+    if filters.source is not None:
+        clauses.append(Doc.source == filters.source)
+    if filters.doc_type is not None:
+        clauses.append(Doc.type == filters.doc_type)
+    if filters.after is not None:
+        clauses.append(Doc.published_at >= _start_of_day(filters.after))
+    if filters.before is not None:
+        clauses.append(Doc.published_at < _start_of_day(filters.before))
+    return and_(true(), *clauses)
+
+
+def to_tsquery(query: str) -> ColumnElement:
+    return func.websearch_to_tsquery(cast(literal(SEARCH_CONFIG), REGCONFIG), query)
+
+
+# Explicit projection: ranking queries never read ``content_text`` or ``search_vector``.
+HIT_COLUMNS = (
+    Doc.id,
+    Doc.url,
+    Doc.title,
+    Doc.source,
+    Doc.type,
+    Doc.published_at,
+    Doc.short_description,
+    Doc.tags,
+)
+
+
+def hit_from_row(row: Row) -> SearchHit:
+    return SearchHit(
+        id=row.id,
+        url=row.url,
+        title=row.title,
+        source=row.source,
+        doc_type=row.type,
+        published_at=row.published_at,
+        short_description=row.short_description,
+        score=row.score,
+        tags=tuple(row.tags),
+    )
+
+
+def full_text_search(
+    session: Session,
+    query: str | None,
+    filters: SearchFilters | None = None,
+    limit: int = 20,
+    after: SearchPosition | None = None,
+) -> list[SearchHit]:
+    """Rank docs matching ``query`` with ``ts_rank_cd`` over the weighted search vector.
+
+    A blank query lists the newest docs matching the filters instead, with no score.
+    Every column of the sort key is descending, so ``after`` (the position of the
+    previous page's last hit) becomes a single row comparison.
+    """
+    filter_clause = search_filter_clause(filters or SearchFilters())
+    if query and query.strip():
+        ts_query = to_tsquery(query.strip())
+        score = func.ts_rank_cd(Doc.search_vector, ts_query, RANK_NORMALIZATION)
+        stmt = (
+            select(*HIT_COLUMNS, score.label("score"))
+            .where(Doc.search_vector.op("@@")(ts_query), filter_clause)
+            .order_by(score.desc(), PUBLISHED_SORT_KEY.desc(), Doc.id.desc())
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(score, PUBLISHED_SORT_KEY, Doc.id)
+                < tuple_(
+                    # ts_rank_cd is float4: compare in float4 so the boundary hit is excluded.
+                    cast(bindparam("after_score", after.score, Float()), REAL),
+                    _published_after(after),
+                    _id_after(after),
+                )
+            )
+    else:
+        stmt = (
+            select(*HIT_COLUMNS, literal(None).label("score"))
+            .where(filter_clause)
+            .order_by(PUBLISHED_SORT_KEY.desc(), Doc.id.desc())
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(PUBLISHED_SORT_KEY, Doc.id)
+                < tuple_(_published_after(after), _id_after(after))
+            )
+    return [hit_from_row(row) for row in session.execute(stmt.limit(limit))]
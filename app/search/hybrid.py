@@ -0,0 +1,58 @@
+"""Hybrid retrieval: lexical and embedding rankings fused by reciprocal rank fusion."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import replace
+
+from sqlalchemy.orm import Session
+
+from app.search.embeddings import Embedder
+from app.search.engine import search_docs
+from app.search.fts import SearchFilters, SearchHit
+from app.search.vector import vector_search, vector_search_available
+
+RRF_K = 60
+HYBRID_CANDIDATES = 50
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[SearchHit]],
+    k: int = RRF_K,
+) -> list[SearchHit]:
+    """Fuse ranked lists by ``sum(1 / (k + rank))``; the fused value becomes ``score``."""
+    scores: dict[uuid.UUID, float] = {}
+    hits: dict[uuid.UUID, SearchHit] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            scores[hit.id] = scores.get(hit.id, 0.0) + 1.0 / (k + rank)
+            hits.setdefault(hit.id, hit)
+    ordered = sorted(scores, key=lambda doc_id: scores[doc_id], reverse=True)
+    return [replace(hits[doc_id], score=scores[doc_id]) for doc_id in ordered]
+
+
+def hybrid_search(
+    session: Session,
+    query: str | None,
+    embedder: Embedder | None,
+    filters: SearchFilters | None = None,
+    limit: int = 20,
+    *,
+    query_embedding: Sequence[float] | None = None,
+) -> list[SearchHit]:
+    """Lexical search plus ANN over chunk embeddings, fused with RRF.
+
+    Falls back to lexical results alone for blank queries, without an ``embedder``, or
+    when the database has no ``doc_chunks`` table. Async callers pass ``query_embedding``,
+    computed off the event loop, since this runs inside ``AsyncSession.run_sync``.
+    """
+    if not query or not query.strip() or embedder is None or not vector_search_available(session):
+        return search_docs(session, query, filters, limit)
+
+    candidates = max(limit, HYBRID_CANDIDATES)
+    lexical = search_docs(session, query, filters, candidates)
+    if query_embedding is None:
+        (query_embedding,) = embedder.embed([query.strip()])
+    semantic = vector_search(session, query_embedding, embedder.name, filters, candidates)
+    return reciprocal_rank_fusion([lexical, semantic])[:limit]
@@ -0,0 +1,41 @@
+"""Chunk and embed docs into ``doc_chunks`` for the hybrid search mode."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.db.repository import replace_doc_chunks
+from app.search.chunking import chunk_document
+from app.search.embeddings import DEFAULT_EMBEDDING_BATCH_SIZE, Embedder, iter_embedding_batches
+
+
+@dataclass(frozen=True)
+class IndexableDoc:
+    id: uuid.UUID
+    title: str
+    content_text: str | None
+    headings: Sequence[str]
+
+
+def index_doc_chunks(
+    session: Session,
+    docs: Iterable[IndexableDoc],
+    embedder: Embedder,
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+) -> int:
+    """Replace the chunks of ``docs``, embedding every chunk of the set in shared batches.
+
+    Batching across docs keeps the embedder's batches full even when each page is short.
+    """
+    chunked = [(doc, chunk_document(doc.content_text, doc.headings)) for doc in docs]
+    texts = [chunk.embedding_input(doc.title) for doc, chunks in chunked for chunk in chunks]
+    vectors = iter_embedding_batches(embedder, texts, batch_size)
+    written = 0
+    for doc, chunks in chunked:
+        embeddings = [next(vectors) for _ in chunks]
+        written += replace_doc_chunks(session, doc.id, chunks, embeddings, embedder.name)
+    return written
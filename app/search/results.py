@@ -0,0 +1,71 @@
+"""Per-hit enrichment applied to the final ranked page only.
+
+Themes and ``ts_headline`` snippets are loaded with one query each for the ids that
+are actually returned, never for the wider candidate sets used while ranking.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import replace
+
+from sqlalchemy import cast, func, literal, select
+from sqlalchemy.dialects.postgresql import REGCONFIG, aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.db.models import Doc, DocTheme
+from app.search.fts import SEARCH_CONFIG, SearchHit, to_tsquery
+
+MAX_SNIPPET_FRAGMENTS = 3
+SNIPPET_MAX_WORDS = 30
+SNIPPET_MIN_WORDS = 10
+# ts_headline re-parses its input, so very long pages are only scanned up to here.
+SNIPPET_MAX_INPUT_CHARS = 20_000
+
+
+def with_themes(session: Session, hits: Sequence[SearchHit]) -> list[SearchHit]:
+    if not hits:
+        return []
+    rows = session.execute(
+        select(DocTheme.doc_id, func.array_agg(aggregate_order_by(DocTheme.theme, DocTheme.theme)))
+        .where(DocTheme.doc_id.in_([hit.id for hit in hits]))
+        .group_by(DocTheme.doc_id)
+    )
+    themes: dict[uuid.UUID, list[str]] = {doc_id: doc_themes for doc_id, doc_themes in rows}
+    return [replace(hit, themes=tuple(themes.get(hit.id, ()))) for hit in hits]
+
+
+def snippet_options(fragments: int) -> str:
+    return (
+        f"MaxFragments={fragments}, MaxWords={SNIPPET_MAX_WORDS}, "
+        f"MinWords={SNIPPET_MIN_WORDS}, StartSel=**, StopSel=**, "
+        'FragmentDelimiter=" ... "'
+    )
+
+
+def with_snippets(
+    session: Session,
+    hits: Sequence[SearchHit],
+    query: str | None,
+    fragments: int,
+) -> list[SearchHit]:
+    """Highlighted ``content_text`` fragments around the query terms for each hit.
+
+    Hits are returned unchanged for a blank query or ``fragments == 0``.
+    """
+    if not hits or not query or not query.strip() or fragments <= 0:
+        return list(hits)
+    if fragments > MAX_SNIPPET_FRAGMENTS:
+        raise ValueError(f"fragments must be <= {MAX_SNIPPET_FRAGMENTS}.")
+    headline = func.ts_headline(
+        cast(literal(SEARCH_CONFIG), REGCONFIG),
+        func.left(func.coalesce(Doc.content_text, ""), SNIPPET_MAX_INPUT_CHARS),
+        to_tsquery(query.strip()),
+        snippet_options(fragments),
+    )
+    rows = session.execute(
+        select(Doc.id, headline.label("snippet")).where(Doc.id.in_([hit.id for hit in hits]))
+    )
+    snippets = {doc_id: snippet or None for doc_id, snippet in rows}
+    return [replace(hit, snippet=snippets.get(hit.id)) for hit in hits]
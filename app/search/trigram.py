@@ -0,0 +1,60 @@
+"""Typo-tolerant ``pg_trgm`` matching (``%>`` word similarity) on doc titles and headings."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Collection
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.db.models import Doc
+from app.search.fts import HIT_COLUMNS, SearchFilters, SearchHit, hit_from_row, search_filter_clause
+
+_trigram_available: dict[str, bool] = {}
+
+
+def trigram_search_available(session: Session) -> bool:
+    """Whether ``pg_trgm`` is installed; checked once per database URL."""
+    key = str(session.get_bind().engine.url)
+    if key not in _trigram_available:
+        _trigram_available[key] = bool(
+            session.scalar(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            )
+        )
+    return _trigram_available[key]
+
+
+def trigram_search(
+    session: Session,
+    query: str,
+    filters: SearchFilters | None = None,
+    limit: int = 20,
+    exclude_ids: Collection[uuid.UUID] = (),
+) -> list[SearchHit]:
+    """Docs whose title or headings contain a word sequence similar to ``query``.
+
+    Uses ``field %> query`` (``word_similarity(query, field)`` at or above
+    ``pg_trgm.word_similarity_threshold``) so a short, misspelled query still matches
+    inside a longer title; ``score`` is the best ``word_similarity`` of the two fields.
+    """
+    headings = func.docs_headings_text(Doc.headings)
+    score = func.greatest(
+        func.word_similarity(query, Doc.title), func.word_similarity(query, headings)
+    )
+    stmt = (
+        select(*HIT_COLUMNS, score.label("score"))
+        .where(
+            or_(
+                Doc.title.bool_op("%>")(query),
+                headings.bool_op("%>")(query),
+            ),
+            search_filter_clause(filters or SearchFilters()),
+        )
+        .order_by(score.desc(), Doc.published_at.desc().nulls_last(), Doc.id)
+        .limit(limit)
+    )
+    if exclude_ids:
+        stmt = stmt.where(Doc.id.not_in(list(exclude_ids)))
+    return [hit_from_row(row) for row in session.execute(stmt)]
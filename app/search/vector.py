@@ -0,0 +1,62 @@
+"""Approximate nearest-neighbour search over ``doc_chunks`` embeddings (pgvector HNSW)."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import Float, cast, func, literal, select, text
+from sqlalchemy.orm import Session
+
+from app.db.models import EMBEDDING_DIMENSIONS, Doc, DocChunk
+from app.db.types import Vector, vector_literal
+from app.search.fts import HIT_COLUMNS, SearchFilters, SearchHit, hit_from_row, search_filter_clause
+
+# Chunks fetched from the HNSW index per requested doc, since one doc has many chunks.
+CHUNKS_PER_DOC = 4
+
+_vector_available: dict[str, bool] = {}
+
+
+def vector_search_available(session: Session) -> bool:
+    """Whether the ``doc_chunks`` table exists; checked once per database URL."""
+    key = str(session.get_bind().engine.url)
+    if key not in _vector_available:
+        _vector_available[key] = bool(
+            session.scalar(text("SELECT to_regclass('doc_chunks') IS NOT NULL"))
+        )
+    return _vector_available[key]
+
+
+def vector_search(
+    session: Session,
+    embedding: Sequence[float],
+    embedding_model: str,
+    filters: SearchFilters | None = None,
+    limit: int = 20,
+) -> list[SearchHit]:
+    """Docs whose closest chunk is nearest to ``embedding`` by cosine distance.
+
+    ``score`` is the cosine similarity of the best chunk.
+    """
+    query_vector = cast(literal(vector_literal(embedding)), Vector(EMBEDDING_DIMENSIONS))
+    distance = DocChunk.embedding.op("<=>", return_type=Float)(query_vector)
+    nearest = (
+        select(DocChunk.doc_id, distance.label("distance"))
+        .join(Doc, Doc.id == DocChunk.doc_id)
+        .where(
+            DocChunk.embedding_model == embedding_model,
+            search_filter_clause(filters or SearchFilters()),
+        )
+        .order_by(distance)
+        .limit(limit * CHUNKS_PER_DOC)
+        .subquery()
+    )
+    best_distance = func.min(nearest.c.distance)
+    stmt = (
+        select(*HIT_COLUMNS, (1 - best_distance).label("score"))
+        .join(nearest, nearest.c.doc_id == Doc.id)
+        .group_by(Doc.id)
+        .order_by(best_distance, Doc.id)
+        .limit(limit)
+    )
+    return [hit_from_row(row) for row in session.execute(stmt)]
@@ -0,0 +1,27 @@
+"""Theme extraction, listings and v1 gap detection over ``themes``/``doc_themes``/``docs``."""
+
+from .extract import THEME_EXTRACTOR_VERSION, extract_themes, normalize_theme
+from .queries import (
+    GAP_TYPES,
+    ThemeFilters,
+    ThemeGap,
+    ThemeGapPosition,
+    ThemeListPosition,
+    ThemeSummary,
+    find_theme_gaps,
+    list_themes,
+)
+
+__all__ = [
+    "GAP_TYPES",
+    "THEME_EXTRACTOR_VERSION",
+    "ThemeFilters",
+    "ThemeGap",
+    "ThemeGapPosition",
+    "ThemeListPosition",
+    "ThemeSummary",
+    "extract_themes",
+    "find_theme_gaps",
+    "list_themes",
+    "normalize_theme",
+]
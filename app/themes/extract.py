@@ -0,0 +1,139 @@
+"""v1 theme detection: normalized tags/categories plus keyword themes (Issue 5).
+
+Candidate themes come from the page's tags and categories, then from known keyphrases
+in the title, headings and lead of the body. Every label goes through one synonym map,
+so ``"File Upload"`` and ``"media uploads"`` both become ``uploads``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Sequence
+
+# Bump when the rules below change so the pipeline re-themes every doc.
+THEME_EXTRACTOR_VERSION = 1
+MAX_THEMES_PER_DOC = 5
+# Only the opening of the body is scanned for keyphrases; the title and headings say
+# what a page is about, a passing mention deep in the text does not.
+THEME_LEAD_CHARS = 1500
+MIN_THEME_CHARS = 2
+MAX_THEME_CHARS = 40
+
+TITLE_WEIGHT = 3
+HEADING_WEIGHT = 2
+LEAD_WEIGHT = 1
+
+# Canonical theme -> phrases that mean it. Each canonical name also matches itself.
+THEME_SYNONYMS: dict[str, tuple[str, ...]] = {
+    "calculations": ("calculated field", "calculator", "calculation", "formula"),
+    "captcha": ("recaptcha", "hcaptcha", "turnstile", "spam protection", "antispam"),
+    "conditional logic": ("conditional block", "conditional field", "conditional visibility"),
+    "email notifications": ("email notification", "send email", "email action"),
+    "integrations": ("mailchimp", "getresponse", "activecampaign", "zapier", "integration"),
+    "multi step forms": ("multi step form", "multistep form", "form break", "form pages"),
+    "payments": ("payment", "paypal", "stripe", "payment gateway", "gateways"),
+    "pdf": ("pdf generation", "pdf attachment", "pdf file"),
+    "post submit": (
+        "frontend submission",
+        "front end submission",
+        "front end post submission",
+        "post submission",
+        "insert post",
+        "update post",
+    ),
+    "redirects": ("redirect to page", "redirect"),
+    "repeater": ("repeater field", "repeater fields"),
+    "styling": ("style", "styles", "design", "css"),
+    "uploads": ("file upload", "file uploads", "media upload", "media uploads", "upload"),
+    "user registration": ("register user", "registration form", "user registration form"),
+    "user profile": ("update user", "user meta", "profile form"),
+    "validation": ("advanced validation", "field validation", "form validation"),
+    "webhooks": ("webhook", "rest api call", "call webhook"),
+    "woocommerce": ("woo commerce", "woocommerce checkout"),
+}
+
+# Site, product and taxonomy labels that say nothing about a page's topic.
+IGNORED_LABELS = frozenset(
+    {
+        "blog",
+        "crocoblock",
+        "docs",
+        "documentation",
+        "general",
+        "jetformbuilder",
+        "jet form builder",
+        "kb",
+        "knowledge base",
+        "news",
+        "plugin",
+        "plugins",
+        "tutorial",
+        "tutorials",
+        "uncategorized",
+        "wordpress",
+    }
+)
+
+_SEPARATORS = re.compile(r"[-_/]+")
+_NON_WORD = re.compile(r"[^a-z0-9&+ ]+")
+_WHITESPACE = re.compile(r"\s+")
+
+_CANONICAL = {
+    phrase: theme for theme, phrases in THEME_SYNONYMS.items() for phrase in (theme, *phrases)
+}
+# Longest phrases first so "file upload" wins over "upload" at the same position.
+_KEYPHRASE = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(phrase) for phrase in sorted(_CANONICAL, key=len, reverse=True))
+    + r")\b"
+)
+
+
+def _fold(text: str) -> str:
+    text = _NON_WORD.sub(" ", _SEPARATORS.sub(" ", text.lower()))
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def normalize_theme(label: str) -> str | None:
+    """Canonical theme name for a tag, category or keyphrase; ``None`` if it is noise."""
+    folded = _fold(label)
+    if folded in _CANONICAL:
+        return _CANONICAL[folded]
+    if (
+        folded in IGNORED_LABELS
+        or folded.isdigit()
+        or not MIN_THEME_CHARS <= len(folded) <= MAX_THEME_CHARS
+    ):
+        return None
+    return folded
+
+
+def _keyword_themes(title: str, headings: Sequence[str], lead: str) -> list[str]:
+    weights: Counter[str] = Counter()
+    sources = [(title, TITLE_WEIGHT), (lead, LEAD_WEIGHT)]
+    sources.extend((heading, HEADING_WEIGHT) for heading in headings)
+    for text, weight in sources:
+        for match in _KEYPHRASE.finditer(_fold(text)):
+            weights[_CANONICAL[match.group(0)]] += weight
+    return sorted(weights, key=lambda theme: (-weights[theme], theme))
+
+
+def extract_themes(
+    *,
+    title: str,
+    tags: Sequence[str] = (),
+    categories: Sequence[str] = (),
+    headings: Sequence[str] = (),
+    content_text: str | None = None,
+) -> tuple[str, ...]:
+    """Up to ``MAX_THEMES_PER_DOC`` themes: tag/category themes first, then keywords."""
+    lead = (content_text or "")[:THEME_LEAD_CHARS]
+    themes: dict[str, None] = {}
+    for label in (*tags, *categories):
+        theme = normalize_theme(label)
+        if theme is not None:
+            themes.setdefault(theme)
+    for theme in _keyword_themes(title, headings, lead):
+        themes.setdefault(theme)
+    return tuple(themes)[:MAX_THEMES_PER_DOC]
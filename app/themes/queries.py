@@ -0,0 +1,278 @@
+"""Theme counts and v1 gap rules, paged with keyset positions.
+
+Counts only include docs whose ``published_at`` falls inside the ``after``/``before``
+window (same semantics as search: ``after`` inclusive, ``before`` exclusive). They are
+summed from the pre-aggregated ``theme_stats`` day buckets, so a window is answered
+exactly without touching ``docs``; only evidence URLs for the returned page are read
+from ``docs`` itself.
+
+Positions keep pages stable without OFFSET, but they do not make a page cheaper than
+the window's aggregate in general: the list is ordered by a summed count, so every page
+sums the window for every theme. That is bounded by the theme vocabulary (tags plus the
+synonym map, hundreds of names), not by the corpus. Gaps are ordered by theme, so a
+position there also skips the buckets of every theme before it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import (
+    ColumnElement,
+    Text,
+    and_,
+    func,
+    literal,
+    select,
+    true,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from app.db.models import UNDATED_THEME_BUCKET, Doc, DocTheme, ThemeStat
+from app.search.fts import SearchFilters, search_filter_clause
+
+GAP_TYPES = (
+    "blog_theme_missing_tutorial",
+    "new_feature_low_coverage",
+    "tutorial_theme_missing_reference_article",
+)
+# v1 thresholds from the spec; "high" recent activity and "low" coverage made concrete.
+GAP_MIN_BLOG_COUNT = 3
+GAP_MAX_TUTORIAL_COUNT = 1
+GAP_MIN_RECENT_COUNT = 3
+GAP_MIN_REFERENCE_TUTORIAL_COUNT = 3
+# recent_count_90d counts whole UTC days from (now - 90 days).date(), matching the buckets.
+RECENT_WINDOW = timedelta(days=90)
+EVIDENCE_URLS_PER_GAP = 3
+# Doc type whose newest members are cited as evidence; None cites the newest of any type.
+EVIDENCE_DOC_TYPE: dict[str, str | None] = {
+    "blog_theme_missing_tutorial": "blog",
+    "new_feature_low_coverage": None,
+    "tutorial_theme_missing_reference_article": "tutorial",
+}
+
+
+@dataclass(frozen=True)
+class ThemeFilters:
+    after: date | None = None
+    before: date | None = None
+
+
+@dataclass(frozen=True)
+class ThemeSummary:
+    theme: str
+    doc_count: int
+    last_seen: datetime | None
+
+
+@dataclass(frozen=True)
+class ThemeListPosition:
+    doc_count: int
+    theme: str
+
+
+@dataclass(frozen=True)
+class ThemeGap:
+    theme: str
+    gap_type: str
+    reason: str
+    tutorial_count: int
+    blog_count: int
+    recent_count_90d: int
+    last_seen: datetime | None
+    evidence_urls: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ThemeGapPosition:
+    theme: str
+    gap_type: str
+
+
+def _window_clause(filters: ThemeFilters) -> ColumnElement[bool]:
+    return search_filter_clause(SearchFilters(after=filters.after, before=filters.before))
+
+
+def _bucket_window_clause(filters: ThemeFilters) -> ColumnElement[bool]:
+    # Buckets are UTC days, and after/before are UTC day boundaries: no partial buckets.
+    # Undated docs never match a window, as in search.
+    clauses: list[ColumnElement[bool]] = []
+    if filters.after is not None or filters.before is not None:
+        clauses.append(ThemeStat.bucket > UNDATED_THEME_BUCKET)
+    if filters.after is not None:
+        clauses.append(ThemeStat.bucket >= filters.after)
+    if filters.before is not None:
+        clauses.append(ThemeStat.bucket < filters.before)
+    return and_(true(), *clauses)
+
+
+def _summed(column: ColumnElement, *conditions: ColumnElement[bool]) -> ColumnElement[int]:
+    total = func.sum(column)
+    if conditions:
+        total = total.filter(*conditions)
+    return func.coalesce(total, 0)
+
+
+def list_themes(
+    session: Session,
+    filters: ThemeFilters | None = None,
+    min_docs: int = 1,
+    limit: int = 50,
+    after: ThemeListPosition | None = None,
+) -> tuple[list[ThemeSummary], ThemeListPosition | None]:
+    """Themes by doc count (desc) then name, and the position to resume from, if any.
+
+    The count is only known after aggregation, so ``after`` is applied in HAVING: each
+    page sums the window's buckets for every theme, then skips to the position.
+    """
+    filters = filters or ThemeFilters()
+    doc_count = _summed(ThemeStat.doc_count)
+    stmt = (
+        select(ThemeStat.theme, doc_count.label("doc_count"), func.max(ThemeStat.last_seen))
+        .where(_bucket_window_clause(filters))
+        .group_by(ThemeStat.theme)
+        .having(doc_count >= min_docs)
+        # Negated count keeps both sort columns ascending, so the keyset is one comparison.
+        .order_by(-doc_count, ThemeStat.theme)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.having(
+            tuple_(-doc_count, ThemeStat.theme) > tuple_(-after.doc_count, after.theme)
+        )
+    rows = [ThemeSummary(*row) for row in session.execute(stmt)]
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return rows[:limit], ThemeListPosition(doc_count=last.doc_count, theme=last.theme)
+    return rows, None
+
+
+def _gap_reason(gap_type: str, tutorials: int, blogs: int, recent: int) -> str:
+    if gap_type == "blog_theme_missing_tutorial":
+        return f"{blogs} blog posts but only {tutorials} tutorial(s)."
+    if gap_type == "new_feature_low_coverage":
+        return f"{recent} docs in the last 90 days but only {tutorials} tutorial(s)."
+    return f"{tutorials} tutorials but no blog post."
+
+
+def _evidence_urls(
+    session: Session,
+    themes: Sequence[str],
+    filters: ThemeFilters,
+) -> dict[tuple[str, str | None], list[str]]:
+    """Newest doc URLs per (theme, type) and per (theme, None), for the given themes."""
+    newest = (Doc.published_at.desc().nulls_last(), Doc.id)
+    ranked = (
+        select(
+            DocTheme.theme,
+            Doc.type,
+            Doc.url,
+            func.row_number()
+            .over(partition_by=(DocTheme.theme, Doc.type), order_by=newest)
+            .label("type_rank"),
+            func.row_number().over(partition_by=DocTheme.theme, order_by=newest).label("rank"),
+        )
+        .join(Doc, Doc.id == DocTheme.doc_id)
+        .where(DocTheme.theme.in_(list(themes)), _window_clause(filters))
+        .subquery()
+    )
+    stmt = (
+        select(ranked.c.theme, ranked.c.type, ranked.c.url, ranked.c.type_rank, ranked.c.rank)
+        .where(
+            (ranked.c.type_rank <= EVIDENCE_URLS_PER_GAP) | (ranked.c.rank <= EVIDENCE_URLS_PER_GAP)
+        )
+        .order_by(ranked.c.theme, ranked.c.rank)
+    )
+    evidence: dict[tuple[str, str | None], list[str]] = {}
+    for theme, doc_type, url, type_rank, rank in session.execute(stmt):
+        if type_rank <= EVIDENCE_URLS_PER_GAP:
+            evidence.setdefault((theme, doc_type), []).append(url)
+        if rank <= EVIDENCE_URLS_PER_GAP:
+            evidence.setdefault((theme, None), []).append(url)
+    return evidence
+
+
+def find_theme_gaps(
+    session: Session,
+    filters: ThemeFilters | None = None,
+    gap_types: Sequence[str] = GAP_TYPES,
+    limit: int = 20,
+    after: ThemeGapPosition | None = None,
+    now: datetime | None = None,
+) -> tuple[list[ThemeGap], ThemeGapPosition | None]:
+    """Themes matching the v1 gap rules, ordered by theme then gap type, with evidence."""
+    filters = filters or ThemeFilters()
+    recent_since = ((now or datetime.now(timezone.utc)) - RECENT_WINDOW).date()
+    window = _bucket_window_clause(filters)
+    if after is not None:
+        # The theme leads pk_theme_stats, so earlier themes are skipped before aggregation;
+        # the position's own theme stays in, for the gap types after ``after.gap_type``.
+        window = and_(window, ThemeStat.theme >= after.theme)
+    stats = (
+        select(
+            ThemeStat.theme,
+            _summed(ThemeStat.doc_count, ThemeStat.doc_type == "tutorial").label("tutorial_count"),
+            _summed(ThemeStat.doc_count, ThemeStat.doc_type == "blog").label("blog_count"),
+            _summed(ThemeStat.doc_count, ThemeStat.bucket >= recent_since).label(
+                "recent_count_90d"
+            ),
+            func.max(ThemeStat.last_seen).label("last_seen"),
+        )
+        .where(window)
+        .group_by(ThemeStat.theme)
+        .cte("theme_stats_window")
+    )
+    rules = {
+        "blog_theme_missing_tutorial": and_(
+            stats.c.blog_count >= GAP_MIN_BLOG_COUNT,
+            stats.c.tutorial_count <= GAP_MAX_TUTORIAL_COUNT,
+        ),
+        "new_feature_low_coverage": and_(
+            stats.c.recent_count_90d >= GAP_MIN_RECENT_COUNT,
+            stats.c.tutorial_count <= GAP_MAX_TUTORIAL_COUNT,
+        ),
+        "tutorial_theme_missing_reference_article": and_(
+            stats.c.tutorial_count >= GAP_MIN_REFERENCE_TUTORIAL_COUNT,
+            stats.c.blog_count == 0,
+        ),
+    }
+    if not gap_types:
+        return [], None
+    gaps = union_all(
+        *(
+            select(stats, literal(gap_type, Text).label("gap_type")).where(rules[gap_type])
+            for gap_type in gap_types
+        )
+    ).subquery()
+    stmt = select(gaps).order_by(gaps.c.theme, gaps.c.gap_type).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(gaps.c.theme, gaps.c.gap_type) > tuple_(after.theme, after.gap_type)
+        )
+    rows = session.execute(stmt).all()
+    next_position = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_position = ThemeGapPosition(theme=rows[-1].theme, gap_type=rows[-1].gap_type)
+
+    evidence = _evidence_urls(session, sorted({row.theme for row in rows}), filters) if rows else {}
+    results = [
+        ThemeGap(
+            theme=row.theme,
+            gap_type=row.gap_type,
+            reason=_gap_reason(
+                row.gap_type, row.tutorial_count, row.blog_count, row.recent_count_90d
+            ),
+            tutorial_count=row.tutorial_count,
+            blog_count=row.blog_count,
+            recent_count_90d=row.recent_count_90d,
+            last_seen=row.last_seen,
+            evidence_urls=tuple(evidence.get((row.theme, EVIDENCE_DOC_TYPE[row.gap_type]), [])),
+        )
+        for row in rows
+    ]
+    return results, next_position
@@ -0,0 +1,105 @@
+"""Re-theme docs whose content changed since their last theme run."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from collections import Counter
+
+from sqlalchemy.orm import Session
+
+from app.db.repository import (
+    bump_corpus_version,
+    claim_docs_needing_themes,
+    mark_docs_themed,
+    refresh_theme_stats,
+    sync_doc_themes,
+)
+from app.db.session import get_session
+from app.themes.extract import THEME_EXTRACTOR_VERSION, THEME_LEAD_CHARS, extract_themes
+
+THEMES_HASH_PREFIX = f"v{THEME_EXTRACTOR_VERSION}:"
+
+
+def theme_changed_docs(session: Session, batch_size: int) -> Counter[str]:
+    """Extract themes for one batch of docs whose ``content_hash`` moved.
+
+    Only membership diffs are written. Themes whose membership changed get their
+    ``theme_stats`` rebuilt and bump the corpus version, in the caller's transaction.
+    """
+    counts: Counter[str] = Counter()
+    docs = claim_docs_needing_themes(
+        session,
+        THEMES_HASH_PREFIX,
+        batch_size,
+        lead_chars=THEME_LEAD_CHARS,
+    )
+    if not docs:
+        return counts
+    changed_themes = sync_doc_themes(
+        session,
+        {
+            doc.id: extract_themes(
+                title=doc.title,
+                tags=doc.tags,
+                categories=doc.categories,
+                headings=doc.headings,
+                content_text=doc.lead_text,
+            )
+            for doc in docs
+        },
+    )
+    mark_docs_themed(session, {doc.id: doc.themes_hash for doc in docs})
+    if changed_themes:
+        refresh_theme_stats(session, changed_themes)
+        bump_corpus_version(session)
+    counts["themed"] += len(docs)
+    counts["changed_themes"] += len(changed_themes)
+    return counts
+
+
+def main() -> int:
+    try:
+        batch_size = int(os.getenv("THEME_BATCH_SIZE", "200"))
+        totals: Counter[str] = Counter()
+        batch_count = 0
+        while True:
+            with get_session() as session:
+                counts = theme_changed_docs(session, batch_size)
+                session.commit()
+            if not counts["themed"]:
+                break
+            totals += counts
+            batch_count += 1
+
+        print(
+            json.dumps(
+                {
+                    "event": "theme_summary",
+                    "batch_count": batch_count,
+                    "changed_theme_count": totals["changed_themes"],
+                    "extractor_version": THEME_EXTRACTOR_VERSION,
+                    "themed_doc_count": totals["themed"],
+                },
+                sort_keys=True,
+            )
+        )
+        return 0
+    except Exception as exc:
+        print(
+            json.dumps(
+                {
+                    "event": "theme_failed",
+                    "error_type": type(exc).__name__,
+                    "error": str(exc),
+                },
+                sort_keys=True,
+            ),
+            file=sys.stderr,
+        )
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
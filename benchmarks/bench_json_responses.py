@@ -0,0 +1,257 @@
+"""Micro-benchmark: per-response cost of turning docs payloads into JSON bytes.
+
+Runs the ``/v1/docs`` response shapes (a 100-hit search page, one long doc, a 20-doc
+batch) through each way of producing the body, starting from repository rows:
+
+- ``model/jsonable_encoder``: validated models, FastAPI's validation pass, then
+  ``jsonable_encoder`` and ``json.dumps`` (a custom ``JSONResponse`` response class);
+- ``model/dump_json``: validated models, FastAPI's validation pass, then pydantic-core's
+  ``dump_json`` (how the handlers used to work);
+- ``payload/pydantic_core``: the handlers' dict payloads, no validation, encoded the way
+  ``FastJSONResponse`` does without the ``fastjson`` extra (how they work now);
+- ``payload/orjson``: the same, encoded the way it does with the extra installed (skipped
+  when orjson is not importable).
+
+Both payload paths must produce the same bytes as ``model/dump_json``. No database needed.
+
+    make bench-json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+from app.api.docs import (
+    BatchDoc,
+    BatchGetResponse,
+    DocResponse,
+    SearchResponse,
+    SearchResult,
+    doc_payload,
+    search_result_payload,
+)
+from app.db.repository import DocDetail
+from app.search.fts import SearchHit
+
+try:
+    import orjson
+except ImportError:  # the fastjson extra is optional
+    orjson = None
+
+PUBLISHED_AT = datetime(2026, 3, 14, 9, 30, tzinfo=timezone.utc)
+PARAGRAPH = (
+    "Open the form in the block editor, add a Conditional Block around the fields that "
+    "depend on the payment method, and set the rule to show the block when the radio "
+    "field equals “Stripe”. Save the form and check the result on the front end. "
+)
+
+
+def _hits(count: int) -> list[SearchHit]:
+    return [
+        SearchHit(
+            id=uuid.uuid4(),
+            url=f"https://jetformbuilder.com/tutorials/conditional-payments-{index}/",
+            title=f"How to Show Payment Fields Conditionally, part {index}",
+            source="jetformbuilder",
+            doc_type="tutorial",
+            published_at=PUBLISHED_AT - timedelta(days=index),
+            short_description=PARAGRAPH[:160],
+            score=1.0 / (index + 1),
+            tags=("payments", "conditional logic", "stripe"),
+            themes=("conditional logic", "payments"),
+            snippet=f"…add a <b>Conditional Block</b> around the fields… ({index})",
+        )
+        for index in range(count)
+    ]
+
+
+def _details(count: int, content_chars: int) -> list[DocDetail]:
+    content = (PARAGRAPH * (content_chars // len(PARAGRAPH) + 1))[:content_chars]
+    return [
+        DocDetail(
+            id=uuid.uuid4(),
+            url=f"https://jetformbuilder.com/tutorials/long-guide-{index}/",
+            title=f"Complete Guide to Multi Step Forms, chapter {index}",
+            source="jetformbuilder",
+            doc_type="tutorial",
+            published_at=PUBLISHED_AT,
+            short_description=PARAGRAPH[:160],
+            content_text=content,
+            content_hash="0" * 64,
+            headings=tuple(f"Step {step}: configure the form break" for step in range(12)),
+            tags=("multi step forms", "form break"),
+            themes=("multi step forms", "validation"),
+        )
+        for index in range(count)
+    ]
+
+
+def _batch_doc(detail: DocDetail) -> dict[str, object]:
+    return {
+        "url": detail.url,
+        "title": detail.title,
+        "published_at": detail.published_at,
+        "content_text": detail.content_text,
+        "content_truncated": False,
+        "themes": list(detail.themes),
+    }
+
+
+def _validated_search(hits: list[SearchHit]) -> SearchResponse:
+    return SearchResponse(
+        query="conditional payments",
+        mode="lexical",
+        count=len(hits),
+        next_cursor=None,
+        results=[
+            SearchResult(
+                url=hit.url,
+                title=hit.title,
+                source=hit.source,
+                type=hit.doc_type,
+                published_at=hit.published_at,
+                short_description=hit.short_description,
+                tags=list(hit.tags),
+                themes=list(hit.themes),
+                snippet=hit.snippet,
+                score=hit.score,
+            )
+            for hit in hits
+        ],
+    )
+
+
+def _search_payload(hits: list[SearchHit]) -> dict[str, object]:
+    return {
+        "query": "conditional payments",
+        "mode": "lexical",
+        "count": len(hits),
+        "results": [search_result_payload(hit) for hit in hits],
+        "next_cursor": None,
+    }
+
+
+def _validated_doc(detail: DocDetail) -> DocResponse:
+    return DocResponse(
+        url=detail.url,
+        title=detail.title,
+        source=detail.source,
+        type=detail.doc_type,
+        published_at=detail.published_at,
+        short_description=detail.short_description,
+        content_text=detail.content_text,
+        headings=list(detail.headings),
+        tags=list(detail.tags),
+        themes=list(detail.themes),
+    )
+
+
+def _validated_batch(rows: list[dict[str, object]]) -> BatchGetResponse:
+    return BatchGetResponse(count=len(rows), results=[BatchDoc(**row) for row in rows], missing=[])
+
+
+def _batch_payload(rows: list[dict[str, object]]) -> dict[str, object]:
+    return {"count": len(rows), "results": rows, "missing": []}
+
+
+def _paths(
+    model: type[BaseModel],
+    validated: Callable[[], BaseModel],
+    payload: Callable[[], dict[str, object]],
+    exclude_unset: bool = False,
+) -> dict[str, Callable[[], bytes]]:
+    # FastAPI checks a returned model against the response_model before dumping it.
+    adapter = TypeAdapter(model)
+
+    def checked() -> BaseModel:
+        return adapter.validate_python(validated(), from_attributes=True)
+
+    paths = {
+        "model/jsonable_encoder": lambda: json.dumps(
+            jsonable_encoder(checked(), exclude_unset=exclude_unset),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8"),
+        "model/dump_json": lambda: adapter.dump_json(checked(), exclude_unset=exclude_unset),
+        "payload/pydantic_core": lambda: to_json(payload()),
+    }
+    if orjson is not None:
+        paths["payload/orjson"] = lambda: orjson.dumps(payload(), option=orjson.OPT_UTC_Z)
+    return paths
+
+
+def _per_call_us(call: Callable[[], object], iterations: int) -> float:
+    for _ in range(min(iterations, 20)):
+        call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _report(case: str, per_call_us: float, body_bytes: int, iterations: int) -> None:
+    print(
+        json.dumps(
+            {
+                "event": "benchmark",
+                "case": case,
+                "iterations": iterations,
+                "body_bytes": body_bytes,
+                "per_call_us": round(per_call_us, 2),
+                "mb_per_s": round(body_bytes / per_call_us, 1),
+            },
+            sort_keys=True,
+        )
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--content-chars", type=int, default=60_000)
+    args = parser.parse_args()
+
+    hits = _hits(100)
+    (detail,) = _details(1, args.content_chars)
+    rows = [_batch_doc(item) for item in _details(20, args.content_chars // 10)]
+    payloads = {
+        "search_100": _paths(
+            SearchResponse, lambda: _validated_search(hits), lambda: _search_payload(hits)
+        ),
+        "get_long_doc": _paths(
+            DocResponse, lambda: _validated_doc(detail), lambda: doc_payload(detail)
+        ),
+        "batch_get_20": _paths(
+            BatchGetResponse,
+            lambda: _validated_batch(rows),
+            lambda: _batch_payload(rows),
+            exclude_unset=True,
+        ),
+    }
+    for payload, paths in payloads.items():
+        bodies = {path: render() for path, render in paths.items()}
+        # Skipping validation must not change a byte of what clients receive.
+        for path, body in bodies.items():
+            if path.startswith("payload/") and body != bodies["model/dump_json"]:
+                raise SystemExit(f"{payload}: {path} body differs from model/dump_json")
+        for path, render in paths.items():
+            _report(
+                f"{payload}/{path}",
+                _per_call_us(render, args.iterations),
+                len(bodies[path]),
+                args.iterations,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+"""Micro-benchmark: per-call cost of the hot repository lookups.
+
+Compares rebuilding ``select()`` on every call (how the lookups used to work) with the
+prebuilt statements in ``app.db.repository``, first on the Python side alone
+(construction plus compiled-cache key), then as full round trips with psycopg's
+server-side prepares off and on. Needs a migrated database at ``DATABASE_URL``.
+
+    make bench-queries
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from sqlalchemy import bindparam, create_engine, func, literal_column, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.db.config import PoolConfig, get_database_url
+from app.db.models import Doc, DocTheme
+from app.db.repository import DOC_DETAIL_BY_URL, get_doc_detail
+
+URL = "https://jetformbuilder.com/benchmark-missing-doc"
+
+
+def _rebuilt_detail_stmt(url: str):
+    # The same projection as DOC_DETAIL_BY_URL, themes subquery included, built from scratch.
+    themes = (
+        select(
+            func.coalesce(
+                func.array_agg(aggregate_order_by(DocTheme.theme, DocTheme.theme)),
+                literal_column("'{}'::text[]"),
+            )
+        )
+        .where(DocTheme.doc_id == Doc.id)
+        .scalar_subquery()
+    )
+    return select(
+        Doc.id,
+        Doc.url,
+        Doc.title,
+        Doc.source,
+        Doc.type,
+        Doc.published_at,
+        Doc.short_description,
+        Doc.content_text,
+        Doc.content_hash,
+        Doc.headings,
+        Doc.tags,
+        themes.label("themes"),
+    ).where(Doc.url == bindparam("url", url))
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _per_call_us(call: Callable[[], object], iterations: int) -> float:
+    for _ in range(min(iterations, 100)):
+        call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _report(case: str, per_call_us: float, iterations: int) -> None:
+    print(
+        json.dumps(
+            {
+                "event": "benchmark",
+                "case": case,
+                "iterations": iterations,
+                "per_call_us": round(per_call_us, 2),
+            },
+            sort_keys=True,
+        )
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Only construction may differ: both sides must send the server the same SQL.
+    if _sql(_rebuilt_detail_stmt(URL)) != _sql(DOC_DETAIL_BY_URL):
+        raise SystemExit("rebuilt detail statement differs from DOC_DETAIL_BY_URL")
+    _report(
+        "python_side/rebuilt",
+        _per_call_us(lambda: _rebuilt_detail_stmt(URL)._generate_cache_key(), args.iterations),
+        args.iterations,
+    )
+    _report(
+        "python_side/prebuilt",
+        # Looked up per call, as execution does: the memoized key replaces the method.
+        _per_call_us(lambda: DOC_DETAIL_BY_URL._generate_cache_key(), args.iterations),
+        args.iterations,
+    )
+
+    for prepare_threshold in (None, 2):
+        engine = create_engine(
+            get_database_url(),
+            **PoolConfig(prepare_threshold=prepare_threshold).engine_options(),
+        )
+        prepared = "prepared" if prepare_threshold is not None else "unprepared"
+        try:
+            with Session(engine) as session:
+                _report(
+                    f"round_trip/rebuilt/{prepared}",
+                    _per_call_us(
+                        lambda: session.execute(_rebuilt_detail_stmt(URL)).one_or_none(),
+                        args.iterations,
+                    ),
+                    args.iterations,
+                )
+                _report(
+                    f"round_trip/prebuilt/{prepared}",
+                    _per_call_us(lambda: get_doc_detail(session, URL), args.iterations),
+                    args.iterations,
+                )
+        finally:
+            engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""Add sitemap_fetch_cache table for conditional sitemap fetches.
+
+Revision ID: 20261018_0003
+Revises: 20260218_0002
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0003"
+down_revision = "20260218_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sitemap_fetch_cache",
+        sa.Column("sitemap_url", sa.Text(), nullable=False, primary_key=True),
+        sa.Column("etag", sa.Text(), nullable=True),
+        sa.Column("last_modified", sa.Text(), nullable=True),
+        sa.Column("content_hash", sa.Text(), nullable=False),
+        sa.Column("kind", sa.Text(), nullable=False),
+        sa.Column(
+            "locs",
+            postgresql.ARRAY(sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::text[]"),
+        ),
+        sa.Column(
+            "fetched_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_check_constraint(
+        "ck_sitemap_fetch_cache_kind_values",
+        "sitemap_fetch_cache",
+        "kind IN ('sitemapindex', 'urlset', 'unknown')",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "ck_sitemap_fetch_cache_kind_values",
+        "sitemap_fetch_cache",
+        type_="check",
+    )
+    op.drop_table("sitemap_fetch_cache")
@@ -0,0 +1,46 @@
+"""Track sitemap lastmod on discovered URLs and cached sitemap entries.
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "discovered_urls",
+        sa.Column("lastmod", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "idx_discovered_urls_status_lastmod",
+        "discovered_urls",
+        ["status", sa.text("lastmod DESC NULLS LAST")],
+        unique=False,
+    )
+    op.add_column(
+        "sitemap_fetch_cache",
+        sa.Column(
+            "lastmods",
+            postgresql.ARRAY(sa.DateTime(timezone=True)),
+            nullable=False,
+            server_default=sa.text("'{}'::timestamptz[]"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sitemap_fetch_cache", "lastmods")
+    op.drop_index("idx_discovered_urls_status_lastmod", table_name="discovered_urls")
+    op.drop_column("discovered_urls", "lastmod")
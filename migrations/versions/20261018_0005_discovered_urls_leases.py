@@ -0,0 +1,36 @@
+"""Add lease expiry to discovered_urls for skip-locked queue claims.
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "discovered_urls",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "idx_discovered_urls_processing_lease",
+        "discovered_urls",
+        ["lease_expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'processing'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_discovered_urls_processing_lease", table_name="discovered_urls")
+    op.drop_column("discovered_urls", "lease_expires_at")
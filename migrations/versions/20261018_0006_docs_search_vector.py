@@ -0,0 +1,59 @@
+"""Add a generated weighted tsvector and GIN index for docs full-text search.
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0006"
+down_revision = "20261018_0005"
+branch_labels = None
+depends_on = None
+
+# array_to_string() is only STABLE, which generated columns reject; the wrapper is
+# safe to mark IMMUTABLE because it is only ever applied to text[].
+HEADINGS_TEXT_FUNCTION = """
+CREATE FUNCTION docs_headings_text(headings text[]) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT coalesce(array_to_string(headings, ' '), '') $$
+"""
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, docs_headings_text(headings)), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(short_description, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(content_text, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    op.execute(HEADINGS_TEXT_FUNCTION)
+    op.add_column(
+        "docs",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_docs_search_vector",
+        "docs",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_docs_search_vector", table_name="docs")
+    op.drop_column("docs", "search_vector")
+    op.execute("DROP FUNCTION docs_headings_text(text[])")
@@ -0,0 +1,38 @@
+"""Add pg_trgm indexes on docs titles and headings for fuzzy search fallback.
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0007"
+down_revision = "20261018_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm ships with standard Postgres contrib; servers built without it keep
+    # plain full-text search and the app skips the fuzzy fallback at runtime.
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if not available:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX idx_docs_title_trgm ON docs USING gin (title gin_trgm_ops)")
+    op.execute(
+        "CREATE INDEX idx_docs_headings_trgm ON docs "
+        "USING gin (docs_headings_text(headings) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_docs_headings_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_docs_title_trgm")
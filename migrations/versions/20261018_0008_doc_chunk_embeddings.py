@@ -0,0 +1,55 @@
+"""Add pgvector doc_chunks table with an HNSW index for hybrid search.
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0008"
+down_revision = "20261018_0007"
+branch_labels = None
+depends_on = None
+
+EMBEDDING_DIMENSIONS = 384
+
+
+def upgrade() -> None:
+    # Embeddings are optional: servers without pgvector keep lexical search only.
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+    ).scalar()
+    if not available:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(
+        f"""
+        CREATE TABLE doc_chunks (
+            id uuid NOT NULL DEFAULT gen_random_uuid(),
+            doc_id uuid NOT NULL,
+            chunk_index integer NOT NULL,
+            heading text,
+            content text NOT NULL,
+            embedding_model text NOT NULL,
+            embedding vector({EMBEDDING_DIMENSIONS}) NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT doc_chunks_pkey PRIMARY KEY (id),
+            CONSTRAINT doc_chunks_doc_id_fkey FOREIGN KEY (doc_id)
+                REFERENCES docs (id) ON DELETE CASCADE,
+            CONSTRAINT uq_doc_chunks_doc_chunk UNIQUE (doc_id, chunk_index)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX idx_doc_chunks_embedding_hnsw ON doc_chunks "
+        "USING hnsw (embedding vector_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS doc_chunks")
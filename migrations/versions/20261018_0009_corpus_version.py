@@ -0,0 +1,37 @@
+"""Add single-row corpus_version counter bumped whenever docs content changes.
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0009"
+down_revision = "20261018_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "corpus_version",
+        sa.Column("id", sa.SmallInteger(), nullable=False, primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.CheckConstraint("id = 1", name="ck_corpus_version_single_row"),
+    )
+    op.execute("INSERT INTO corpus_version (id) VALUES (1)")
+
+
+def downgrade() -> None:
+    op.drop_table("corpus_version")
@@ -0,0 +1,30 @@
+"""Add a keyset index for doc listings on (coalesce(published_at, '-infinity') DESC, id DESC).
+
+Undated docs sort as '-infinity', i.e. after every dated doc, without a NULLS clause.
+
+Revision ID: 20261018_0010
+Revises: 20261018_0009
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0010"
+down_revision = "20261018_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # coalesce() folds NULL dates to the end so the page boundary is one row comparison.
+    op.execute(
+        "CREATE INDEX idx_docs_published_keyset ON docs "
+        "((coalesce(published_at, '-infinity'::timestamptz)) DESC, id DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_docs_published_keyset")
@@ -0,0 +1,55 @@
+"""Add theme_stats: per-theme doc counts bucketed by publish day and doc type.
+
+Revision ID: 20261018_0011
+Revises: 20261018_0010
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0011"
+down_revision = "20261018_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "theme_stats",
+        sa.Column(
+            "theme",
+            sa.Text(),
+            sa.ForeignKey("themes.theme", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("bucket", sa.Date(), nullable=False),
+        sa.Column("doc_type", sa.Text(), nullable=False),
+        sa.Column("doc_count", sa.Integer(), nullable=False),
+        sa.Column("last_seen", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("theme", "bucket", "doc_type", name="pk_theme_stats"),
+    )
+    op.create_index("idx_theme_stats_bucket", "theme_stats", ["bucket"], unique=False)
+    # Undated docs go to the 0001-01-01 sentinel bucket (UNDATED_THEME_BUCKET).
+    op.execute(
+        """
+        INSERT INTO theme_stats (theme, bucket, doc_type, doc_count, last_seen)
+        SELECT
+            dt.theme,
+            coalesce((d.published_at AT TIME ZONE 'UTC')::date, '0001-01-01'::date),
+            d.type,
+            count(*),
+            max(d.published_at)
+        FROM doc_themes dt
+        JOIN docs d ON d.id = dt.doc_id
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_theme_stats_bucket", table_name="theme_stats")
+    op.drop_table("theme_stats")
@@ -0,0 +1,25 @@
+"""Add docs.themes_hash: the extractor version and content hash last themed.
+
+Revision ID: 20261018_0012
+Revises: 20261018_0011
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0012"
+down_revision = "20261018_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("docs", sa.Column("themes_hash", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("docs", "themes_hash")
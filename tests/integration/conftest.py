@@ -10,7 +10,9 @@ from alembic.config import Config
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 ALLOWED_TEST_DB_HOSTS = {"localhost", "127.0.0.1", "::1"}
 
@@ -109,9 +111,23 @@ def db_session(migrated_database: str) -> Iterator[Session]:
     with engine.connect() as connection:
         connection = connection.execution_options(isolation_level="AUTOCOMMIT")
         truncate_sql = (
-            "TRUNCATE TABLE doc_themes, docs, themes, discovered_urls "
+            "TRUNCATE TABLE doc_themes, docs, themes, discovered_urls, sitemap_fetch_cache "
             "RESTART IDENTITY CASCADE"
         )
         connection.execute(text(truncate_sql))
 
     engine.dispose()
+
+
+@pytest.fixture()
+def async_session_factory(migrated_database: str) -> Iterator[async_sessionmaker[AsyncSession]]:
+    # TestClient runs each request on a fresh event loop, so connections are never pooled.
+    engine = create_async_engine(migrated_database, poolclass=NullPool)
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    engine.sync_engine.dispose()
+
+
+@pytest.fixture()
+def api_engine(async_session_factory: async_sessionmaker[AsyncSession]) -> Engine:
+    """Sync view of the engine behind the API's sessions, for ``before_cursor_execute``."""
+    return async_session_factory.kw["bind"].sync_engine
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crawler.extract import extract_document
+from app.crawler.pool import CrawlItem, CrawlOutcome
+from app.crawler.run import persist_crawl_outcomes
+from app.db.models import DiscoveredUrl, Doc, ThemeStat
+from app.db.repository import (
+    claim_discovered_urls,
+    create_theme,
+    enqueue_discovered_url_candidates,
+    get_corpus_version,
+    get_doc_content_hashes,
+    link_doc_theme,
+)
+from app.discovery.sitemap import DiscoveredUrlCandidate
+
+
+def test_persist_crawl_outcomes_upserts_docs_and_settles_queue(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    enqueue_discovered_url_candidates(
+        db_session,
+        [
+            DiscoveredUrlCandidate(
+                url=f"https://jetformbuilder.com/tutorials/{slug}",
+                source="jetformbuilder",
+                doc_type="tutorial",
+                discovered_at=now + timedelta(seconds=index),
+            )
+            for index, slug in enumerate(["ok", "gone", "busy"])
+        ],
+    )
+    db_session.commit()
+    ok, gone, busy = [
+        CrawlItem(id=row.id, url=row.url, source=row.source, doc_type=row.type)
+        for row in claim_discovered_urls(db_session, limit=3, now=now)
+    ]
+    db_session.commit()
+
+    version = get_corpus_version(db_session)
+    first = extract_document("<main><h1>Upload Files</h1><p>Old text.</p></main>")
+    second = extract_document("<main><h1>Upload Files</h1><p>New text.</p></main>")
+    counts = persist_crawl_outcomes(
+        db_session,
+        [
+            CrawlOutcome(ok, http_status=200, document=first, content_hash="hash-1"),
+            CrawlOutcome(gone, http_status=404, error="HTTP 404", retryable=False),
+            CrawlOutcome(busy, http_status=503, error="HTTP 503"),
+        ],
+        crawled_at=now,
+    )
+    create_theme(db_session, "uploads")
+    link_doc_theme(db_session, db_session.scalars(select(Doc.id)).one(), "uploads")
+    persist_crawl_outcomes(
+        db_session,
+        [CrawlOutcome(ok, http_status=200, document=second, content_hash="hash-2")],
+        crawled_at=now,
+    )
+    db_session.commit()
+    db_session.expire_all()
+
+    assert counts == {"crawled": 1, "failed": 2}
+    assert get_corpus_version(db_session) == version + 2
+    docs = db_session.scalars(select(Doc)).all()
+    assert [(doc.url, doc.title, doc.content_text) for doc in docs] == [
+        (ok.url, "Upload Files", "Upload Files\nNew text.")
+    ]
+    assert docs[0].content_hash == "hash-2"
+    stats = db_session.scalars(select(ThemeStat)).all()
+    assert [(stat.theme, stat.doc_type, stat.doc_count) for stat in stats] == [
+        ("uploads", "tutorial", 1)
+    ]
+    assert docs[0].http_status == 200
+
+    statuses = {row.url: row.status for row in db_session.scalars(select(DiscoveredUrl))}
+    assert statuses == {ok.url: "crawled", gone.url: "failed", busy.url: "pending"}
+
+
+def test_unchanged_outcomes_only_bump_last_crawled_at(db_session: Session) -> None:
+    first_crawl = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    recrawl = first_crawl + timedelta(days=1)
+    url = "https://jetformbuilder.com/tutorials/stable"
+    enqueue_discovered_url_candidates(
+        db_session,
+        [DiscoveredUrlCandidate(url, "jetformbuilder", "tutorial", first_crawl)],
+    )
+    (row,) = claim_discovered_urls(db_session, limit=1, now=first_crawl)
+    item = CrawlItem(id=row.id, url=row.url, source=row.source, doc_type=row.type)
+    document = extract_document("<main><h1>Stable</h1><p>Same text.</p></main>")
+    persist_crawl_outcomes(
+        db_session,
+        [CrawlOutcome(item, http_status=200, document=document, content_hash="same")],
+        crawled_at=first_crawl,
+    )
+    db_session.commit()
+
+    assert get_doc_content_hashes(db_session, [url, "https://example.com/none"]) == {url: "same"}
+    known = CrawlItem(item.id, url, "jetformbuilder", "tutorial", known_content_hash="same")
+    outcome = CrawlOutcome(known, http_status=200, content_hash="same")
+    assert outcome.unchanged
+    version = get_corpus_version(db_session)
+    counts = persist_crawl_outcomes(db_session, [outcome], crawled_at=recrawl)
+    db_session.commit()
+    db_session.expire_all()
+
+    assert counts == {"unchanged": 1}
+    assert get_corpus_version(db_session) == version
+    doc = db_session.scalars(select(Doc)).one()
+    assert (doc.title, doc.content_text, doc.content_hash) == (
+        "Stable",
+        "Stable\nSame text.",
+        "same",
+    )
+    assert doc.last_crawled_at == recrawl
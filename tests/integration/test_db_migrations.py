@@ -8,7 +8,14 @@ def test_migrate_up_creates_required_schema(migrated_database: str) -> None:
     inspector = inspect(engine)
 
     table_names = set(inspector.get_table_names())
-    assert {"docs", "themes", "doc_themes"} <= table_names
+    assert {
+        "docs",
+        "themes",
+        "doc_themes",
+        "sitemap_fetch_cache",
+        "corpus_version",
+        "theme_stats",
+    } <= table_names
 
     unique_constraints = inspector.get_unique_constraints("docs")
     assert any(
@@ -27,6 +34,8 @@ def test_migrate_up_creates_required_schema(migrated_database: str) -> None:
     assert "idx_docs_source" in index_names
     assert "idx_docs_type" in index_names
     assert "idx_docs_published_at" in index_names
+    assert "idx_docs_search_vector" in index_names
+    assert "idx_docs_published_keyset" in index_names
 
     doc_themes_index_names = {index["name"] for index in inspector.get_indexes("doc_themes")}
     assert "idx_doc_themes_theme" in doc_themes_index_names
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import create_engine, event, select, text
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.db.config import PoolConfig
 from app.db.models import DocTheme
-from app.db.repository import create_doc, create_theme, get_doc_by_url, link_doc_theme
+from app.db.repository import (
+    create_doc,
+    create_theme,
+    get_doc_by_url,
+    get_doc_detail,
+    get_doc_details,
+    get_doc_validator,
+    link_doc_theme,
+)
 
 
 def test_insert_select_round_trip(db_session: Session) -> None:
@@ -36,3 +45,50 @@ def test_insert_select_round_trip(db_session: Session) -> None:
         link_rows = verify_session.scalars(select(DocTheme)).all()
         assert len(link_rows) == 1
         assert link_rows[0].theme == "file upload"
+
+
+def test_hot_lookups_are_prepared_server_side(migrated_database: str) -> None:
+    engine = create_engine(migrated_database, **PoolConfig(prepare_threshold=1).engine_options())
+    try:
+        with Session(engine) as session:
+            for _ in range(3):
+                assert get_doc_detail(session, "https://jetformbuilder.com/missing") is None
+            prepared = session.scalars(text("SELECT statement FROM pg_prepared_statements")).all()
+    finally:
+        engine.dispose()
+
+    assert any("WHERE docs.url = $1" in statement for statement in prepared)
+
+
+def test_doc_reads_load_themes_in_the_same_statement(db_session: Session) -> None:
+    url = "https://jetformbuilder.com/tutorials/themed"
+    doc = create_doc(
+        db_session, url=url, source="jetformbuilder", doc_type="tutorial", title="Themed"
+    )
+    bare_url = "https://jetformbuilder.com/tutorials/bare"
+    create_doc(db_session, url=bare_url, source="jetformbuilder", doc_type="tutorial", title="Bare")
+    for theme in ("uploads", "payments"):
+        create_theme(db_session, theme)
+        link_doc_theme(db_session, doc.id, theme)
+    db_session.commit()
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        detail = get_doc_detail(db_session, url)
+        validator = get_doc_validator(db_session, bare_url)
+        batch = get_doc_details(db_session, [bare_url, url], fields=["themes"])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 3
+    assert detail is not None and detail.themes == ("payments", "uploads")
+    assert validator is not None and validator.themes == ()
+    assert batch == [
+        {"url": bare_url, "themes": []},
+        {"url": url, "themes": ["payments", "uploads"]},
+    ]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models import DiscoveredUrl
+from app.db.repository import (
+    claim_discovered_urls,
+    complete_discovered_urls,
+    enqueue_discovered_url_candidates,
+    fail_discovered_url,
+    reclaim_expired_discovered_url_leases,
+)
+from app.discovery.sitemap import DiscoveredUrlCandidate
+
+
+def _seed_queue(session: Session, count: int, now: datetime) -> None:
+    enqueue_discovered_url_candidates(
+        session,
+        [
+            DiscoveredUrlCandidate(
+                url=f"https://jetformbuilder.com/tutorials/item-{index}",
+                source="jetformbuilder",
+                doc_type="tutorial",
+                discovered_at=now + timedelta(seconds=index),
+            )
+            for index in range(count)
+        ],
+    )
+    session.commit()
+
+
+def test_concurrent_claims_skip_locked_rows(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    _seed_queue(db_session, 5, now)
+
+    other_session_factory = sessionmaker(
+        bind=db_session.get_bind(),
+        autocommit=False,
+        autoflush=False,
+        class_=Session,
+    )
+    with other_session_factory() as other_session:
+        first = claim_discovered_urls(db_session, limit=2, lease_seconds=60, now=now)
+        second = claim_discovered_urls(other_session, limit=10, lease_seconds=60, now=now)
+        second_urls = [row.url for row in second]
+        assert all(row.status == "processing" for row in first)
+        assert all(row.lease_expires_at == now + timedelta(seconds=60) for row in first)
+        db_session.commit()
+        other_session.commit()
+
+    assert [row.url for row in first] == [
+        "https://jetformbuilder.com/tutorials/item-0",
+        "https://jetformbuilder.com/tutorials/item-1",
+    ]
+    assert second_urls == [
+        f"https://jetformbuilder.com/tutorials/item-{index}" for index in range(2, 5)
+    ]
+    assert claim_discovered_urls(db_session, limit=10, now=now) == []
+
+
+def test_complete_fail_and_reclaim_update_attempts_and_status(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    _seed_queue(db_session, 4, now)
+    done, retried, exhausted, abandoned = claim_discovered_urls(
+        db_session,
+        limit=4,
+        lease_seconds=60,
+        now=now,
+    )
+    db_session.commit()
+
+    assert complete_discovered_urls(db_session, [done.id]) == 1
+    assert complete_discovered_urls(db_session, [done.id]) == 0
+    assert fail_discovered_url(db_session, retried.id, "HTTP 503", max_attempts=3)
+    assert fail_discovered_url(db_session, exhausted.id, "HTTP 404", max_attempts=1)
+    assert reclaim_expired_discovered_url_leases(db_session, now=now + timedelta(seconds=30)) == 0
+    assert reclaim_expired_discovered_url_leases(db_session, now=now + timedelta(seconds=61)) == 1
+    db_session.commit()
+    db_session.expire_all()
+
+    rows = {
+        row.url: row
+        for row in db_session.scalars(select(DiscoveredUrl).order_by(DiscoveredUrl.url))
+    }
+    assert (rows[done.url].status, rows[done.url].crawl_attempts) == ("crawled", 0)
+    assert rows[done.url].lease_expires_at is None
+    assert (rows[retried.url].status, rows[retried.url].last_error) == ("pending", "HTTP 503")
+    assert (rows[exhausted.url].status, rows[exhausted.url].crawl_attempts) == ("failed", 1)
+    assert (rows[abandoned.url].status, rows[abandoned.url].last_error) == (
+        "pending",
+        "lease expired",
+    )
+
+    reclaimed = claim_discovered_urls(db_session, limit=10, now=now)
+    assert {row.url for row in reclaimed} == {retried.url, abandoned.url}
+
+
+def test_successful_recrawls_do_not_use_up_the_retry_budget(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    url = "https://jetformbuilder.com/tutorials/item-0"
+
+    def enqueue(lastmod: datetime) -> None:
+        candidate = DiscoveredUrlCandidate(
+            url=url,
+            source="jetformbuilder",
+            doc_type="tutorial",
+            discovered_at=now,
+            lastmod=lastmod,
+        )
+        enqueue_discovered_url_candidates(db_session, [candidate])
+        db_session.commit()
+
+    enqueue(now)
+    for day in range(1, 4):
+        (row,) = claim_discovered_urls(db_session, limit=1, now=now)
+        assert complete_discovered_urls(db_session, [row.id]) == 1
+        # A newer sitemap lastmod puts the crawled page back into the queue.
+        enqueue(now + timedelta(days=day))
+
+    (row,) = claim_discovered_urls(db_session, limit=1, now=now)
+    assert fail_discovered_url(db_session, row.id, "HTTP 503", max_attempts=3)
+    db_session.commit()
+    (retry,) = claim_discovered_urls(db_session, limit=1, now=now)
+    db_session.commit()
+
+    assert (retry.url, retry.crawl_attempts, retry.last_error) == (url, 1, "HTTP 503")
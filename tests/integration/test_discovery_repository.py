@@ -2,16 +2,20 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from app.db.models import DiscoveredUrl
+from app.db.models import DiscoveredUrl, Doc
 from app.db.repository import (
     enqueue_discovered_url_candidates,
     get_discovery_counts_by_source_type,
+    get_last_discovery_run_at,
     list_pending_discovered_urls,
+    load_sitemap_fetch_cache,
+    save_sitemap_fetch_cache,
 )
-from app.discovery.sitemap import DiscoveredUrlCandidate
+from app.discovery.cache import CachedSitemap
+from app.discovery.sitemap import DiscoveredUrlCandidate, SitemapEntry
 
 
 def test_discovery_enqueue_is_idempotent_and_counts_are_reported(db_session: Session) -> None:
@@ -45,8 +49,10 @@ def test_discovery_enqueue_is_idempotent_and_counts_are_reported(db_session: Ses
     db_session.commit()
 
     rows = db_session.scalars(select(DiscoveredUrl).order_by(DiscoveredUrl.url.asc())).all()
-    assert processed_1 == 2
-    assert processed_2 == 1
+    assert processed_1.processed == 2
+    assert (processed_1.inserted, processed_1.updated, processed_1.unchanged) == (2, 0, 0)
+    assert processed_2.processed == 1
+    assert (processed_2.inserted, processed_2.updated, processed_2.unchanged) == (0, 1, 0)
     assert len(rows) == 2
 
     updated = next(row for row in rows if row.url == "https://jetformbuilder.com/tutorials/start")
@@ -63,3 +69,229 @@ def test_discovery_enqueue_is_idempotent_and_counts_are_reported(db_session: Ses
         ("crocoblock", "blog", 1),
         ("jetformbuilder", "docs", 1),
     ]
+
+
+def test_sitemap_fetch_cache_round_trip_and_overwrite(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    entry = CachedSitemap(
+        etag='"abc"',
+        last_modified="Wed, 18 Feb 2026 00:00:00 GMT",
+        content_hash="hash-1",
+        kind="urlset",
+        entries=(
+            SitemapEntry("https://jetformbuilder.com/blog/a", now - timedelta(days=3)),
+            SitemapEntry("https://jetformbuilder.com/blog/b"),
+        ),
+    )
+    saved = save_sitemap_fetch_cache(
+        db_session,
+        {"https://jetformbuilder.com/post-sitemap.xml": entry},
+        fetched_at=now,
+    )
+    db_session.commit()
+    assert load_sitemap_fetch_cache(db_session) == {
+        "https://jetformbuilder.com/post-sitemap.xml": entry,
+    }
+
+    replacement = CachedSitemap(
+        etag=None,
+        last_modified=None,
+        content_hash="hash-2",
+        kind="urlset",
+        entries=(SitemapEntry("https://jetformbuilder.com/blog/c"),),
+    )
+    save_sitemap_fetch_cache(
+        db_session,
+        {"https://jetformbuilder.com/post-sitemap.xml": replacement},
+        fetched_at=now + timedelta(days=1),
+    )
+    db_session.commit()
+
+    assert saved == 1
+    assert save_sitemap_fetch_cache(db_session, {}, fetched_at=now) == 0
+    assert load_sitemap_fetch_cache(db_session) == {
+        "https://jetformbuilder.com/post-sitemap.xml": replacement,
+    }
+
+
+def test_lastmod_updates_requeue_crawled_urls_and_drive_priority(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    assert get_last_discovery_run_at(db_session) is None
+
+    enqueue_discovered_url_candidates(
+        db_session,
+        [
+            DiscoveredUrlCandidate(
+                url="https://crocoblock.com/blog/old",
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now - timedelta(days=2),
+                lastmod=now - timedelta(days=30),
+            ),
+            DiscoveredUrlCandidate(
+                url="https://crocoblock.com/blog/fresh",
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now - timedelta(days=1),
+                lastmod=now - timedelta(days=1),
+            ),
+            DiscoveredUrlCandidate(
+                url="https://crocoblock.com/blog/undated",
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now - timedelta(days=3),
+            ),
+        ],
+    )
+    db_session.commit()
+
+    by_age = list_pending_discovered_urls(db_session, limit=10)
+    by_lastmod = list_pending_discovered_urls(db_session, limit=10, prefer_recently_modified=True)
+    assert [row.url for row in by_age] == [
+        "https://crocoblock.com/blog/undated",
+        "https://crocoblock.com/blog/old",
+        "https://crocoblock.com/blog/fresh",
+    ]
+    assert [row.url for row in by_lastmod] == [
+        "https://crocoblock.com/blog/fresh",
+        "https://crocoblock.com/blog/old",
+        "https://crocoblock.com/blog/undated",
+    ]
+
+    db_session.execute(
+        update(DiscoveredUrl)
+        .where(DiscoveredUrl.id.in_([row.id for row in by_age]))
+        .values(status="crawled")
+    )
+    db_session.commit()
+
+    enqueue_discovered_url_candidates(
+        db_session,
+        [
+            DiscoveredUrlCandidate(
+                url="https://crocoblock.com/blog/old",
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now,
+                lastmod=now - timedelta(hours=1),
+            ),
+            DiscoveredUrlCandidate(
+                url="https://crocoblock.com/blog/fresh",
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now,
+                lastmod=now - timedelta(days=1),
+            ),
+            DiscoveredUrlCandidate(
+                url="https://crocoblock.com/blog/undated",
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now,
+            ),
+        ],
+    )
+    db_session.commit()
+    db_session.expire_all()
+
+    statuses = {
+        row.url: (row.status, row.lastmod) for row in db_session.scalars(select(DiscoveredUrl))
+    }
+    assert statuses["https://crocoblock.com/blog/old"] == ("pending", now - timedelta(hours=1))
+    assert statuses["https://crocoblock.com/blog/fresh"][0] == "crawled"
+    assert statuses["https://crocoblock.com/blog/undated"] == ("crawled", None)
+    assert get_last_discovery_run_at(db_session) == now
+
+
+def test_first_lastmod_requeues_urls_changed_since_their_last_crawl(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    crawled_at = now - timedelta(days=1)
+    urls = ["https://crocoblock.com/blog/edited", "https://crocoblock.com/blog/untouched"]
+    # Rows enqueued before lastmod was stored: crawled, with no lastmod to compare against.
+    enqueue_discovered_url_candidates(
+        db_session,
+        [
+            DiscoveredUrlCandidate(
+                url=url, source="crocoblock", doc_type="blog", discovered_at=crawled_at
+            )
+            for url in urls
+        ],
+    )
+    db_session.execute(update(DiscoveredUrl).values(status="crawled"))
+    db_session.add_all(
+        Doc(url=url, source="crocoblock", type="blog", title=url, last_crawled_at=crawled_at)
+        for url in urls
+    )
+    db_session.commit()
+
+    enqueue_discovered_url_candidates(
+        db_session,
+        [
+            DiscoveredUrlCandidate(
+                url=urls[0],
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now,
+                lastmod=crawled_at + timedelta(hours=1),
+            ),
+            DiscoveredUrlCandidate(
+                url=urls[1],
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=now,
+                lastmod=crawled_at - timedelta(hours=1),
+            ),
+        ],
+    )
+    db_session.commit()
+    db_session.expire_all()
+
+    statuses = {
+        row.url: (row.status, row.lastmod) for row in db_session.scalars(select(DiscoveredUrl))
+    }
+    assert statuses == {
+        urls[0]: ("pending", crawled_at + timedelta(hours=1)),
+        urls[1]: ("crawled", crawled_at - timedelta(hours=1)),
+    }
+
+
+def test_enqueue_streams_large_iterators_and_reports_unchanged_rows(db_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+
+    def candidates(count: int, discovered_at: datetime):
+        for index in range(count):
+            yield DiscoveredUrlCandidate(
+                url=f"https://crocoblock.com/blog/post-{index}",
+                source="crocoblock",
+                doc_type="blog",
+                discovered_at=discovered_at,
+            )
+
+    # 25k rows x 6 columns would exceed Postgres' 65535 bind-parameter limit as VALUES.
+    first = enqueue_discovered_url_candidates(db_session, candidates(25_000, now))
+    db_session.commit()
+
+    duplicated = [
+        *candidates(2, now + timedelta(minutes=1)),
+        DiscoveredUrlCandidate(
+            url="https://crocoblock.com/blog/post-0",
+            source="crocoblock",
+            doc_type="kb",
+            discovered_at=now + timedelta(minutes=2),
+        ),
+    ]
+    second = enqueue_discovered_url_candidates(db_session, iter(duplicated))
+    empty = enqueue_discovered_url_candidates(db_session, [])
+    db_session.commit()
+
+    assert (first.inserted, first.updated, first.unchanged) == (25_000, 0, 0)
+    assert (second.inserted, second.updated, second.unchanged) == (0, 1, 1)
+    assert empty.processed == 0
+
+    post_0 = db_session.scalar(
+        select(DiscoveredUrl).where(DiscoveredUrl.url == "https://crocoblock.com/blog/post-0")
+    )
+    post_1 = db_session.scalar(
+        select(DiscoveredUrl).where(DiscoveredUrl.url == "https://crocoblock.com/blog/post-1")
+    )
+    assert post_0 is not None and post_0.type == "kb"
+    assert post_1 is not None and post_1.last_seen_at == now + timedelta(minutes=1)
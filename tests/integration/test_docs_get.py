@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.api.cache import ResultCache, ResultCacheConfig
+from app.api.deps import get_async_read_db_session
+from app.db.models import Doc
+from app.db.repository import bump_corpus_version, create_theme, link_doc_theme
+from app.main import create_app
+
+URL = "https://jetformbuilder.com/tutorials/file-upload"
+
+
+@pytest.fixture()
+def client(
+    db_session: Session,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> TestClient:
+    doc = Doc(
+        url=URL,
+        source="jetformbuilder",
+        type="tutorial",
+        title="Upload Files",
+        published_at=datetime(2025, 3, 1, tzinfo=timezone.utc),
+        tags=["media"],
+        headings=["Limits", "Storage"],
+        short_description="Accept files from visitors.",
+        content_text="Upload Files\nLimits\nStorage",
+        content_hash="hash-1",
+    )
+    db_session.add(doc)
+    db_session.flush()
+    create_theme(db_session, "uploads")
+    create_theme(db_session, "forms")
+    link_doc_theme(db_session, doc.id, "uploads")
+    link_doc_theme(db_session, doc.id, "forms")
+    db_session.commit()
+
+    app = create_app()
+    app.state.result_cache = ResultCache(ResultCacheConfig(version_check_seconds=0))
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db_session] = override_session
+    return TestClient(app)
+
+
+def test_get_returns_full_doc_and_404_for_unknown_url(client: TestClient) -> None:
+    response = client.get("/v1/docs/get", params={"url": URL})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "url": URL,
+        "title": "Upload Files",
+        "source": "jetformbuilder",
+        "type": "tutorial",
+        "published_at": "2025-03-01T00:00:00Z",
+        "short_description": "Accept files from visitors.",
+        "content_text": "Upload Files\nLimits\nStorage",
+        "headings": ["Limits", "Storage"],
+        "tags": ["media"],
+        "themes": ["forms", "uploads"],
+    }
+    missing = client.get("/v1/docs/get", params={"url": "https://jetformbuilder.com/nope"})
+    assert missing.status_code == 404
+
+
+def test_repeated_requests_are_served_from_cache_until_corpus_changes(
+    client: TestClient,
+    db_session: Session,
+) -> None:
+    for q in ("Upload files", "  upload   FILES "):
+        assert client.get("/v1/docs/search", params={"q": q}).json()["count"] == 1
+    assert client.get("/v1/docs/get", params={"url": URL}).json()["title"] == "Upload Files"
+
+    db_session.execute(update(Doc).where(Doc.url == URL).values(title="Uploads v2"))
+    db_session.commit()
+    assert client.get("/v1/docs/get", params={"url": URL}).json()["title"] == "Upload Files"
+
+    bump_corpus_version(db_session)
+    db_session.commit()
+    assert client.get("/v1/docs/get", params={"url": URL}).json()["title"] == "Uploads v2"
+
+    stats = client.get("/metrics/cache").json()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 3, 1)
+    assert stats["entries"] == 1
+
+
+def test_if_none_match_returns_304_without_loading_content(
+    client: TestClient,
+    db_session: Session,
+    api_engine: Engine,
+) -> None:
+    etag = client.get("/v1/docs/get", params={"url": URL}).headers["etag"]
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(api_engine, "before_cursor_execute", record)
+    try:
+        for header in (etag, f'"other", {etag.removeprefix("W/")}', "*"):
+            response = client.get(
+                "/v1/docs/get",
+                params={"url": URL},
+                headers={"If-None-Match": header},
+            )
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag
+            assert response.content == b""
+    finally:
+        event.remove(api_engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not any("content_text" in statement for statement in statements)
+
+
+def test_etag_changes_with_themes_and_stale_copies_get_a_full_body(
+    client: TestClient,
+    db_session: Session,
+) -> None:
+    etag = client.get("/v1/docs/get", params={"url": URL}).headers["etag"]
+
+    doc = db_session.query(Doc).filter_by(url=URL).one()
+    create_theme(db_session, "media")
+    link_doc_theme(db_session, doc.id, "media")
+    bump_corpus_version(db_session)
+    db_session.commit()
+    response = client.get("/v1/docs/get", params={"url": URL}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["themes"] == ["forms", "media", "uploads"]
+
+
+def test_large_doc_bodies_are_gzip_compressed(client: TestClient, db_session: Session) -> None:
+    db_session.execute(
+        update(Doc).where(Doc.url == URL).values(content_text="Upload limits. " * 200)
+    )
+    bump_corpus_version(db_session)
+    db_session.commit()
+
+    response = client.get("/v1/docs/get", params={"url": URL}, headers={"Accept-Encoding": "gzip"})
+    identity = client.get(
+        "/v1/docs/get", params={"url": URL}, headers={"Accept-Encoding": "identity"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json()["content_text"].startswith("Upload limits.")
+    # One tag for both content-codings, so it must be weak.
+    assert "content-encoding" not in identity.headers
+    assert response.headers["etag"] == identity.headers["etag"]
+    assert response.headers["etag"].startswith('W/"')
+
+
+def test_batch_get_projects_fields_truncates_content_and_reports_missing(
+    client: TestClient,
+    db_session: Session,
+    api_engine: Engine,
+) -> None:
+    other = "https://crocoblock.com/blog/forms"
+    db_session.add(
+        Doc(url=other, source="crocoblock", type="blog", title="Forms", content_text=None)
+    )
+    db_session.commit()
+    missing = "https://jetformbuilder.com/missing"
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(api_engine, "before_cursor_execute", record)
+    try:
+        response = client.post(
+            "/v1/docs/batch_get",
+            json={
+                "urls": [other, missing, URL, other],
+                "fields": ["title", "content_text", "themes"],
+                "max_content_chars": 12,
+            },
+        )
+    finally:
+        event.remove(api_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "count": 2,
+        "results": [
+            {
+                "url": other,
+                "title": "Forms",
+                "content_text": None,
+                "content_truncated": False,
+                "themes": [],
+            },
+            {
+                "url": URL,
+                "title": "Upload Files",
+                "content_text": "Upload Files",
+                "content_truncated": True,
+                "themes": ["forms", "uploads"],
+            },
+        ],
+        "missing": [missing],
+    }
+    doc_queries = [statement for statement in statements if "FROM docs" in statement]
+    assert len(doc_queries) == 1
+    assert "ANY" in doc_queries[0]
+    assert "headings" not in doc_queries[0]
+
+
+def test_batch_get_returns_every_field_by_default(client: TestClient) -> None:
+    body = client.post("/v1/docs/batch_get", json={"urls": [URL]}).json()
+
+    (doc,) = body["results"]
+    assert doc == client.get("/v1/docs/get", params={"url": URL}).json()
+    assert body["missing"] == []
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.api import docs as docs_module
+from app.api.deps import get_async_read_db_session
+from app.db.models import Doc, DocChunk
+from app.main import create_app
+from app.search.embeddings import HashingEmbedder
+from app.search.engine import search_docs
+from app.search.fts import SearchFilters
+from app.search.hybrid import hybrid_search, reciprocal_rank_fusion
+from app.search.indexing import IndexableDoc, index_doc_chunks
+from app.search.vector import vector_search, vector_search_available
+
+
+@pytest.fixture()
+def indexed_docs(db_session: Session) -> Session:
+    if not vector_search_available(db_session):
+        pytest.skip("pgvector is not installed on this Postgres server")
+
+    docs = [
+        Doc(
+            url="https://jetformbuilder.com/tutorials/captcha",
+            source="jetformbuilder",
+            type="tutorial",
+            title="Add a Captcha",
+            headings=["Spam protection"],
+            content_text="Spam protection\nEnable reCAPTCHA to stop spam bots on the form.",
+            published_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        ),
+        Doc(
+            url="https://jetformbuilder.com/tutorials/payments",
+            source="jetformbuilder",
+            type="tutorial",
+            title="Stripe Payments",
+            headings=["Setup"],
+            content_text="Setup\nConnect Stripe to accept payments.",
+            published_at=datetime(2025, 2, 1, tzinfo=timezone.utc),
+        ),
+        Doc(
+            url="https://crocoblock.com/blog/spam",
+            source="crocoblock",
+            type="blog",
+            title="Fighting Form Spam",
+            headings=[],
+            content_text="Honeypot fields protect forms from spam.",
+        ),
+    ]
+    db_session.add_all(docs)
+    db_session.flush()
+    written = index_doc_chunks(
+        db_session,
+        [IndexableDoc(doc.id, doc.title, doc.content_text, doc.headings) for doc in docs],
+        HashingEmbedder(),
+        batch_size=2,
+    )
+    db_session.commit()
+    assert written == 3
+    return db_session
+
+
+def test_index_doc_chunks_replaces_existing_chunks(indexed_docs: Session) -> None:
+    doc = indexed_docs.scalars(select(Doc).where(Doc.title == "Add a Captcha")).one()
+
+    index_doc_chunks(
+        indexed_docs,
+        [IndexableDoc(doc.id, doc.title, "Intro\nSpam protection\nNew text.", doc.headings)],
+        HashingEmbedder(),
+    )
+    indexed_docs.commit()
+
+    chunks = indexed_docs.scalars(
+        select(DocChunk).where(DocChunk.doc_id == doc.id).order_by(DocChunk.chunk_index)
+    ).all()
+    assert [(chunk.heading, chunk.content) for chunk in chunks] == [
+        (None, "Intro"),
+        ("Spam protection", "New text."),
+    ]
+    assert len(chunks[0].embedding) == 384
+    assert indexed_docs.scalar(select(func.count()).select_from(DocChunk)) == 4
+
+
+def test_vector_search_ranks_nearest_doc_and_applies_filters(indexed_docs: Session) -> None:
+    embedder = HashingEmbedder()
+    (query,) = embedder.embed(["spam protection"])
+
+    hits = vector_search(indexed_docs, query, embedder.name)
+    filtered = vector_search(indexed_docs, query, embedder.name, SearchFilters(source="crocoblock"))
+
+    assert hits[0].title == "Add a Captcha"
+    assert 0 < (hits[0].score or 0) <= 1
+    assert [hit.title for hit in filtered] == ["Fighting Form Spam"]
+    assert vector_search(indexed_docs, query, "other-model") == []
+
+
+def test_hybrid_mode_fuses_lexical_and_vector_rankings(
+    indexed_docs: Session,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    embedder = HashingEmbedder()
+    query = "form spam protection"
+    (query_embedding,) = embedder.embed([query])
+    expected = reciprocal_rank_fusion(
+        [
+            search_docs(indexed_docs, query, limit=50),
+            vector_search(indexed_docs, query_embedding, embedder.name, limit=50),
+        ]
+    )[:2]
+
+    hits = hybrid_search(indexed_docs, query, embedder, limit=2)
+
+    assert hits == expected
+    assert {hit.title for hit in hits} == {"Add a Captcha", "Fighting Form Spam"}
+
+    app = create_app()
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db_session] = override_session
+    body = (
+        TestClient(app)
+        .get("/v1/docs/search", params={"q": query, "mode": "hybrid", "limit": 2})
+        .json()
+    )
+    assert body["mode"] == "hybrid"
+    assert [result["title"] for result in body["results"]] == [hit.title for hit in hits]
+
+
+class LoopRecordingEmbedder(HashingEmbedder):
+    def __init__(self) -> None:
+        super().__init__()
+        self.called_on_loop: list[bool] = []
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        try:
+            asyncio.get_running_loop()
+            self.called_on_loop.append(True)
+        except RuntimeError:
+            self.called_on_loop.append(False)
+        return super().embed(texts)
+
+
+def test_hybrid_endpoint_embeds_the_query_off_the_event_loop(
+    indexed_docs: Session,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    embedder = LoopRecordingEmbedder()
+    monkeypatch.setattr(docs_module, "get_embedder", lambda: embedder)
+    app = create_app()
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db_session] = override_session
+    client = TestClient(app)
+    params = {"q": "form spam protection", "mode": "hybrid", "limit": 2}
+
+    first = client.get("/v1/docs/search", params=params).json()
+    second = client.get("/v1/docs/search", params={**params, "snippets": 1}).json()
+
+    assert [hit["title"] for hit in first["results"]] == [hit["title"] for hit in second["results"]]
+    # One inference, in a worker thread; the second query reuses the embedding.
+    assert embedder.called_on_loop == [False]
+
+
+def test_blank_hybrid_queries_never_load_the_embedder(
+    indexed_docs: Session,
+    async_session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def missing_model() -> HashingEmbedder:
+        raise RuntimeError("EMBEDDING_MODEL needs sentence-transformers")
+
+    monkeypatch.setattr(docs_module, "get_embedder", missing_model)
+    app = create_app()
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db_session] = override_session
+    response = TestClient(app).get("/v1/docs/search", params={"q": "  ", "mode": "hybrid"})
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 3
+    assert hybrid_search(indexed_docs, "spam", None) == search_docs(indexed_docs, "spam")
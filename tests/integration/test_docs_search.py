@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_async_read_db_session
+from app.db.models import Doc
+from app.db.repository import create_theme, link_doc_theme
+from app.main import create_app
+from app.search.engine import search_docs
+from app.search.fts import SearchFilters
+from app.search.trigram import trigram_search_available
+
+
+def _doc(slug: str, **fields) -> Doc:
+    defaults = {
+        "url": f"https://jetformbuilder.com/tutorials/{slug}",
+        "source": "jetformbuilder",
+        "type": "tutorial",
+        "title": slug.replace("-", " ").title(),
+        "published_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "headings": [],
+    }
+    return Doc(**{**defaults, **fields})
+
+
+@pytest.fixture()
+def seeded_docs(db_session: Session) -> Session:
+    db_session.add_all(
+        [
+            _doc(
+                "file-upload",
+                title="Upload Files With the Media Field",
+                headings=["Limits"],
+                content_text="Accept images from visitors.",
+                published_at=datetime(2025, 3, 1, tzinfo=timezone.utc),
+            ),
+            _doc(
+                "limits",
+                title="Form Limits",
+                headings=["Upload size"],
+                content_text="Restrict how many submissions a form accepts.",
+                published_at=datetime(2025, 5, 1, tzinfo=timezone.utc),
+            ),
+            _doc(
+                "payments",
+                title="Stripe Payments",
+                content_text="Uploading a logo to Stripe is optional.",
+                published_at=datetime(2024, 6, 1, tzinfo=timezone.utc),
+            ),
+            _doc(
+                "crocoblock-upload",
+                url="https://crocoblock.com/blog/upload",
+                source="crocoblock",
+                type="blog",
+                title="Upload Widgets",
+            ),
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture()
+def client(
+    seeded_docs: Session,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> Iterator[TestClient]:
+    app = create_app()
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db_session] = override_session
+    yield TestClient(app)
+
+
+def test_search_ranks_title_matches_above_headings_and_body(seeded_docs: Session) -> None:
+    hits = search_docs(seeded_docs, "upload", SearchFilters(source="jetformbuilder"))
+
+    assert [hit.url.rsplit("/", 1)[1] for hit in hits] == ["file-upload", "limits", "payments"]
+    assert all(0 < (hit.score or 0) < 1 for hit in hits)
+    assert hits[0].score > hits[1].score > hits[2].score
+
+
+def test_search_endpoint_applies_filters_in_the_same_query(client: TestClient) -> None:
+    response = client.get(
+        "/v1/docs/search",
+        params={"q": "upload", "type": "tutorial", "after": "2025-01-01", "before": "2025-04-01"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert body["results"][0]["url"] == "https://jetformbuilder.com/tutorials/file-upload"
+    assert body["results"][0]["type"] == "tutorial"
+
+    listing = client.get("/v1/docs/search", params={"source": "crocoblock"}).json()
+    assert [result["title"] for result in listing["results"]] == ["Upload Widgets"]
+    assert listing["results"][0]["score"] is None
+
+
+def test_search_projects_columns_and_returns_snippets_only_on_request(
+    client: TestClient,
+    seeded_docs: Session,
+    api_engine: Engine,
+) -> None:
+    doc = seeded_docs.query(Doc).filter_by(title="Stripe Payments").one()
+    doc.tags = ["payments"]
+    create_theme(seeded_docs, "billing")
+    link_doc_theme(seeded_docs, doc.id, "billing")
+    seeded_docs.commit()
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(api_engine, "before_cursor_execute", record)
+    try:
+        plain = client.get("/v1/docs/search", params={"q": "stripe"}).json()
+        plain_statements, statements[:] = list(statements), []
+        snippets = client.get("/v1/docs/search", params={"q": "stripe", "snippets": 1}).json()
+    finally:
+        event.remove(api_engine, "before_cursor_execute", record)
+
+    (result,) = plain["results"]
+    assert (result["tags"], result["themes"], result["snippet"]) == (
+        ["payments"],
+        ["billing"],
+        None,
+    )
+    assert not any("content_text" in statement for statement in plain_statements)
+    assert snippets["results"][0]["snippet"] == "Uploading a logo to **Stripe** is optional"
+    assert sum("ts_headline" in statement for statement in statements) == 1
+    assert client.get("/v1/docs/search", params={"snippets": 4}).status_code == 422
+
+
+def _all_pages(client: TestClient, params: dict[str, object]) -> list[list[str]]:
+    pages: list[list[str]] = []
+    cursor = None
+    while True:
+        body = client.get("/v1/docs/search", params={**params, "cursor": cursor}).json()
+        pages.append([result["url"].rsplit("/", 1)[1] for result in body["results"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_match_a_single_ranked_page(
+    client: TestClient,
+    seeded_docs: Session,
+) -> None:
+    seeded_docs.add_all(
+        [
+            _doc("upload-a", title="Upload A", published_at=None),
+            _doc("upload-b", title="Upload B", published_at=None),
+            _doc("upload-c", title="Upload C"),
+        ]
+    )
+    seeded_docs.commit()
+
+    for params in ({"q": "upload"}, {}):
+        full = client.get("/v1/docs/search", params={**params, "limit": 100}).json()
+        expected = [result["url"].rsplit("/", 1)[1] for result in full["results"]]
+        pages = _all_pages(client, {**params, "limit": 2})
+
+        assert full["next_cursor"] is None
+        assert [len(page) for page in pages[:-1]] == [2] * (len(pages) - 1)
+        assert [slug for page in pages for slug in page] == expected
+        assert len(expected) >= 6
+
+
+def test_invalid_cursors_are_rejected(client: TestClient) -> None:
+    first = client.get("/v1/docs/search", params={"q": "upload", "limit": 1}).json()
+    cursor = first["next_cursor"]
+
+    assert cursor is not None
+    for params in (
+        {"q": "payments", "cursor": cursor},
+        {"q": "upload", "source": "crocoblock", "cursor": cursor},
+        {"q": "upload", "mode": "hybrid", "cursor": cursor},
+        {"q": "upload", "cursor": "garbage"},
+    ):
+        response = client.get("/v1/docs/search", params=params)
+        assert response.status_code == 400
+        assert response.json()["detail"]
+
+
+def test_listing_pages_use_the_keyset_index(seeded_docs: Session) -> None:
+    seeded_docs.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(
+        seeded_docs.execute(
+            text(
+                "EXPLAIN SELECT id FROM docs "
+                "WHERE (coalesce(published_at, '-infinity'::timestamptz), id) "
+                "< (now(), gen_random_uuid()) "
+                "ORDER BY coalesce(published_at, '-infinity'::timestamptz) DESC, id DESC LIMIT 20"
+            )
+        ).scalars()
+    )
+    seeded_docs.rollback()
+
+    assert "idx_docs_published_keyset" in plan
+
+
+def test_search_query_uses_gin_index(seeded_docs: Session) -> None:
+    seeded_docs.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(
+        seeded_docs.execute(
+            text(
+                "EXPLAIN SELECT id FROM docs "
+                "WHERE search_vector @@ websearch_to_tsquery('english', 'upload')"
+            )
+        ).scalars()
+    )
+    seeded_docs.rollback()
+
+    assert "idx_docs_search_vector" in plan
+
+
+def test_typo_queries_fall_back_to_trigram_title_matches(seeded_docs: Session) -> None:
+    if not trigram_search_available(seeded_docs):
+        pytest.skip("pg_trgm is not installed on this Postgres server")
+
+    hits = search_docs(seeded_docs, "stripe paymets")
+    merged = search_docs(seeded_docs, "uplod")
+
+    assert hits[0].url == "https://jetformbuilder.com/tutorials/payments"
+    assert 0 < (hits[0].score or 0) <= 0.5
+    assert "https://jetformbuilder.com/tutorials/file-upload" in {hit.url for hit in merged}
+
+
+def test_fuzzy_title_hits_rank_below_body_only_lexical_hits(seeded_docs: Session) -> None:
+    if not trigram_search_available(seeded_docs):
+        pytest.skip("pg_trgm is not installed on this Postgres server")
+    seeded_docs.add(
+        _doc("refunds", title="Refund Policy", content_text="Refunds for paymets made twice.")
+    )
+    seeded_docs.commit()
+
+    hits = search_docs(seeded_docs, "paymets")
+
+    assert [hit.url for hit in hits] == [
+        "https://jetformbuilder.com/tutorials/refunds",
+        "https://jetformbuilder.com/tutorials/payments",
+    ]
+    assert (hits[0].score or 0) > (hits[1].score or 0) > 0
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.session import measure_replica_lag
+
+
+def test_replica_lag_probe_reads_zero_on_a_primary(migrated_database: str) -> None:
+    async def probe() -> float:
+        engine = create_async_engine(migrated_database, poolclass=NullPool)
+        try:
+            return await measure_replica_lag(engine)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(probe()) == 0.0
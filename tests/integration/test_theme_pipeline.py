@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import Doc, DocTheme, Theme, ThemeStat
+from app.db.repository import get_corpus_version
+from app.themes.run import THEMES_HASH_PREFIX, theme_changed_docs
+
+LONG_AGO = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def _doc(slug: str, title: str, tags: list[str], content_hash: str | None) -> Doc:
+    return Doc(
+        url=f"https://jetformbuilder.com/{slug}",
+        source="jetformbuilder",
+        type="tutorial",
+        title=title,
+        tags=tags,
+        content_hash=content_hash,
+    )
+
+
+def _memberships(session: Session) -> set[tuple[str, str]]:
+    rows = session.execute(select(Doc.url, DocTheme.theme).join(Doc, Doc.id == DocTheme.doc_id))
+    return {(url.rsplit("/", 1)[1], theme) for url, theme in rows}
+
+
+def _updated_at(session: Session) -> dict[str, datetime]:
+    return {
+        row.theme: row.updated_at for row in session.execute(select(Theme.theme, Theme.updated_at))
+    }
+
+
+def test_theme_run_only_processes_changed_docs_and_writes_diffs(db_session: Session) -> None:
+    uploads = _doc("uploads", "Upload files", ["File Upload"], "hash-a")
+    payments = _doc("payments", "Stripe payments", ["Styling"], "hash-b")
+    uncrawled = _doc("uncrawled", "Webhooks", [], None)
+    db_session.add_all([uploads, payments, uncrawled])
+    db_session.commit()
+
+    first = theme_changed_docs(db_session, batch_size=10)
+    db_session.commit()
+
+    assert (first["themed"], first["changed_themes"]) == (2, 3)
+    assert _memberships(db_session) == {
+        ("uploads", "uploads"),
+        ("payments", "styling"),
+        ("payments", "payments"),
+    }
+    assert db_session.scalar(select(Doc.themes_hash).where(Doc.id == uploads.id)) == (
+        THEMES_HASH_PREFIX + "hash-a"
+    )
+    assert db_session.scalar(select(ThemeStat.doc_count).where(ThemeStat.theme == "styling")) == 1
+
+    version = get_corpus_version(db_session)
+    assert theme_changed_docs(db_session, batch_size=10)["themed"] == 0
+    assert get_corpus_version(db_session) == version
+
+    db_session.execute(update(Theme).values(updated_at=LONG_AGO))
+    db_session.execute(
+        update(Doc)
+        .where(Doc.id == payments.id)
+        .values(content_hash="hash-b2", tags=["Styling", "Calculator"])
+    )
+    db_session.execute(update(Doc).where(Doc.id == uploads.id).values(content_hash="hash-a2"))
+    db_session.commit()
+    captured: list[str] = []
+    engine = db_session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        second = theme_changed_docs(db_session, batch_size=10)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    db_session.commit()
+
+    assert (second["themed"], second["changed_themes"]) == (2, 1)
+    assert _memberships(db_session) == {
+        ("uploads", "uploads"),
+        ("payments", "styling"),
+        ("payments", "calculations"),
+        ("payments", "payments"),
+    }
+    assert not any(statement.startswith("DELETE FROM doc_themes") for statement in captured)
+    updated_at = _updated_at(db_session)
+    assert updated_at["calculations"] > LONG_AGO
+    assert {theme: updated_at[theme] for theme in ("uploads", "styling", "payments")} == {
+        "uploads": LONG_AGO,
+        "styling": LONG_AGO,
+        "payments": LONG_AGO,
+    }
+    assert get_corpus_version(db_session) == version + 1
+
+
+def test_theme_run_removes_dropped_themes(db_session: Session) -> None:
+    doc = _doc("styling", "Custom form design", ["Webhooks"], "hash-1")
+    db_session.add(doc)
+    db_session.commit()
+    theme_changed_docs(db_session, batch_size=10)
+    db_session.commit()
+    db_session.execute(update(Doc).values(content_hash="hash-2", tags=[]))
+    db_session.commit()
+
+    counts = theme_changed_docs(db_session, batch_size=1)
+    db_session.commit()
+
+    assert counts["changed_themes"] == 1
+    assert _memberships(db_session) == {("styling", "styling")}
+    assert db_session.scalars(select(ThemeStat.theme)).all() == ["styling"]
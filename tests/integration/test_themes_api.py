@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_async_read_db_session
+from app.db.models import Doc, DocTheme, Theme, ThemeStat
+from app.db.repository import refresh_theme_stats
+from app.main import create_app
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _days_ago(days: int) -> datetime:
+    return NOW - timedelta(days=days)
+
+
+@pytest.fixture()
+def client(
+    db_session: Session,
+    async_session_factory: async_sessionmaker[AsyncSession],
+) -> Iterator[TestClient]:
+    docs = {
+        "uploads": [("blog", 1), ("blog", 2), ("blog", 3), ("blog", 400), ("tutorial", 500)],
+        "payments": [("tutorial", 200), ("tutorial", 300), ("tutorial", 600)],
+        "styling": [("tutorial", 10), ("blog", 700)],
+    }
+    db_session.add_all(Theme(theme=theme) for theme in docs)
+    for theme, entries in docs.items():
+        for index, (doc_type, age) in enumerate(entries):
+            doc = Doc(
+                url=f"https://jetformbuilder.com/{theme}/{doc_type}-{index}",
+                source="jetformbuilder",
+                type=doc_type,
+                title=f"{theme} {index}",
+                published_at=_days_ago(age),
+            )
+            db_session.add(doc)
+            db_session.flush()
+            db_session.add(DocTheme(doc_id=doc.id, theme=theme))
+    db_session.flush()
+    refresh_theme_stats(db_session)
+    db_session.commit()
+
+    app = create_app()
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db_session] = override_session
+    yield TestClient(app)
+
+
+def _pages(client: TestClient, path: str, params: dict[str, object]) -> list[dict]:
+    results: list[dict] = []
+    cursor = None
+    while True:
+        body = client.get(path, params={**params, "cursor": cursor or ""}).json()
+        assert body["count"] == len(body["results"])
+        results.extend(body["results"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return results
+
+
+def test_themes_list_counts_docs_in_window_and_pages_by_cursor(client: TestClient) -> None:
+    body = client.get("/v1/themes/list").json()
+
+    assert [(item["theme"], item["doc_count"]) for item in body["results"]] == [
+        ("uploads", 5),
+        ("payments", 3),
+        ("styling", 2),
+    ]
+    assert body["results"][0]["last_seen"] == _days_ago(1).isoformat().replace("+00:00", "Z")
+    assert body["next_cursor"] is None
+    assert _pages(client, "/v1/themes/list", {"limit": 1}) == body["results"]
+
+    recent = client.get(
+        "/v1/themes/list",
+        params={"after": _days_ago(365).date().isoformat(), "min_docs": 2},
+    ).json()
+    assert [(item["theme"], item["doc_count"]) for item in recent["results"]] == [
+        ("uploads", 3),
+        ("payments", 2),
+    ]
+
+
+def test_gaps_follow_v1_rules_with_evidence_and_paging(client: TestClient) -> None:
+    body = client.get("/v1/themes/gaps").json()
+
+    assert [(gap["theme"], gap["gap_type"]) for gap in body["results"]] == [
+        ("payments", "tutorial_theme_missing_reference_article"),
+        ("uploads", "blog_theme_missing_tutorial"),
+        ("uploads", "new_feature_low_coverage"),
+    ]
+    blog_gap = body["results"][1]
+    assert (blog_gap["blog_count"], blog_gap["tutorial_count"], blog_gap["recent_count_90d"]) == (
+        4,
+        1,
+        3,
+    )
+    assert blog_gap["reason"] == "4 blog posts but only 1 tutorial(s)."
+    assert blog_gap["evidence_urls"] == [
+        f"https://jetformbuilder.com/uploads/blog-{index}" for index in range(3)
+    ]
+    assert body["results"][0]["evidence_urls"] == [
+        f"https://jetformbuilder.com/payments/tutorial-{index}" for index in range(3)
+    ]
+    for limit in (1, 2):
+        assert _pages(client, "/v1/themes/gaps", {"limit": limit}) == body["results"]
+
+    only_recent = client.get(
+        "/v1/themes/gaps", params={"gap_type": "new_feature_low_coverage"}
+    ).json()
+    assert [gap["theme"] for gap in only_recent["results"]] == ["uploads"]
+
+
+def test_theme_cursors_are_bound_to_their_filters(client: TestClient) -> None:
+    cursor = client.get("/v1/themes/list", params={"limit": 1}).json()["next_cursor"]
+
+    assert (
+        client.get("/v1/themes/list", params={"cursor": cursor, "min_docs": 3}).status_code == 400
+    )
+    assert client.get("/v1/themes/gaps", params={"cursor": cursor}).status_code == 400
+
+
+def test_theme_stats_refresh_is_scoped_to_the_given_themes(
+    client: TestClient,
+    db_session: Session,
+) -> None:
+    doc = Doc(
+        url="https://jetformbuilder.com/uploads/tutorial-new",
+        source="jetformbuilder",
+        type="tutorial",
+        title="Uploads tutorial",
+        published_at=None,
+    )
+    db_session.add(doc)
+    db_session.flush()
+    db_session.add_all(
+        [DocTheme(doc_id=doc.id, theme="uploads"), DocTheme(doc_id=doc.id, theme="styling")]
+    )
+    db_session.flush()
+
+    assert refresh_theme_stats(db_session, ["uploads"]) == 6
+    db_session.commit()
+    counts = {
+        item["theme"]: item["doc_count"] for item in client.get("/v1/themes/list").json()["results"]
+    }
+    windowed = client.get("/v1/themes/list", params={"after": "2000-01-01"}).json()
+    before_only = client.get("/v1/themes/list", params={"before": "2100-01-01"}).json()
+
+    assert counts == {"uploads": 6, "payments": 3, "styling": 2}
+    assert windowed["results"][0] == {
+        "theme": "uploads",
+        "doc_count": 5,
+        "last_seen": _days_ago(1).isoformat().replace("+00:00", "Z"),
+    }
+    assert before_only["results"][0]["doc_count"] == 5
+    assert db_session.query(ThemeStat).filter_by(theme="uploads", doc_type="tutorial").count() == 2
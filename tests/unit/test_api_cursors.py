@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from app.api.cursors import InvalidCursor, decode_cursor, encode_cursor, filters_fingerprint
+
+
+def test_cursor_round_trips_values_for_the_same_query() -> None:
+    fingerprint = filters_fingerprint("lexical", "upload", None)
+    cursor = encode_cursor("search", fingerprint, [0.25, None, "b5c4"])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "search", fingerprint) == [0.25, None, "b5c4"]
+
+
+def test_cursor_is_rejected_for_other_queries_and_garbage() -> None:
+    cursor = encode_cursor("search", filters_fingerprint("upload"), [1])
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "search", filters_fingerprint("payments"))
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "themes", filters_fingerprint("upload"))
+    for garbage in ("", "not-base64!", encode_cursor("search", "x", [])[:-3]):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(garbage, "search", filters_fingerprint("upload"))
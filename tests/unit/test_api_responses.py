@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+from app.api.docs import (
+    DocResponse,
+    SearchResult,
+    doc_payload,
+    search_result_payload,
+)
+from app.api.responses import FastJSONResponse
+from app.api.themes import GapResult, ThemeResult, gap_payload, theme_payload
+from app.db.repository import DocDetail
+from app.main import create_app
+from app.search.fts import SearchHit
+from app.themes.queries import ThemeGap, ThemeSummary
+
+PUBLISHED_AT = datetime(2026, 3, 14, 9, 30, 15, 250000, tzinfo=timezone.utc)
+
+PAYLOADS = [
+    (
+        SearchResult,
+        search_result_payload(
+            SearchHit(
+                id=uuid.uuid4(),
+                url="https://jetformbuilder.com/tutorials/uploads/",
+                title="File uploads – “Media” field",
+                source="jetformbuilder",
+                doc_type="tutorial",
+                published_at=PUBLISHED_AT,
+                short_description=None,
+                score=0.125,
+                tags=("uploads",),
+                themes=("uploads", "validation"),
+                snippet="…the <b>upload</b> field…",
+            )
+        ),
+    ),
+    (
+        DocResponse,
+        doc_payload(
+            DocDetail(
+                id=uuid.uuid4(),
+                url="https://jetformbuilder.com/tutorials/uploads/",
+                title="File uploads",
+                source="jetformbuilder",
+                doc_type="tutorial",
+                published_at=None,
+                short_description="Accept files.",
+                content_text="Body ✓",
+                content_hash="0" * 64,
+                headings=("Step 1",),
+                tags=(),
+                themes=("uploads",),
+            )
+        ),
+    ),
+    (ThemeResult, theme_payload(ThemeSummary(theme="uploads", doc_count=3, last_seen=None))),
+    (
+        GapResult,
+        gap_payload(
+            ThemeGap(
+                theme="uploads",
+                gap_type="blog_theme_missing_tutorial",
+                reason="4 blog posts but only 1 tutorial(s).",
+                tutorial_count=1,
+                blog_count=4,
+                recent_count_90d=3,
+                last_seen=PUBLISHED_AT,
+                evidence_urls=("https://jetformbuilder.com/uploads/blog-0",),
+            )
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("model", "payload"), PAYLOADS, ids=lambda value: getattr(value, "__name__", "")
+)
+def test_payloads_match_their_response_models_byte_for_byte(
+    model: type[BaseModel], payload: dict[str, object]
+) -> None:
+    # Handlers skip output validation, so this is where payload/model drift is caught.
+    assert list(payload) == list(model.model_fields)
+    adapter = TypeAdapter(model)
+    expected = adapter.dump_json(adapter.validate_python(payload))
+
+    # The body is the same whether or not orjson is installed.
+    assert FastJSONResponse(payload).body == expected
+    assert to_json(payload) == expected
+
+
+def test_app_defaults_to_fast_json_and_keeps_response_models_in_openapi() -> None:
+    client = TestClient(create_app())
+
+    health = client.get("/health")
+    schema = client.get("/openapi.json").json()
+
+    assert health.headers["content-type"] == "application/json"
+    assert health.content == b'{"status":"ok"}'
+    search_schema = schema["paths"]["/v1/docs/search"]["get"]["responses"]["200"]["content"]
+    assert search_schema["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/SearchResponse"
+    }
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from app.crawler.extract import body_content_hash, extract_document
+from app.crawler.fetch import FetchedPage, RetryPolicy
+from app.crawler.pool import CrawlConfig, CrawlItem, crawl_urls
+from app.fetch.scheduler import HostScheduler, PolitenessConfig
+
+ARTICLE_HTML = """
+<html lang="en-US">
+<head>
+  <title>Upload Files | JetFormBuilder</title>
+  <meta name="description" content="  How to accept file uploads.  ">
+  <meta property="article:published_time" content="2024-03-01T10:00:00+00:00">
+  <meta property="article:tag" content="uploads">
+  <meta property="article:tag" content="media">
+  <meta property="article:section" content="Tutorials">
+</head>
+<body>
+  <header><nav><ul><li>Home<li>Pricing</ul></nav></header>
+  <main>
+    <article>
+      <header><h1>Upload Files</h1></header>
+      <p>Add a Media Field to the form.</p>
+      <h2>Limits</h2>
+      <p>Set the <b>maximum</b> file size.</p>
+      <script>trackPageView()</script>
+    </article>
+  </main>
+  <footer>Copyright</footer>
+</body>
+</html>
+"""
+
+
+def _item(url: str) -> CrawlItem:
+    return CrawlItem(id=uuid.uuid4(), url=url, source="jetformbuilder", doc_type="tutorial")
+
+
+def _config(**overrides) -> CrawlConfig:
+    retry = RetryPolicy(max_attempts=3, backoff_base_seconds=0)
+    return CrawlConfig(**{"retry": retry, **overrides})
+
+
+def test_extract_document_prefers_main_region_and_page_meta() -> None:
+    document = extract_document(ARTICLE_HTML)
+
+    assert document.title == "Upload Files"
+    assert document.short_description == "How to accept file uploads."
+    assert document.published_at == datetime(2024, 3, 1, 10, tzinfo=timezone.utc)
+    assert document.headings == ["Upload Files", "Limits"]
+    assert document.tags == ["uploads", "media"]
+    assert document.categories == ["Tutorials"]
+    assert document.language == "en"
+    assert document.content_text == (
+        "Upload Files\nAdd a Media Field to the form.\nLimits\nSet the maximum file size."
+    )
+
+
+def test_extract_document_without_main_region_uses_body_and_summary() -> None:
+    document = extract_document(
+        "<html><head><title> Plain page </title></head><body>"
+        "<nav>Menu</nav><p>First sentence here. Second one.</p></body></html>"
+    )
+
+    assert document.title == "Plain page"
+    assert document.content_text == "First sentence here. Second one."
+    assert document.short_description == "First sentence here. Second one."
+    assert document.published_at is None
+
+
+def test_retry_policy_backoff_is_capped_full_jitter() -> None:
+    policy = RetryPolicy(backoff_base_seconds=1, backoff_max_seconds=5)
+    rng = random.Random(7)
+
+    delays = [policy.backoff_seconds(attempt, rng) for attempt in range(1, 8)]
+
+    assert all(0 <= delay <= min(5, 2 ** (attempt - 1)) for attempt, delay in enumerate(delays, 1))
+    with pytest.raises(ValueError, match="max_attempts"):
+        RetryPolicy(max_attempts=0)
+
+
+def test_crawl_urls_retries_transient_failures_and_keeps_input_order() -> None:
+    calls: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def fetch_page(url: str) -> FetchedPage:
+        with lock:
+            calls[url] = calls.get(url, 0) + 1
+            attempt = calls[url]
+        if url.endswith("/flaky") and attempt == 1:
+            return FetchedPage(url, 503, b"")
+        if url.endswith("/offline"):
+            raise ConnectionError("connection refused")
+        if url.endswith("/missing"):
+            return FetchedPage(url, 404, b"")
+        return FetchedPage(url, 200, ARTICLE_HTML.encode(), {"Content-Type": "text/html"})
+
+    items = [
+        _item("https://jetformbuilder.com/tutorials/flaky"),
+        _item("https://jetformbuilder.com/tutorials/missing"),
+        _item("https://jetformbuilder.com/tutorials/offline"),
+        _item("https://jetformbuilder.com/tutorials/ok"),
+    ]
+    with ThreadPoolExecutor(max_workers=2) as parse_executor:
+        outcomes = asyncio.run(crawl_urls(items, fetch_page, _config(), parse_executor))
+
+    assert [outcome.item for outcome in outcomes] == items
+    flaky, missing, offline, ok = outcomes
+    assert flaky.document is not None and flaky.document.title == "Upload Files"
+    assert calls[items[0].url] == 2
+    assert (missing.error, missing.retryable, calls[items[1].url]) == ("HTTP 404", False, 1)
+    assert offline.document is None and "ConnectionError" in (offline.error or "")
+    assert offline.retryable and calls[items[2].url] == 3
+    assert ok.http_status == 200 and ok.error is None
+
+
+def test_crawl_urls_respects_per_host_concurrency() -> None:
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def fetch_page(url: str) -> FetchedPage:
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+        time.sleep(0.02)
+        with lock:
+            in_flight[host] -= 1
+        return FetchedPage(url, 200, b"<p>ok</p>")
+
+    items = [_item(f"https://jetformbuilder.com/page-{index}") for index in range(8)] + [
+        _item(f"https://crocoblock.com/page-{index}") for index in range(8)
+    ]
+    config = _config(max_concurrency=8, max_per_host=2)
+    with ThreadPoolExecutor(max_workers=2) as parse_executor:
+        outcomes = asyncio.run(crawl_urls(items, fetch_page, config, parse_executor))
+
+    assert all(outcome.document is not None for outcome in outcomes)
+    assert peak == {"jetformbuilder.com": 2, "crocoblock.com": 2}
+
+
+def test_crawl_urls_skips_extraction_when_body_hash_is_unchanged() -> None:
+    body = ARTICLE_HTML.encode()
+
+    def fetch_page(url: str) -> FetchedPage:
+        return FetchedPage(url, 200, body)
+
+    class RefusingExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            raise AssertionError("unchanged pages must not be parsed")
+
+    unchanged = CrawlItem(
+        id=uuid.uuid4(),
+        url="https://jetformbuilder.com/tutorials/same",
+        source="jetformbuilder",
+        doc_type="tutorial",
+        known_content_hash=body_content_hash(b"  " + body.replace(b"\n", b"\n    ")),
+    )
+    with RefusingExecutor(max_workers=1) as parse_executor:
+        (outcome,) = asyncio.run(crawl_urls([unchanged], fetch_page, _config(), parse_executor))
+
+    assert outcome.unchanged
+    assert outcome.document is None and outcome.error is None
+    assert body_content_hash(b"<p>a</p>") != body_content_hash(b"<p>b</p>")
+
+
+def test_body_hash_ignores_per_request_nonces_and_cache_busters() -> None:
+    def page(nonce: str, text: str = "Upload files.") -> bytes:
+        return (
+            f'<html><head><link rel="stylesheet" href="/style.css?ver={nonce}">'
+            f'<script>var wpApiSettings = {{"nonce":"{nonce}"}};</script></head>'
+            f'<body><form data-nonce="{nonce}" action="/?_wpnonce={nonce}&amp;a=1">'
+            f'<input type="hidden" name="_wpnonce" value="{nonce}"></form>'
+            f"<main><p>{text}</p></main><!-- cached at {nonce} --></body></html>"
+        ).encode()
+
+    assert body_content_hash(page("a1b2c3")) == body_content_hash(page("d4e5f6"))
+    assert body_content_hash(page("a1b2c3")) != body_content_hash(page("a1b2c3", "Edited."))
+
+
+def test_crawl_urls_honors_robots_and_reports_throttling_to_scheduler() -> None:
+    fetched: list[str] = []
+
+    def fetch_page(url: str) -> FetchedPage:
+        fetched.append(url)
+        if len(fetched) == 1:
+            return FetchedPage(url, 429, b"", {"Retry-After": "0"})
+        return FetchedPage(url, 200, b"<p>ok</p>")
+
+    scheduler = HostScheduler(
+        PolitenessConfig(requests_per_second=1000),
+        fetch_robots=lambda url: "User-agent: *\nDisallow: /wp-admin/\n",
+    )
+    items = [
+        _item("https://jetformbuilder.com/wp-admin/options.php"),
+        _item("https://jetformbuilder.com/tutorials/ok"),
+    ]
+    with ThreadPoolExecutor(max_workers=1) as parse_executor:
+        blocked, ok = asyncio.run(
+            crawl_urls(items, fetch_page, _config(), parse_executor, scheduler)
+        )
+
+    assert (blocked.error, blocked.retryable) == ("disallowed by robots.txt", False)
+    assert ok.document is not None
+    assert fetched == [items[1].url, items[1].url]
+    assert (scheduler.blocked, scheduler.throttled) == (1, 1)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import pytest
 from sqlalchemy.engine import make_url
 
-from app.db.config import build_database_url
+from app.db.config import PoolConfig, build_database_url, get_pool_config
 
 
 def test_build_database_url_wraps_bare_ipv6_host(monkeypatch) -> None:
@@ -37,3 +38,30 @@ def test_build_database_url_keeps_ipv4_host(monkeypatch) -> None:
 
     assert "@127.0.0.1:5432/" in url
     assert parsed.host == "127.0.0.1"
+
+
+def test_get_pool_config_reads_env_and_sets_statement_timeout(monkeypatch) -> None:
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_RECYCLE_SECONDS", "600")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+
+    options = get_pool_config().engine_options()
+
+    assert (options["pool_size"], options["max_overflow"], options["pool_recycle"]) == (20, 0, 600)
+    assert options["connect_args"] == {
+        "prepare_threshold": 2,
+        "options": "-c statement_timeout=5000",
+    }
+    assert PoolConfig().engine_options()["connect_args"] == {"prepare_threshold": 2}
+
+
+def test_get_pool_config_can_disable_prepared_statements(monkeypatch) -> None:
+    monkeypatch.setenv("DB_PREPARE_THRESHOLD", "none")
+
+    assert get_pool_config().engine_options()["connect_args"] == {"prepare_threshold": None}
+
+
+def test_pool_config_rejects_empty_pool() -> None:
+    with pytest.raises(ValueError, match="pool_size"):
+        PoolConfig(pool_size=0)
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_search_rejects_unknown_filters_and_limits() -> None:
+    client = TestClient(app)
+
+    assert client.get("/v1/docs/search", params={"source": "example"}).status_code == 422
+    assert client.get("/v1/docs/search", params={"type": "video"}).status_code == 422
+    assert client.get("/v1/docs/search", params={"limit": 101}).status_code == 422
+    assert client.get("/v1/docs/search", params={"after": "yesterday"}).status_code == 422
+
+
+def test_batch_get_validates_request_body() -> None:
+    client = TestClient(app)
+    url = "https://jetformbuilder.com/tutorials/a"
+
+    for body in (
+        {"urls": []},
+        {"urls": [url] * 21},
+        {"urls": [url], "fields": ["body"]},
+        {"urls": [url], "max_content_chars": 0},
+    ):
+        assert client.post("/v1/docs/batch_get", json=body).status_code == 422
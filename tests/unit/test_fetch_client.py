@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import gzip
+from urllib.error import HTTPError, URLError
+
+import httpx
+import pytest
+
+from app.discovery.cache import SitemapFetchCache
+from app.discovery.sitemap import SitemapEntry, SourceSitemapConfig, discover_url_candidates
+from app.fetch.client import FetchClient, ResponseTooLarge
+from app.fetch.config import HttpClientConfig
+
+URLSET = (
+    b'<?xml version="1.0"?>'
+    b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    b"<url><loc>https://jetformbuilder.com/tutorials/example</loc></url>"
+    b"</urlset>"
+)
+
+
+def _client(handler, **config) -> FetchClient:
+    return FetchClient(HttpClientConfig(**config), transport=httpx.MockTransport(handler))
+
+
+def test_fetch_content_decodes_gzip_and_raises_http_errors() -> None:
+    seen_agents: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_agents.append(request.headers["User-Agent"])
+        if request.url.path == "/busy":
+            return httpx.Response(429, headers={"Retry-After": "7"})
+        return httpx.Response(
+            200,
+            content=gzip.compress(b"hello"),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    with _client(handler) as client:
+        assert client.fetch_content("https://jetformbuilder.com/ok") == b"hello"
+        with pytest.raises(HTTPError) as excinfo:
+            client.fetch_content("https://jetformbuilder.com/busy")
+
+    assert excinfo.value.code == 429
+    assert excinfo.value.headers["Retry-After"] == "7"
+    assert seen_agents[0].startswith("JFBDocsBot/")
+
+
+def test_open_stream_serves_discovery_and_conditional_requests() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=URLSET, headers={"ETag": '"v1"'})
+
+    config = [SourceSitemapConfig("jetformbuilder", "https://jetformbuilder.com/sitemap.xml")]
+    cache = SitemapFetchCache()
+    with _client(handler) as client:
+        first = discover_url_candidates(config, open_stream=client.open_stream, cache=cache)
+        second = discover_url_candidates(config, open_stream=client.open_stream, cache=cache)
+
+    assert [c.url for c in first] == [c.url for c in second] == [
+        "https://jetformbuilder.com/tutorials/example"
+    ]
+    cached = cache.get("https://jetformbuilder.com/sitemap.xml")
+    assert cached is not None
+    assert (cached.etag, cached.kind, cached.entries) == (
+        '"v1"',
+        "urlset",
+        (SitemapEntry("https://jetformbuilder.com/tutorials/example"),),
+    )
+    assert (cache.hits, cache.refetches) == (1, 1)
+    assert len(requests) == 2
+
+
+def test_response_size_cap_applies_to_declared_and_streamed_bodies() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/declared":
+            return httpx.Response(200, content=b"x" * 64)
+        return httpx.Response(200, content=iter([b"x" * 40, b"x" * 40]))
+
+    with _client(handler, max_response_bytes=50) as client:
+        with pytest.raises(ResponseTooLarge):
+            client.fetch_page("https://jetformbuilder.com/declared")
+        with pytest.raises(ResponseTooLarge) as excinfo:
+            client.fetch_content("https://jetformbuilder.com/streamed")
+
+    assert excinfo.value.retryable is False
+
+
+def test_fetch_page_returns_error_responses_and_wraps_transport_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/down":
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        return httpx.Response(
+            404,
+            content=b"<p>gone</p>",
+            headers={"Content-Type": "text/html; charset=iso-8859-1"},
+        )
+
+    with _client(handler) as client:
+        page = client.fetch_page("https://jetformbuilder.com/missing")
+        with pytest.raises(URLError, match="ConnectError"):
+            client.fetch_page("https://jetformbuilder.com/down")
+        robots = client.fetch_robots("https://jetformbuilder.com/robots.txt")
+
+    assert (page.status, page.body, page.charset) == (404, b"<p>gone</p>", "iso-8859-1")
+    assert robots is None
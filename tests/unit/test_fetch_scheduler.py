@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.message import Message
+from io import BytesIO
+from urllib.error import HTTPError
+
+from app.discovery.sitemap import SitemapResponse, SourceSitemapConfig, discover_url_candidates
+from app.fetch.scheduler import HostScheduler, PolitenessConfig, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _scheduler(robots: dict[str, str] | None = None, **config) -> tuple[HostScheduler, FakeClock]:
+    clock = FakeClock()
+    fetched: list[str] = []
+
+    def fetch_robots(robots_url: str) -> str | None:
+        fetched.append(robots_url)
+        return (robots or {}).get(robots_url)
+
+    scheduler = HostScheduler(PolitenessConfig(**config), fetch_robots=fetch_robots, clock=clock)
+    scheduler.fetched_robots = fetched  # type: ignore[attr-defined]
+    return scheduler, clock
+
+
+def test_token_bucket_allows_burst_then_spaces_requests_per_host() -> None:
+    scheduler, clock = _scheduler(requests_per_second=1, burst=2)
+
+    delays = [scheduler.reserve("https://jetformbuilder.com/a") for _ in range(4)]
+    other_host = scheduler.reserve("https://crocoblock.com/a")
+    clock.now += 10
+    after_idle = scheduler.reserve("https://jetformbuilder.com/b")
+
+    assert delays == [0, 0, 1, 2]
+    assert other_host == 0
+    assert after_idle == 0
+
+
+def test_robots_rules_and_crawl_delay_are_fetched_once_per_origin() -> None:
+    scheduler, _ = _scheduler(
+        {
+            "https://jetformbuilder.com/robots.txt": (
+                "User-agent: *\nDisallow: /wp-admin/\nCrawl-delay: 5\n"
+            )
+        },
+        requests_per_second=2,
+        burst=4,
+    )
+
+    assert scheduler.allowed("https://jetformbuilder.com/tutorials/a")
+    assert not scheduler.allowed("https://jetformbuilder.com/wp-admin/edit.php")
+    assert scheduler.allowed("https://crocoblock.com/wp-admin/x")
+    delays = [scheduler.reserve("https://jetformbuilder.com/tutorials/a") for _ in range(3)]
+
+    assert delays == [0, 5, 10]
+    assert scheduler.blocked == 1
+    assert scheduler.fetched_robots == [  # type: ignore[attr-defined]
+        "https://jetformbuilder.com/robots.txt",
+        "https://crocoblock.com/robots.txt",
+    ]
+    assert HostScheduler(
+        PolitenessConfig(respect_robots=False),
+        fetch_robots=lambda url: "User-agent: *\nDisallow: /\n",
+    ).allowed("https://jetformbuilder.com/a")
+
+
+def test_throttled_response_pauses_host_and_halves_rate() -> None:
+    scheduler, clock = _scheduler(requests_per_second=4, burst=1, backoff_base_seconds=2)
+    url = "https://jetformbuilder.com/a"
+    assert scheduler.reserve(url) == 0
+
+    scheduler.record_response(url, 429, {"Retry-After": "30"})
+    assert [scheduler.reserve(url), scheduler.reserve(url)] == [30, 30.5]
+
+    clock.now += 100
+    scheduler.record_response(url, 503, {})
+    scheduler.record_response(url, 503, {})
+    assert [scheduler.reserve(url), scheduler.reserve(url)] == [8, 10]
+    assert scheduler.throttled == 3
+
+    clock.now += 100
+    for _ in range(20):
+        scheduler.record_response(url, 200, {})
+    assert [scheduler.reserve(url), scheduler.reserve(url)] == [0, 0.25]
+
+
+def test_throttling_never_raises_rate_above_a_slow_crawl_delay() -> None:
+    scheduler, clock = _scheduler(
+        {"https://jetformbuilder.com/robots.txt": "User-agent: *\nCrawl-delay: 30\n"},
+        min_requests_per_second=0.1,
+    )
+    url = "https://jetformbuilder.com/a"
+    assert scheduler.reserve(url) == 0
+
+    scheduler.record_response(url, 503, {"Retry-After": "0"})
+    clock.now += 100
+
+    assert [scheduler.reserve(url), scheduler.reserve(url)] == [0, 30]
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates() -> None:
+    now = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Thu, 01 Jan 2026 12:01:30 GMT", now=now) == 90
+    assert parse_retry_after("Thu, 01 Jan 2026 11:00:00 GMT", now=now) == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_discovery_skips_disallowed_sitemaps_and_retries_throttled_fetches() -> None:
+    urlset = (
+        b'<?xml version="1.0"?>'
+        b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<url><loc>https://jetformbuilder.com/tutorials/example</loc></url>"
+        b"</urlset>"
+    )
+    index = (
+        b'<?xml version="1.0"?>'
+        b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<sitemap><loc>https://jetformbuilder.com/post-sitemap.xml</loc></sitemap>"
+        b"<sitemap><loc>https://jetformbuilder.com/private/sitemap.xml</loc></sitemap>"
+        b"</sitemapindex>"
+    )
+    bodies = {
+        "https://jetformbuilder.com/sitemap_index.xml": index,
+        "https://jetformbuilder.com/post-sitemap.xml": urlset,
+    }
+    requested: list[str] = []
+
+    @contextmanager
+    def open_stream(url: str, request_headers):
+        requested.append(url)
+        if requested.count(url) == 1 and url.endswith("post-sitemap.xml"):
+            headers = Message()
+            headers["Retry-After"] = "0"
+            raise HTTPError(url, 429, "Too Many Requests", headers, None)
+        yield SitemapResponse(status=200, body=BytesIO(bodies[url]), headers={})
+
+    scheduler = HostScheduler(
+        PolitenessConfig(requests_per_second=1000, burst=10),
+        fetch_robots=lambda url: "User-agent: *\nDisallow: /private/\n",
+    )
+    candidates = discover_url_candidates(
+        configs=[
+            SourceSitemapConfig("jetformbuilder", "https://jetformbuilder.com/sitemap_index.xml")
+        ],
+        open_stream=open_stream,
+        scheduler=scheduler,
+    )
+
+    assert [candidate.url for candidate in candidates] == [
+        "https://jetformbuilder.com/tutorials/example"
+    ]
+    assert requested == [
+        "https://jetformbuilder.com/sitemap_index.xml",
+        "https://jetformbuilder.com/post-sitemap.xml",
+        "https://jetformbuilder.com/post-sitemap.xml",
+    ]
+    assert (scheduler.blocked, scheduler.throttled) == (1, 1)
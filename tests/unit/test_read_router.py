@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from app.db.config import ReplicaConfig
+from app.db.session import ReadRouter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _router(lags: list[float | Exception], clock: FakeClock) -> tuple[ReadRouter, list[int]]:
+    probes: list[int] = []
+
+    async def measure_lag() -> float:
+        probes.append(1)
+        lag = lags.pop(0)
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+    router = ReadRouter(
+        "primary",  # type: ignore[arg-type]
+        "replica",  # type: ignore[arg-type]
+        ReplicaConfig(max_lag_seconds=10, lag_check_seconds=5),
+        measure_lag=measure_lag,
+        clock=clock,
+    )
+    return router, probes
+
+
+def test_reads_use_replica_until_it_lags_then_fall_back_to_primary() -> None:
+    clock = FakeClock()
+    router, probes = _router([2.0, 30.0, 0.0], clock)
+
+    async def route() -> object:
+        return await router.session_factory()
+
+    assert asyncio.run(route()) == "replica"
+    clock.now = 4.9
+    assert asyncio.run(route()) == "replica"
+    clock.now = 5.0
+    assert asyncio.run(route()) == "primary"
+    clock.now = 10.0
+    assert asyncio.run(route()) == "replica"
+
+    assert len(probes) == 3
+    assert router.stats()["replica_reads"] == 3
+    assert router.stats()["primary_reads"] == 1
+
+
+def test_unreachable_replica_routes_to_primary() -> None:
+    router, _ = _router([OperationalError("SELECT 1", {}, OSError("refused"))], FakeClock())
+
+    assert asyncio.run(router.session_factory()) == "primary"
+    assert router.stats()["replica_lag_seconds"] is None
+
+
+def test_router_without_replica_never_probes() -> None:
+    router = ReadRouter("primary")  # type: ignore[arg-type]
+
+    assert asyncio.run(router.session_factory()) == "primary"
+    assert router.stats()["replica_configured"] is False
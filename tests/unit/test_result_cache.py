@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pytest
+
+from app.api import cache as cache_module
+from app.api.cache import ResultCache, ResultCacheConfig, normalize_query
+
+SESSION = object()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def corpus(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    state = {"version": 1, "reads": 0}
+
+    def fake_get_corpus_version(session: object) -> int:
+        state["reads"] += 1
+        return state["version"]
+
+    monkeypatch.setattr(cache_module, "get_corpus_version", fake_get_corpus_version)
+    return state
+
+
+def test_normalize_query_collapses_whitespace_and_case() -> None:
+    assert normalize_query("  Spam   PROTECTION\n") == "spam protection"
+    assert normalize_query(None) is None
+
+
+def test_cache_hits_until_ttl_and_counts_metrics(corpus: dict[str, int]) -> None:
+    clock = FakeClock()
+    cache = ResultCache(ResultCacheConfig(ttl_seconds=10, version_check_seconds=60), clock)
+    loads: list[str] = []
+
+    def load() -> str:
+        loads.append("load")
+        return "result"
+
+    assert cache.get_or_load(SESSION, "key", load) == "result"
+    clock.now = 9.9
+    assert cache.get_or_load(SESSION, "key", load) == "result"
+    clock.now = 10.0
+    assert cache.get_or_load(SESSION, "key", load) == "result"
+
+    assert loads == ["load", "load"]
+    assert corpus["reads"] == 1
+    assert cache.stats() == {
+        "corpus_version": 1,
+        "entries": 1,
+        "evictions": 0,
+        "hits": 1,
+        "invalidations": 0,
+        "max_entries": 1024,
+        "misses": 2,
+    }
+
+
+def test_cache_evicts_least_recently_used(corpus: dict[str, int]) -> None:
+    cache = ResultCache(ResultCacheConfig(max_entries=2), FakeClock())
+
+    cache.get_or_load(SESSION, "a", lambda: "a")
+    cache.get_or_load(SESSION, "b", lambda: "b")
+    cache.get_or_load(SESSION, "a", lambda: "stale")
+    cache.get_or_load(SESSION, "c", lambda: "c")
+
+    assert cache.get_or_load(SESSION, "a", lambda: "reloaded") == "a"
+    assert cache.get_or_load(SESSION, "b", lambda: "reloaded") == "reloaded"
+    assert cache.evictions == 2
+
+
+def test_corpus_version_change_invalidates_after_check_interval(corpus: dict[str, int]) -> None:
+    clock = FakeClock()
+    cache = ResultCache(ResultCacheConfig(version_check_seconds=2), clock)
+    cache.get_or_load(SESSION, "key", lambda: "v1")
+
+    corpus["version"] = 2
+    clock.now = 1.0
+    assert cache.get_or_load(SESSION, "key", lambda: "v2") == "v1"
+    clock.now = 2.0
+    assert cache.get_or_load(SESSION, "key", lambda: "v2") == "v2"
+
+    assert corpus["reads"] == 2
+    assert cache.invalidations == 1
+    assert cache.stats()["corpus_version"] == 2
+
+
+def test_disabled_cache_always_loads(corpus: dict[str, int]) -> None:
+    cache = ResultCache(ResultCacheConfig(max_entries=0))
+    loads: list[int] = []
+
+    for attempt in range(2):
+        cache.get_or_load(SESSION, "key", lambda: loads.append(attempt))
+
+    assert loads == [0, 1]
+    assert cache.stats()["entries"] == 0
+    assert corpus["reads"] == 0
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+import uuid
+from datetime import datetime, timezone
+
+from app.search.chunking import TextChunk, chunk_document
+from app.search.embeddings import HashingEmbedder, iter_embedding_batches
+from app.search.fts import SearchHit
+from app.search.hybrid import reciprocal_rank_fusion
+
+
+def _hit(name: str) -> SearchHit:
+    return SearchHit(
+        id=uuid.uuid5(uuid.NAMESPACE_URL, name),
+        url=f"https://jetformbuilder.com/{name}",
+        title=name,
+        source="jetformbuilder",
+        doc_type="tutorial",
+        published_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        short_description=None,
+        score=None,
+    )
+
+
+def test_chunk_document_groups_lines_under_headings_and_caps_size() -> None:
+    content = "\n".join(
+        [
+            "Intro line.",
+            "Spam Protection",
+            "Enable the captcha.",
+            "Use honeypot fields.",
+            "Limits",
+            " ".join(["Long sentence number one."] * 10),
+        ]
+    )
+
+    chunks = chunk_document(content, ["Spam Protection", "Limits"], max_chars=120)
+
+    assert chunks[:2] == [
+        TextChunk(0, None, "Intro line."),
+        TextChunk(1, "Spam Protection", "Enable the captcha. Use honeypot fields."),
+    ]
+    assert {chunk.heading for chunk in chunks[2:]} == {"Limits"}
+    assert all(len(chunk.text) <= 120 for chunk in chunks)
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[1].embedding_input("Forms") == (
+        "Forms\nSpam Protection\nEnable the captcha. Use honeypot fields."
+    )
+    assert chunk_document(None, []) == []
+
+
+def test_hashing_embedder_is_normalized_and_favors_shared_terms() -> None:
+    embedder = HashingEmbedder(dimensions=64)
+
+    spam, captcha, payments = embedder.embed(
+        ["form spam protection", "protect forms from spam with captcha", "stripe payments"]
+    )
+
+    def cosine(a: list[float], b: list[float]) -> float:
+        return sum(x * y for x, y in zip(a, b))
+
+    assert len(spam) == 64
+    assert math.isclose(cosine(spam, spam), 1.0)
+    assert cosine(spam, captcha) > cosine(spam, payments)
+    assert embedder.embed(["form spam protection"]) == [spam]
+
+
+def test_iter_embedding_batches_preserves_order_across_batches() -> None:
+    calls: list[int] = []
+
+    class RecordingEmbedder(HashingEmbedder):
+        def embed(self, texts):
+            calls.append(len(texts))
+            return super().embed(texts)
+
+    texts = [f"text {index}" for index in range(5)]
+    embedder = RecordingEmbedder(dimensions=8)
+
+    vectors = list(iter_embedding_batches(embedder, texts, batch_size=2))
+
+    assert calls == [2, 2, 1]
+    assert vectors == HashingEmbedder(dimensions=8).embed(texts)
+
+
+def test_reciprocal_rank_fusion_rewards_agreement_between_rankings() -> None:
+    a, b, c, d = (_hit(name) for name in "abcd")
+
+    fused = reciprocal_rank_fusion([[a, b, c], [c, d, a]], k=60)
+
+    assert [hit.title for hit in fused] == ["a", "c", "b", "d"]
+    assert fused[0].score == 1 / 61 + 1 / 63
+    assert fused[-1].score == 1 / 62
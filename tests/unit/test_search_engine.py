@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.search import engine as engine_module
+from app.search.engine import search_docs
+from app.search.fts import SearchHit
+
+SESSION = object()
+
+
+def _hit(slug: str, score: float) -> SearchHit:
+    return SearchHit(
+        id=uuid.uuid4(),
+        url=f"https://jetformbuilder.com/tutorials/{slug}",
+        title=slug,
+        source="jetformbuilder",
+        doc_type="tutorial",
+        published_at=None,
+        short_description=None,
+        score=score,
+    )
+
+
+def test_fuzzy_hits_follow_lexical_hits_with_lower_scores(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # A body-only lexical hit scores far below the 0.6 similarity a fuzzy hit needs.
+    lexical = [_hit("refunds", 0.06)]
+    fuzzy = [_hit("payments", 0.9), _hit("paypal", 0.7)]
+    monkeypatch.setattr(engine_module, "full_text_search", lambda *args: lexical)
+    monkeypatch.setattr(engine_module, "trigram_search_available", lambda session: True)
+    monkeypatch.setattr(engine_module, "trigram_search", lambda *args, **kwargs: fuzzy)
+
+    hits = search_docs(SESSION, "paymets")  # type: ignore[arg-type]
+
+    assert [hit.title for hit in hits] == ["refunds", "payments", "paypal"]
+    scores = [hit.score or 0.0 for hit in hits]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] > scores[1]
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import gzip
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from io import BytesIO
 
+import pytest
+
+from app.discovery.cache import SitemapFetchCache
 from app.discovery.sitemap import (
+    DiscoveryStats,
+    FetchConcurrency,
+    SitemapEntry,
+    SitemapResponse,
     SourceSitemapConfig,
     discover_url_candidates,
     infer_doc_type,
     infer_source,
+    iter_sitemap_entries,
     normalize_url,
+    parse_lastmod,
 )
 
 
@@ -91,6 +105,321 @@ def test_discover_url_candidates_collects_rows_per_configured_source() -> None:
     }
 
 
+def _urlset(*locs: str) -> bytes:
+    entries = "".join(f"<url><loc>{loc}</loc></url>" for loc in locs)
+    return (
+        '<?xml version="1.0"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"{entries}</urlset>"
+    ).encode()
+
+
+def _sitemapindex(*locs: str) -> bytes:
+    entries = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return (
+        '<?xml version="1.0"?>'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"{entries}</sitemapindex>"
+    ).encode()
+
+
+def test_concurrent_discovery_matches_sequential_order() -> None:
+    payloads = {
+        "https://jetformbuilder.com/sitemap_index.xml": _sitemapindex(
+            "https://jetformbuilder.com/post-sitemap.xml",
+            "https://jetformbuilder.com/nested-index.xml",
+            "https://jetformbuilder.com/page-sitemap.xml",
+        ),
+        "https://jetformbuilder.com/post-sitemap.xml": _urlset(
+            "https://jetformbuilder.com/blog/slow-first",
+            "https://jetformbuilder.com/tutorials/shared",
+        ),
+        "https://jetformbuilder.com/nested-index.xml": _sitemapindex(
+            "https://jetformbuilder.com/deep-sitemap.xml",
+        ),
+        "https://jetformbuilder.com/page-sitemap.xml": _urlset(
+            "https://jetformbuilder.com/tutorials/shared",
+            "https://jetformbuilder.com/docs/page",
+        ),
+        "https://jetformbuilder.com/deep-sitemap.xml": _urlset(
+            "https://jetformbuilder.com/kb/deep",
+        ),
+        "https://crocoblock.com/sitemap_index.xml": _urlset(
+            "https://crocoblock.com/blog/croco",
+        ),
+    }
+    delays = {"https://jetformbuilder.com/post-sitemap.xml": 0.05}
+
+    def fetch(url: str) -> bytes:
+        time.sleep(delays.get(url, 0))
+        return payloads[url]
+
+    configs = [
+        SourceSitemapConfig("jetformbuilder", "https://jetformbuilder.com/sitemap_index.xml"),
+        SourceSitemapConfig("crocoblock", "https://crocoblock.com/sitemap_index.xml"),
+    ]
+    now = datetime(2026, 2, 18, 0, 0, tzinfo=timezone.utc)
+
+    sequential = discover_url_candidates(configs=configs, fetch_content=fetch, now=now)
+    concurrent = discover_url_candidates(
+        configs=configs,
+        fetch_content=fetch,
+        now=now,
+        concurrency=FetchConcurrency(max_concurrency=4, max_per_host=4),
+    )
+
+    assert [candidate.url for candidate in concurrent] == [
+        "https://jetformbuilder.com/blog/slow-first",
+        "https://jetformbuilder.com/tutorials/shared",
+        "https://jetformbuilder.com/docs/page",
+        "https://jetformbuilder.com/kb/deep",
+        "https://crocoblock.com/blog/croco",
+    ]
+    assert concurrent == sequential
+
+
+def test_concurrent_discovery_respects_per_host_limit() -> None:
+    children = [f"https://jetformbuilder.com/sitemap-{index}.xml" for index in range(6)]
+    payloads = {
+        "https://jetformbuilder.com/sitemap_index.xml": _sitemapindex(*children),
+        **{
+            child: _urlset(f"https://jetformbuilder.com/blog/post-{index}")
+            for index, child in enumerate(children)
+        },
+    }
+    lock = threading.Lock()
+    in_flight = 0
+    peak_in_flight = 0
+
+    def fetch(url: str) -> bytes:
+        nonlocal in_flight, peak_in_flight
+        with lock:
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return payloads[url]
+
+    candidates = discover_url_candidates(
+        configs=[
+            SourceSitemapConfig("jetformbuilder", "https://jetformbuilder.com/sitemap_index.xml")
+        ],
+        fetch_content=fetch,
+        now=datetime(2026, 2, 18, 0, 0, tzinfo=timezone.utc),
+        concurrency=FetchConcurrency(max_concurrency=8, max_per_host=2),
+    )
+
+    assert len(candidates) == 6
+    assert peak_in_flight == 2
+
+
+def test_fetch_concurrency_rejects_non_positive_limits() -> None:
+    with pytest.raises(ValueError):
+        FetchConcurrency(max_concurrency=0)
+    with pytest.raises(ValueError):
+        FetchConcurrency(max_per_host=0)
+
+
+def test_iter_sitemap_entries_yields_normalized_locations_lazily() -> None:
+    stream = BytesIO(
+        _urlset(
+            "https://jetformbuilder.com/tutorials/one/?ref=x",
+            "mailto:ops@example.com",
+            "https://jetformbuilder.com/blog/two/",
+        )
+    )
+
+    kind, entries = iter_sitemap_entries(stream)
+
+    assert kind == "urlset"
+    assert next(entries) == SitemapEntry("https://jetformbuilder.com/tutorials/one")
+    assert list(entries) == [SitemapEntry("https://jetformbuilder.com/blog/two")]
+
+
+def test_iter_sitemap_entries_reports_unknown_root() -> None:
+    kind, entries = iter_sitemap_entries(BytesIO(b"<feed><loc>https://a.test/x</loc></feed>"))
+
+    assert kind == "unknown"
+    assert list(entries) == [SitemapEntry("https://a.test/x")]
+
+
+def test_iter_sitemap_entries_reads_lastmod_in_any_position() -> None:
+    stream = BytesIO(
+        b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<url><loc>https://crocoblock.com/blog/a</loc><lastmod>2026-02-10</lastmod></url>"
+        b"<url><lastmod>2026-02-11T08:30:00+02:00</lastmod><loc>https://crocoblock.com/blog/b</loc></url>"
+        b"<url><loc>https://crocoblock.com/blog/c</loc><lastmod>yesterday</lastmod></url>"
+        b"</urlset>"
+    )
+
+    _, entries = iter_sitemap_entries(stream)
+
+    assert [(entry.loc, entry.lastmod) for entry in entries] == [
+        ("https://crocoblock.com/blog/a", datetime(2026, 2, 10, tzinfo=timezone.utc)),
+        ("https://crocoblock.com/blog/b", datetime(2026, 2, 11, 6, 30, tzinfo=timezone.utc)),
+        ("https://crocoblock.com/blog/c", None),
+    ]
+
+
+def test_parse_lastmod_accepts_w3c_datetime_variants() -> None:
+    assert parse_lastmod("2026-02-18T10:00:00Z") == datetime(2026, 2, 18, 10, tzinfo=timezone.utc)
+    assert parse_lastmod("2026-02-18T10:00") == datetime(2026, 2, 18, 10, tzinfo=timezone.utc)
+    assert parse_lastmod("2026-02") is None
+    assert parse_lastmod("  ") is None
+    assert parse_lastmod(None) is None
+
+
+def test_modified_since_skips_stale_child_sitemaps_and_keeps_page_lastmod() -> None:
+    index_xml = (
+        b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<sitemap><loc>https://crocoblock.com/old-sitemap.xml</loc>"
+        b"<lastmod>2026-01-01T00:00:00+00:00</lastmod></sitemap>"
+        b"<sitemap><loc>https://crocoblock.com/new-sitemap.xml</loc>"
+        b"<lastmod>2026-02-17T12:00:00+00:00</lastmod></sitemap>"
+        b"<sitemap><loc>https://crocoblock.com/undated-sitemap.xml</loc></sitemap>"
+        b"</sitemapindex>"
+    )
+    payloads = {
+        "https://crocoblock.com/sitemap_index.xml": index_xml,
+        "https://crocoblock.com/new-sitemap.xml": (
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b"<url><loc>https://crocoblock.com/blog/new</loc>"
+            b"<lastmod>2026-02-17T12:00:00+00:00</lastmod></url>"
+            b"</urlset>"
+        ),
+        "https://crocoblock.com/undated-sitemap.xml": _urlset("https://crocoblock.com/kb/undated"),
+    }
+    fetched: list[str] = []
+
+    def fetch(url: str) -> bytes:
+        fetched.append(url)
+        return payloads[url]
+
+    stats = DiscoveryStats()
+    candidates = discover_url_candidates(
+        configs=[SourceSitemapConfig("crocoblock", "https://crocoblock.com/sitemap_index.xml")],
+        fetch_content=fetch,
+        now=datetime(2026, 2, 18, 0, 0, tzinfo=timezone.utc),
+        modified_since=datetime(2026, 2, 17, 0, 0, tzinfo=timezone.utc),
+        stats=stats,
+    )
+
+    assert "https://crocoblock.com/old-sitemap.xml" not in fetched
+    assert stats.skipped_sitemaps == 1
+    assert [(candidate.url, candidate.lastmod) for candidate in candidates] == [
+        ("https://crocoblock.com/blog/new", datetime(2026, 2, 17, 12, tzinfo=timezone.utc)),
+        ("https://crocoblock.com/kb/undated", None),
+    ]
+
+
+def test_discovery_streams_gzip_sitemaps_and_closes_streams() -> None:
+    payloads = {
+        "https://crocoblock.com/sitemap_index.xml": _sitemapindex(
+            "https://crocoblock.com/post-sitemap.xml.gz",
+        ),
+        "https://crocoblock.com/post-sitemap.xml.gz": gzip.compress(
+            _urlset(*(f"https://crocoblock.com/blog/post-{index}" for index in range(500)))
+        ),
+    }
+    opened: list[BytesIO] = []
+
+    @contextmanager
+    def open_stream(url: str, request_headers: dict[str, str]):
+        stream = BytesIO(payloads[url])
+        opened.append(stream)
+        try:
+            yield SitemapResponse(status=200, body=stream, headers={})
+        finally:
+            stream.close()
+
+    candidates = discover_url_candidates(
+        configs=[SourceSitemapConfig("crocoblock", "https://crocoblock.com/sitemap_index.xml")],
+        now=datetime(2026, 2, 18, 0, 0, tzinfo=timezone.utc),
+        open_stream=open_stream,
+    )
+
+    assert len(candidates) == 500
+    assert candidates[0].url == "https://crocoblock.com/blog/post-0"
+    assert len(opened) == 2
+    assert all(stream.closed for stream in opened)
+
+
+def test_discovery_reuses_cached_locations_when_sitemaps_are_not_modified() -> None:
+    payloads = {
+        "https://jetformbuilder.com/sitemap_index.xml": _sitemapindex(
+            "https://jetformbuilder.com/post-sitemap.xml",
+            "https://jetformbuilder.com/page-sitemap.xml",
+        ),
+        "https://jetformbuilder.com/post-sitemap.xml": _urlset(
+            "https://jetformbuilder.com/blog/post",
+        ),
+        "https://jetformbuilder.com/page-sitemap.xml": _urlset(
+            "https://jetformbuilder.com/docs/page",
+        ),
+    }
+    etags = {url: f'"v1-{index}"' for index, url in enumerate(payloads)}
+    requests: list[tuple[str, dict[str, str]]] = []
+
+    @contextmanager
+    def open_stream(url: str, request_headers: dict[str, str]):
+        requests.append((url, dict(request_headers)))
+        if request_headers.get("If-None-Match") == etags[url]:
+            yield SitemapResponse(status=304, body=BytesIO(b""), headers={"ETag": etags[url]})
+            return
+        yield SitemapResponse(
+            status=200,
+            body=BytesIO(payloads[url]),
+            headers={"ETag": etags[url], "Last-Modified": "Wed, 18 Feb 2026 00:00:00 GMT"},
+        )
+
+    configs = [
+        SourceSitemapConfig("jetformbuilder", "https://jetformbuilder.com/sitemap_index.xml")
+    ]
+    now = datetime(2026, 2, 18, 0, 0, tzinfo=timezone.utc)
+
+    first_cache = SitemapFetchCache()
+    first = discover_url_candidates(
+        configs=configs,
+        now=now,
+        open_stream=open_stream,
+        cache=first_cache,
+    )
+    assert (first_cache.hits, first_cache.refetches) == (0, 3)
+    assert all(headers == {} for _, headers in requests)
+
+    etags["https://jetformbuilder.com/page-sitemap.xml"] = '"v2"'
+    payloads["https://jetformbuilder.com/page-sitemap.xml"] = _urlset(
+        "https://jetformbuilder.com/docs/page",
+        "https://jetformbuilder.com/docs/new-page",
+    )
+    requests.clear()
+
+    second_cache = SitemapFetchCache(first_cache.updated_entries)
+    second = discover_url_candidates(
+        configs=configs,
+        now=now,
+        open_stream=open_stream,
+        cache=second_cache,
+    )
+
+    assert [candidate.url for candidate in first] == [
+        "https://jetformbuilder.com/blog/post",
+        "https://jetformbuilder.com/docs/page",
+    ]
+    assert [candidate.url for candidate in second] == [
+        "https://jetformbuilder.com/blog/post",
+        "https://jetformbuilder.com/docs/page",
+        "https://jetformbuilder.com/docs/new-page",
+    ]
+    assert (second_cache.hits, second_cache.refetches) == (2, 1)
+    assert list(second_cache.updated_entries) == ["https://jetformbuilder.com/page-sitemap.xml"]
+    assert requests[0][1] == {
+        "If-None-Match": '"v1-0"',
+        "If-Modified-Since": "Wed, 18 Feb 2026 00:00:00 GMT",
+    }
+
+
 def test_normalize_url_handles_common_discovery_cases() -> None:
     assert normalize_url("https://example.com/tutorials/demo/?x=1#top") == "https://example.com/tutorials/demo"
     assert normalize_url("https://example.com/") == "https://example.com/"
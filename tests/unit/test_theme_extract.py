@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from app.themes.extract import MAX_THEMES_PER_DOC, THEME_LEAD_CHARS, extract_themes, normalize_theme
+
+
+@pytest.mark.parametrize(
+    ("label", "expected"),
+    [
+        ("File Upload", "uploads"),
+        ("media-uploads", "uploads"),
+        ("Front-end post submission", "post submit"),
+        ("Stripe", "payments"),
+        ("  Multi-Step   Forms ", "multi step forms"),
+        ("Booking Forms", "booking forms"),
+        ("JetFormBuilder", None),
+        ("Uncategorized", None),
+        ("2024", None),
+        ("x", None),
+    ],
+)
+def test_normalize_theme_maps_synonyms_and_drops_noise(label: str, expected: str | None) -> None:
+    assert normalize_theme(label) == expected
+
+
+def test_extract_themes_puts_tags_first_then_weighted_keyphrases() -> None:
+    themes = extract_themes(
+        title="Accept PayPal payments with conditional logic",
+        tags=["Tutorials", "File Upload", "uploads"],
+        categories=["Booking Forms"],
+        headings=["Set up the webhook", "Conditional block"],
+        content_text="This guide adds a calculated field to a Stripe form.",
+    )
+
+    assert themes == (
+        "uploads",
+        "booking forms",
+        "payments",
+        "conditional logic",
+        "webhooks",
+    )
+    assert len(themes) == MAX_THEMES_PER_DOC
+
+
+def test_extract_themes_only_scans_the_lead_of_the_body() -> None:
+    filler = "Intro text. " * (THEME_LEAD_CHARS // 12 + 1)
+
+    assert extract_themes(title="Getting started", content_text=filler + "Use a repeater.") == ()
+    assert extract_themes(title="Getting started", content_text="Use a repeater field.") == (
+        "repeater",
+    )